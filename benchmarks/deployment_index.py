@@ -0,0 +1,97 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the Manifest accessors used while scheduling, asking them the same questions the generic tasks do.  A
+Manifest builds its deployment index on every call whereas a ReadOnlyManifest (the one shared between tasks) builds it
+once.
+
+    python -m benchmarks.deployment_index
+"""
+
+import argparse
+import json
+import time
+
+from benchmarks import synthetic_manifest
+from servicecatalog_puppet import constants
+from servicecatalog_puppet import manifest_utils
+
+
+def ask(manifest):
+    """
+    Makes the lookups a for-region, for-account and for-account-and-region task would make for every launch.
+    """
+    puppet_account_id = synthetic_manifest.PUPPET_ACCOUNT_ID
+    answers = 0
+    for launch_name in manifest.get(constants.LAUNCHES).keys():
+        for region in manifest.get_regions_used_for_section_item(
+            puppet_account_id, constants.LAUNCHES, launch_name
+        ):
+            answers += len(
+                manifest.get_tasks_for_launch_and_region(
+                    puppet_account_id, constants.LAUNCHES, launch_name, region
+                )
+            )
+        account_ids_and_regions = manifest.get_account_ids_and_regions_used_for_section_item(
+            puppet_account_id, constants.LAUNCHES, launch_name
+        )
+        for account_id, regions in account_ids_and_regions.items():
+            answers += len(
+                manifest.get_tasks_for_launch_and_account(
+                    puppet_account_id, constants.LAUNCHES, launch_name, account_id
+                )
+            )
+            for region in regions:
+                answers += len(
+                    manifest.get_tasks_for_launch_and_account_and_region(
+                        puppet_account_id,
+                        constants.LAUNCHES,
+                        launch_name,
+                        account_id,
+                        region,
+                    )
+                )
+    return answers
+
+
+def time_it(manifest):
+    start = time.perf_counter()
+    answers = ask(manifest)
+    return answers, time.perf_counter() - start
+
+
+def run(sizes, num_launches):
+    results = list()
+    for num_accounts in sizes:
+        generated = synthetic_manifest.generate(
+            num_accounts=num_accounts, num_launches=num_launches
+        )
+        answers, unindexed_time = time_it(manifest_utils.Manifest(generated))
+        indexed_answers, indexed_time = time_it(
+            manifest_utils.ReadOnlyManifest(generated)
+        )
+        assert answers == indexed_answers
+        results.append(
+            dict(
+                accounts=num_accounts,
+                launches=num_launches,
+                tasks_returned=answers,
+                unindexed_seconds=round(unindexed_time, 4),
+                indexed_seconds=round(indexed_time, 4),
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,250,500")
+    parser.add_argument("--launches", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.launches), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Deploys synthetic manifests of increasing size against an in-process stand-in for AWS, measuring the wall time, peak
+RSS, task count, scheduling time and AWS calls made.  Each size runs in its own process so its peak RSS is its own.
+The results are written as json so they can be compared across releases.
+
+    python -m benchmarks.large_org --sizes 10,50,100 --output benchmark-results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import fake_aws
+from benchmarks import scheduling
+from benchmarks import synthetic_manifest
+
+
+def get_peak_rss_in_mb():
+    # ru_maxrss is in kilobytes on linux and in bytes on macos
+    divisor = 1024 * 1024 if platform.system() == "Darwin" else 1024
+    peaks = [
+        resource.getrusage(who).ru_maxrss
+        for who in [resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN]
+    ]
+    return round(max(peaks) / divisor, 1)
+
+
+def deploy(scenario, directory):
+    """
+    Generates and deploys the manifest described by scenario in directory.
+
+    :return: dict of the measurements
+    """
+    from servicecatalog_puppet import constants
+    from servicecatalog_puppet.commands import misc
+    from servicecatalog_puppet.workflow import journal
+    from servicecatalog_puppet.workflow import runner
+
+    puppet_account_id = synthetic_manifest.PUPPET_ACCOUNT_ID
+    manifest = synthetic_manifest.generate(
+        num_accounts=scenario.get("accounts"),
+        num_launches=scenario.get("launches"),
+        num_tags=scenario.get("tags"),
+        num_ous=scenario.get("ous"),
+        num_stacks=scenario.get("stacks"),
+        depends_on_per_launch=scenario.get("depends_on_per_launch"),
+        ssm_parameters_per_launch=scenario.get("ssm_parameters_per_launch"),
+    )
+    manifest_file_path = synthetic_manifest.write(manifest, directory)
+    calls_file_path = os.path.join(directory, "calls.txt")
+
+    with fake_aws.FakeAWS(calls_file_path) as fake:
+        for name in synthetic_manifest.get_ssm_parameter_names(
+            manifest, scenario.get("ssm_parameters_per_launch")
+        ):
+            fake.parameters[(puppet_account_id, synthetic_manifest.REGIONS[0])][
+                name
+            ] = "value"
+        for launch in manifest.get("launches").values():
+            fake.products[fake_aws.get_portfolio_id(launch.get("portfolio"))].append(
+                launch.get("product")
+            )
+        os.environ["SCT_CACHE_INVALIDATOR"] = "benchmark"
+        os.environ["SCT_EXECUTION_MODE"] = constants.EXECUTION_MODE_HUB
+        os.environ["SCT_SINGLE_ACCOUNT"] = "None"
+        os.environ["SCT_IS_DRY_RUN"] = "False"
+        os.environ["EXECUTOR_ACCOUNT_ID"] = puppet_account_id
+        os.environ["SCT_SHOULD_USE_SNS"] = "False"
+        os.environ["SCT_SHOULD_DELETE_ROLLBACK_COMPLETE_STACKS"] = "False"
+        os.environ["SCT_SHOULD_USE_PRODUCT_PLANS"] = str(
+            scenario.get("use_product_plans")
+        )
+        os.environ["SCT_SHOULD_PARK_WHILE_WAITING"] = "False"
+        os.environ["SCT_OUTPUT_STORE"] = scenario.get("output_store")
+        os.environ["SCT_SHOULD_USE_HUB_CATALOGUE"] = str(
+            not scenario.get("without_hub_catalogue")
+        )
+        os.environ["SCT_HUB_CATALOGUE_CACHE_TTL"] = "3600"
+        os.environ["SCT_SHOULD_USE_STACK_FINGERPRINTS"] = "True"
+        os.environ["SCT_SHOULD_USE_PROVISIONING_DIGESTS"] = "True"
+        os.environ["AWS_DEFAULT_REGION"] = synthetic_manifest.REGIONS[0]
+
+        class F:
+            name = manifest_file_path
+
+        start = time.perf_counter()
+        tasks_to_run = misc.generate_tasks(
+            F, puppet_account_id, puppet_account_id, constants.EXECUTION_MODE_HUB, False
+        )
+        all_tasks = scheduling.walk(tasks_to_run)
+        scheduling_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exit_status_code = None
+        try:
+            runner.run_tasks(
+                puppet_account_id,
+                puppet_account_id,
+                tasks_to_run,
+                scenario.get("workers"),
+                execution_mode=constants.EXECUTION_MODE_HUB,
+            )
+        except SystemExit as e:
+            exit_status_code = e.code
+        run_time = time.perf_counter() - start
+
+    calls = fake_aws.FakeAWS.read_calls(calls_file_path)
+    return dict(
+        scenario=scenario,
+        exit_status_code=exit_status_code,
+        tasks_scheduled=len(all_tasks),
+        tasks_run=len(list(journal.read(event_types=["processing_time"]))),
+        output_files=sum(len(files) for _, _, files in os.walk(constants.OUTPUT)),
+        scheduling_seconds=round(scheduling_time, 3),
+        run_seconds=round(run_time, 3),
+        wall_seconds=round(scheduling_time + run_time, 3),
+        peak_rss_mb=get_peak_rss_in_mb(),
+        aws_calls=sum(sum(operations.values()) for operations in calls.values()),
+        aws_calls_by_operation=calls,
+    )
+
+
+def run_scenario(scenario):
+    with tempfile.TemporaryDirectory() as directory:
+        result_file_path = os.path.join(directory, "result.json")
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.large_org",
+                "--scenario",
+                json.dumps(scenario),
+                "--result",
+                result_file_path,
+            ],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=None if scenario.get("verbose") else subprocess.DEVNULL,
+        )
+        with open(result_file_path, "r") as f:
+            return json.loads(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,50,100")
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--stacks", type=int, default=2)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--ous", type=int, default=5)
+    parser.add_argument("--depends-on-per-launch", type=int, default=1)
+    parser.add_argument("--ssm-parameters-per-launch", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--use-product-plans", action="store_true")
+    parser.add_argument("--without-hub-catalogue", action="store_true")
+    parser.add_argument(
+        "--output-store", default="files", choices=["files", "sqlite"],
+    )
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        directory = os.getcwd()
+        with tempfile.TemporaryDirectory() as working_directory:
+            os.chdir(working_directory)
+            try:
+                result = deploy(json.loads(args.scenario), working_directory)
+            finally:
+                os.chdir(directory)
+        with open(args.result, "w") as f:
+            f.write(json.dumps(result))
+        return
+
+    results = list()
+    for num_accounts in [int(s) for s in args.sizes.split(",")]:
+        result = run_scenario(
+            dict(
+                accounts=num_accounts,
+                launches=args.launches,
+                stacks=args.stacks,
+                tags=args.tags,
+                ous=args.ous,
+                depends_on_per_launch=args.depends_on_per_launch,
+                ssm_parameters_per_launch=args.ssm_parameters_per_launch,
+                workers=args.workers,
+                use_product_plans=args.use_product_plans,
+                without_hub_catalogue=args.without_hub_catalogue,
+                output_store=args.output_store,
+                verbose=args.verbose,
+            )
+        )
+        print(
+            json.dumps(
+                {k: v for k, v in result.items() if k != "aws_calls_by_operation"}
+            )
+        )
+        results.append(result)
+
+    with open(args.output, "w") as f:
+        f.write(
+            json.dumps(
+                dict(
+                    python=platform.python_version(),
+                    created=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    results=results,
+                ),
+                indent=4,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
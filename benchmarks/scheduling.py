@@ -0,0 +1,100 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures how long it takes to build the task graph for synthetic manifests of increasing size.
+
+    python -m benchmarks.scheduling
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import yaml
+
+from benchmarks import synthetic_manifest
+
+
+def walk(tasks_to_run):
+    """
+    Calls requires() for every task reachable from tasks_to_run, the same way luigi does while scheduling.
+    """
+    seen = dict()
+    to_visit = list(tasks_to_run)
+    while to_visit:
+        task = to_visit.pop()
+        if task.task_id in seen:
+            continue
+        seen[task.task_id] = task
+        to_visit.extend(task.deps())
+    return seen
+
+
+def run(sizes, num_launches):
+    from servicecatalog_puppet import constants
+    from servicecatalog_puppet.commands import misc
+
+    os.environ["SCT_CACHE_INVALIDATOR"] = "benchmark"
+    os.environ["SCT_EXECUTION_MODE"] = constants.EXECUTION_MODE_HUB
+
+    results = list()
+    cwd = os.getcwd()
+    for num_accounts in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                manifest = synthetic_manifest.generate(
+                    num_accounts=num_accounts, num_launches=num_launches
+                )
+                manifest_file_path = synthetic_manifest.write(manifest, directory)
+
+                start = time.perf_counter()
+                yaml.safe_load(open(manifest_file_path, "r").read())
+                parse_time = time.perf_counter() - start
+
+                class F:
+                    name = manifest_file_path
+
+                start = time.perf_counter()
+                tasks_to_run = misc.generate_tasks(
+                    F, synthetic_manifest.PUPPET_ACCOUNT_ID, None, "hub", False
+                )
+                all_tasks = walk(tasks_to_run)
+                scheduling_time = time.perf_counter() - start
+
+                manifest_tasks = len(
+                    [t for t in all_tasks.values() if hasattr(t, "manifest_file_path")]
+                )
+                results.append(
+                    dict(
+                        accounts=num_accounts,
+                        launches=num_launches,
+                        manifest_bytes=os.path.getsize(manifest_file_path),
+                        tasks=len(all_tasks),
+                        tasks_reading_the_manifest=manifest_tasks,
+                        parse_seconds=round(parse_time, 4),
+                        scheduling_seconds=round(scheduling_time, 3),
+                        parse_per_task_estimate_seconds=round(
+                            parse_time * manifest_tasks, 3
+                        ),
+                    )
+                )
+            finally:
+                os.chdir(cwd)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="25,50,100,200")
+    parser.add_argument("--launches", type=int, default=10)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.launches), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+
+import yaml
+
+from servicecatalog_puppet import constants
+
+PUPPET_ACCOUNT_ID = "000000000000"
+REGIONS = ["eu-west-1", "eu-west-2", "eu-west-3", "us-east-1"]
+SSM_PARAMETER_NAME = "/benchmark/${{AWS::AccountId}}/${{AWS::Region}}/parameter-{}"
+
+
+def generate(
+    num_accounts=100,
+    num_launches=20,
+    num_tags=10,
+    tags_per_account=3,
+    regions_per_account=2,
+    num_manifest_parameters=20,
+    num_ous=0,
+    num_stacks=0,
+    depends_on_per_launch=0,
+    ssm_parameters_per_launch=0,
+):
+    """
+    Generates an expanded manifest with accounts spread over num_tags tags, and over num_ous organizational units, and
+    launches and stacks deploying to those tags.  Each launch depends on up to depends_on_per_launch of the launches
+    before it, and has ssm_parameters_per_launch parameters got from SSM_PARAMETER_NAME.
+    """
+    accounts = list()
+    for i in range(num_accounts):
+        accounts.append(
+            dict(
+                account_id=str(100000000000 + i),
+                name=f"account-{i}",
+                email=f"account-{i}@example.com",
+                organization="o-aaaaaaaa",
+                default_region=REGIONS[0],
+                regions_enabled=REGIONS[:regions_per_account],
+                tags=[
+                    f"group:{(i + j) % num_tags}"
+                    for j in range(min(tags_per_account, num_tags))
+                ],
+                parameters=dict(AccountName=dict(default=f"account-{i}")),
+            )
+        )
+        if num_ous > 0:
+            accounts[-1]["expanded_from"] = f"/ou-{i % num_ous}"
+
+    launches = dict()
+    for i in range(num_launches):
+        launches[f"launch-{i}"] = dict(
+            portfolio=f"portfolio-{i % 5}",
+            product=f"product-{i}",
+            version="v1",
+            execution=constants.EXECUTION_MODE_DEFAULT,
+            parameters=dict(
+                LaunchName=dict(default=f"launch-{i}"),
+                **{
+                    f"SsmParameter{k}": dict(
+                        ssm=dict(name=SSM_PARAMETER_NAME.format(k))
+                    )
+                    for k in range(ssm_parameters_per_launch)
+                },
+            ),
+            deploy_to=dict(
+                tags=[dict(tag=f"group:{i % num_tags}", regions="enabled_regions")]
+            ),
+            depends_on=[
+                dict(
+                    name=f"launch-{j}",
+                    type=constants.LAUNCH,
+                    affinity=constants.LAUNCH,
+                )
+                for j in range(max(0, i - depends_on_per_launch), i)
+            ],
+        )
+
+    stacks = dict()
+    for i in range(num_stacks):
+        stacks[f"stack-{i}"] = dict(
+            name=f"stack-{i}",
+            version="v1",
+            key=f"stack/stack-{i}/v1/stack.template.yaml",
+            capabilities=["CAPABILITY_NAMED_IAM"],
+            execution=constants.EXECUTION_MODE_DEFAULT,
+            parameters=dict(StackName=dict(default=f"stack-{i}")),
+            deploy_to=dict(
+                tags=[dict(tag=f"group:{i % num_tags}", regions="enabled_regions")]
+            ),
+        )
+
+    return {
+        "schema": "puppet-2019-04-01",
+        "parameters": {
+            f"Parameter{i}": dict(default=f"value-{i}")
+            for i in range(num_manifest_parameters)
+        },
+        constants.ACCOUNTS: accounts,
+        constants.LAUNCHES: launches,
+        constants.STACKS: stacks,
+        constants.SPOKE_LOCAL_PORTFOLIOS: {},
+        constants.LAMBDA_INVOCATIONS: {},
+        constants.CODE_BUILD_RUNS: {},
+        constants.ASSERTIONS: {},
+        constants.APPS: {},
+        constants.WORKSPACES: {},
+    }
+
+
+def get_ssm_parameter_names(manifest, ssm_parameters_per_launch):
+    """
+    Returns the names of the ssm parameters the launches in manifest get.
+    """
+    names = list()
+    for account in manifest.get(constants.ACCOUNTS):
+        for region in account.get("regions_enabled"):
+            for k in range(ssm_parameters_per_launch):
+                names.append(
+                    SSM_PARAMETER_NAME.format(k)
+                    .replace("${AWS::AccountId}", account.get("account_id"))
+                    .replace("${AWS::Region}", region)
+                )
+    return names
+
+
+def write(manifest, directory):
+    """
+    Writes the manifest and a config.yaml, so config lookups are served locally, into directory.
+    """
+    with open(os.path.join(directory, "config.yaml"), "w") as f:
+        f.write(yaml.safe_dump(dict(home_region=REGIONS[0], regions=REGIONS)))
+    manifest_file_path = os.path.join(directory, "manifest-expanded.yaml")
+    with open(manifest_file_path, "w") as f:
+        f.write(yaml.safe_dump(manifest))
+    return manifest_file_path
@@ -0,0 +1,110 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the memory held per ProvisionProductTask, built for every launch, account and region of a synthetic manifest
+as the generic tasks build them, with the parameters blocks as plain luigi DictParameters (before) and as
+InternedDictParameters (after).
+
+    python -m benchmarks.task_memory
+"""
+
+import argparse
+import json
+import tracemalloc
+
+import luigi
+from luigi import task_register
+
+from benchmarks import synthetic_manifest
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import tasks
+from servicecatalog_puppet.workflow.launch import provision_product_task
+
+
+class UninternedProvisionProductTask(provision_product_task.ProvisionProductTask):
+    launch_parameters = luigi.DictParameter(default={}, significant=False)
+    manifest_parameters = luigi.DictParameter(default={}, significant=False)
+    account_parameters = luigi.DictParameter(default={}, significant=False)
+
+
+def build(task_klass, manifest):
+    """
+    Builds a task for every launch into every account and region it deploys to, as the generic tasks do, handing each
+    the parameters blocks of the manifest, the launch and the account.
+    """
+    built = list()
+    for launch_name, launch in manifest.get(constants.LAUNCHES).items():
+        tag = launch.get("deploy_to").get("tags")[0].get("tag")
+        for account in manifest.get(constants.ACCOUNTS):
+            if tag not in account.get("tags"):
+                continue
+            for region in account.get("regions_enabled"):
+                built.append(
+                    task_klass(
+                        manifest_file_path="manifest-expanded.yaml",
+                        launch_name=launch_name,
+                        puppet_account_id=synthetic_manifest.PUPPET_ACCOUNT_ID,
+                        region=region,
+                        account_id=account.get("account_id"),
+                        portfolio=launch.get("portfolio"),
+                        product=launch.get("product"),
+                        version=launch.get("version"),
+                        launch_parameters=launch.get("parameters"),
+                        manifest_parameters=manifest.get("parameters"),
+                        account_parameters=account.get("parameters"),
+                        execution=launch.get("execution"),
+                    )
+                )
+    return built
+
+
+def measure(task_klass, manifest):
+    task_register.Register.clear_instance_cache()
+    tasks.interned_dicts.clear()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build(task_klass, manifest)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(built), after - before
+
+
+def run(sizes, num_launches, num_manifest_parameters):
+    results = list()
+    for num_accounts in sizes:
+        manifest = synthetic_manifest.generate(
+            num_accounts=num_accounts,
+            num_launches=num_launches,
+            num_manifest_parameters=num_manifest_parameters,
+        )
+        num_tasks, uninterned_bytes = measure(UninternedProvisionProductTask, manifest)
+        interned_num_tasks, interned_bytes = measure(
+            provision_product_task.ProvisionProductTask, manifest
+        )
+        assert num_tasks == interned_num_tasks
+        results.append(
+            dict(
+                accounts=num_accounts,
+                launches=num_launches,
+                manifest_parameters=num_manifest_parameters,
+                tasks=num_tasks,
+                uninterned_bytes_per_task=uninterned_bytes // num_tasks,
+                interned_bytes_per_task=interned_bytes // num_tasks,
+            )
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,250")
+    parser.add_argument("--launches", type=int, default=20)
+    parser.add_argument("--manifest-parameters", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.launches, args.manifest_parameters), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import click
 import yaml
 from betterboto import client as betterboto_client
 
-from servicecatalog_puppet import config, constants
+from servicecatalog_puppet import config, constants, waiter
 
 logger = logging.getLogger(__file__)
 
@@ -24,8 +24,8 @@ def terminate_provisioned_product(prefix, service_catalog, provisioned_product_i
     logger.info(
         f"{prefix} :: waiting for termination of {provisioned_product_id} to complete"
     )
-    status = "IN_PROGRESS"
-    while status == "IN_PROGRESS":
+
+    def check():
         record_detail = service_catalog.describe_record(Id=record_id).get(
             "RecordDetail"
         )
@@ -33,11 +33,12 @@ def terminate_provisioned_product(prefix, service_catalog, provisioned_product_i
         logger.info(
             f"{prefix} :: termination of {provisioned_product_id} current status: {status}"
         )
-        if status != "IN_PROGRESS":
-            break
-        else:
-            time.sleep(3)
+        return status != "IN_PROGRESS", record_detail
 
+    record_detail = waiter.wait_for(
+        check, waiter.get_key(service_catalog, "describe_record")
+    )
+    status = record_detail.get("Status")
     if status not in ["CREATED", "SUCCEEDED"]:
         logger.info(yaml.safe_dump(record_detail.get("RecordErrors")))
         raise Exception(f"Failed to terminate provisioned product: Status = {status}")
@@ -61,6 +62,20 @@ def get_provisioned_product_from_scan(
     return None
 
 
+def get_provisioned_products_by_name(service_catalog, logging_prefix):
+    logger.info(f"{logging_prefix}: running get_provisioned_products_by_name")
+    paginator = service_catalog.get_paginator("scan_provisioned_products")
+    pages = paginator.paginate(AccessLevelFilter={"Key": "Account", "Value": "self"},)
+
+    provisioned_products_by_name = dict()
+    for page in pages:
+        for provisioned_product in page.get("ProvisionedProducts", []):
+            provisioned_products_by_name[
+                provisioned_product.get("Name")
+            ] = provisioned_product
+    return provisioned_products_by_name
+
+
 def terminate_if_status_is_not_available(
     service_catalog,
     provisioned_product_name,
@@ -68,24 +83,33 @@ def terminate_if_status_is_not_available(
     account_id,
     region,
     should_delete_rollback_complete_stacks,
+    provisioned_products_by_name=None,
 ):
     prefix = f"[{provisioned_product_name}] {account_id}:{region}"
     logger.info(f"{prefix} :: checking if should be terminated")
-    provisioned_product = get_provisioned_product_from_scan(
-        service_catalog, provisioned_product_name, prefix
-    )
+    if provisioned_products_by_name is None:
+        provisioned_product = get_provisioned_product_from_scan(
+            service_catalog, provisioned_product_name, prefix
+        )
+    else:
+        provisioned_product = provisioned_products_by_name.get(provisioned_product_name)
 
     provisioned_product_id = False
     provisioning_artifact_id = False
     current_status = False
+    last_provisioning_record_id = None
     if provisioned_product is not None:
         current_status = provisioned_product.get("Status")
         logger.info(f"{prefix} :: current status is {current_status}")
         if current_status in ["AVAILABLE", "TAINTED"]:
             provisioned_product_id = provisioned_product.get("Id")
             provisioning_artifact_id = provisioned_product.get("ProvisioningArtifactId")
+            last_provisioning_record_id = provisioned_product.get(
+                "LastProvisioningRecordId"
+            )
         elif current_status in ["UNDER_CHANGE", "PLAN_IN_PROGRESS"]:
-            while True:
+
+            def check():
                 status = (
                     service_catalog.describe_provisioned_product(
                         Id=provisioned_product.get("Id")
@@ -94,16 +118,19 @@ def terminate_if_status_is_not_available(
                     .get("Status")
                 )
                 logger.info(f"{prefix} :: waiting to complete: {status}")
-                time.sleep(5)
-                if status not in ["UNDER_CHANGE", "PLAN_IN_PROGRESS"]:
-                    return terminate_if_status_is_not_available(
-                        service_catalog,
-                        provisioned_product_name,
-                        product_id,
-                        account_id,
-                        region,
-                        should_delete_rollback_complete_stacks,
-                    )
+                return status not in ["UNDER_CHANGE", "PLAN_IN_PROGRESS"], status
+
+            waiter.wait_for(
+                check, waiter.get_key(service_catalog, "describe_provisioned_product")
+            )
+            return terminate_if_status_is_not_available(
+                service_catalog,
+                provisioned_product_name,
+                product_id,
+                account_id,
+                region,
+                should_delete_rollback_complete_stacks,
+            )
 
         elif current_status == "ERROR":
             logger.info(
@@ -124,7 +151,29 @@ def terminate_if_status_is_not_available(
                 prefix, service_catalog, provisioned_product.get("Id")
             )
     logger.info(f"{prefix} :: Finished terminate_if_status_is_not_available")
-    return provisioned_product_id, provisioning_artifact_id, current_status
+    return (
+        provisioned_product_id,
+        provisioning_artifact_id,
+        current_status,
+        last_provisioning_record_id,
+    )
+
+
+def start_create_or_update_stack(cloudformation, stack_exists, **kwargs):
+    """
+    Starts creating or updating a stack, as create_or_update does without change sets, without waiting for it.
+
+    :return: the id of the stack, or None if there were no updates to perform
+    """
+    if not stack_exists:
+        return cloudformation.create_stack(**kwargs).get("StackId")
+    try:
+        return cloudformation.update_stack(**kwargs).get("StackId")
+    except cloudformation.exceptions.ClientError as ex:
+        if ex.response["Error"]["Message"] == "No updates are to be performed.":
+            logger.info(f"{kwargs.get('StackName')} :: no updates to perform")
+            return None
+        raise ex
 
 
 def get_stack_output_for(cloudformation, stack_name):
@@ -156,6 +205,32 @@ def get_parameters_for_stack(cloudformation, stack_name):
     return existing_stack_params_dict
 
 
+def wait_for_provisioned_product(
+    service_catalog, uid, provisioned_product_id, on_tainted=None
+):
+    def check():
+        response = service_catalog.describe_provisioned_product(
+            Id=provisioned_product_id
+        )
+        logger.info(
+            f"{uid} :: "
+            f"waiting for provision to complete: {response.get('ProvisionedProductDetail').get('Status')}"
+        )
+        provisioned_product_detail = response.get("ProvisionedProductDetail")
+        execute_status = provisioned_product_detail.get("Status")
+        if execute_status in ["ERROR", "TAINTED"]:
+            if execute_status == "TAINTED" and on_tainted is not None:
+                on_tainted()
+            raise Exception(
+                f"{uid} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
+            )
+        return execute_status in ["AVAILABLE", "EXECUTE_SUCCESS"], response
+
+    return waiter.wait_for(
+        check, waiter.get_key(service_catalog, "describe_provisioned_product")
+    )
+
+
 def provision_product_with_plan(
     service_catalog,
     launch_name,
@@ -218,17 +293,20 @@ def provision_product_with_plan(
     logger.info(f"{uid} :: Plan created, waiting for completion")
 
     plan_id = response.get("PlanId")
-    plan_status = "CREATE_IN_PROGRESS"
 
-    while plan_status == "CREATE_IN_PROGRESS":
-        describe_provisioned_product_plan_response = service_catalog.describe_provisioned_product_plan(
-            PlanId=plan_id
-        )
-        plan_status = describe_provisioned_product_plan_response.get(
-            "ProvisionedProductPlanDetails"
-        ).get("Status")
+    def check_plan_created():
+        response = service_catalog.describe_provisioned_product_plan(PlanId=plan_id)
+        plan_status = response.get("ProvisionedProductPlanDetails").get("Status")
         logger.info(f"{uid} :: Waiting for product plan: {plan_status}")
-        time.sleep(5)
+        return plan_status != "CREATE_IN_PROGRESS", response
+
+    describe_provisioned_product_plan_response = waiter.wait_for(
+        check_plan_created,
+        waiter.get_key(service_catalog, "describe_provisioned_product_plan"),
+    )
+    plan_status = describe_provisioned_product_plan_response.get(
+        "ProvisionedProductPlanDetails"
+    ).get("Status")
 
     if plan_status in ["CREATE_SUCCESS", "EXECUTE_SUCCESS"]:
         logger.info(
@@ -239,8 +317,7 @@ def provision_product_with_plan(
         logger.info(f"{uid} :: executing changes")
         service_catalog.execute_provisioned_product_plan(PlanId=plan_id)
 
-        plan_execute_status = "EXECUTE_IN_PROGRESS"
-        while plan_execute_status == "EXECUTE_IN_PROGRESS":
+        def check_plan_executed():
             response = service_catalog.describe_provisioned_product_plan(PlanId=plan_id)
             logger.info(f"{uid} :: executing changes for plan: {plan_id}")
             plan_execute_status = response.get("ProvisionedProductPlanDetails").get(
@@ -249,7 +326,15 @@ def provision_product_with_plan(
             logger.info(
                 f"{uid} :: waiting for execution to complete: {plan_execute_status}"
             )
-            time.sleep(5)
+            return plan_execute_status != "EXECUTE_IN_PROGRESS", response
+
+        response = waiter.wait_for(
+            check_plan_executed,
+            waiter.get_key(service_catalog, "describe_provisioned_product_plan"),
+        )
+        plan_execute_status = response.get("ProvisionedProductPlanDetails").get(
+            "Status"
+        )
 
         if plan_execute_status in ["CREATE_SUCCESS", "EXECUTE_SUCCESS"]:
             provisioned_product_id = response.get("ProvisionedProductPlanDetails").get(
@@ -257,31 +342,14 @@ def provision_product_with_plan(
             )
 
             logger.info(f"{uid} :: waiting for change to complete")
-            while True:
-                response = service_catalog.describe_provisioned_product(
-                    Id=provisioned_product_id
-                )
-                logger.info(
-                    f"{uid} :: "
-                    f"waiting for provision to complete: {response.get('ProvisionedProductDetail').get('Status')}"
-                )
-                provisioned_product_detail = response.get("ProvisionedProductDetail")
-                execute_status = provisioned_product_detail.get("Status")
-                if execute_status in ["AVAILABLE", "EXECUTE_SUCCESS"]:
-                    break
-                elif execute_status == "TAINTED":
-                    service_catalog.delete_provisioned_product_plan(
-                        PlanId=plan_id, IgnoreErrors=True,
-                    )
-                    raise Exception(
-                        f"{uid} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
-                    )
-                elif execute_status == "ERROR":
-                    raise Exception(
-                        f"{uid} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
-                    )
-                else:
-                    time.sleep(5)
+            wait_for_provisioned_product(
+                service_catalog,
+                uid,
+                provisioned_product_id,
+                on_tainted=lambda: service_catalog.delete_provisioned_product_plan(
+                    PlanId=plan_id, IgnoreErrors=True,
+                ),
+            )
 
             service_catalog.delete_provisioned_product_plan(
                 PlanId=plan_id, IgnoreErrors=True,
@@ -372,24 +440,7 @@ def provision_product(
     if execution == constants.EXECUTION_MODE_ASYNC:
         return provisioned_product_id
     else:
-        while True:
-            response = service_catalog.describe_provisioned_product(
-                Id=provisioned_product_id
-            )
-            logger.info(
-                f"{uid} :: "
-                f"waiting for provision to complete: {response.get('ProvisionedProductDetail').get('Status')}"
-            )
-            provisioned_product_detail = response.get("ProvisionedProductDetail")
-            execute_status = provisioned_product_detail.get("Status")
-            if execute_status in ["AVAILABLE", "EXECUTE_SUCCESS"]:
-                break
-            elif execute_status in ["ERROR", "TAINTED"]:
-                raise Exception(
-                    f"{uid} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
-                )
-            else:
-                time.sleep(5)
+        wait_for_provisioned_product(service_catalog, uid, provisioned_product_id)
         return provisioned_product_id
 
 
@@ -428,24 +479,7 @@ def update_provisioned_product(
     if execution == constants.EXECUTION_MODE_ASYNC:
         return provisioned_product_id
     else:
-        while True:
-            response = service_catalog.describe_provisioned_product(
-                Id=provisioned_product_id
-            )
-            logger.info(
-                f"{uid} :: "
-                f"waiting for provision to complete: {response.get('ProvisionedProductDetail').get('Status')}"
-            )
-            provisioned_product_detail = response.get("ProvisionedProductDetail")
-            execute_status = provisioned_product_detail.get("Status")
-            if execute_status in ["AVAILABLE", "EXECUTE_SUCCESS"]:
-                break
-            elif execute_status in ["ERROR", "TAINTED"]:
-                raise Exception(
-                    f"{uid} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
-                )
-            else:
-                time.sleep(5)
+        wait_for_provisioned_product(service_catalog, uid, provisioned_product_id)
         return provisioned_product_id
 
 
@@ -11,6 +11,7 @@ import click
 import yaml
 
 from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
 from servicecatalog_puppet.commands import bootstrap as bootstrap_commands
 from servicecatalog_puppet.commands import deploy as deploy_commands
 from servicecatalog_puppet.commands import graph as graph_commands
@@ -98,6 +99,24 @@ def deploy(
             click.echo("Using an exploded manifest")
             exploded_files = f.name.replace("expanded.yaml", "exploded-*.yaml")
             exploded_manifests = glob.glob(exploded_files)
+            concurrency = config.get_exploded_manifests_concurrency(puppet_account_id)
+            if concurrency > 1:
+                exploded_manifests_by_uid = dict()
+                for exploded_manifest in exploded_manifests:
+                    uid = re.search(".*exploded-(.*).yaml", exploded_manifest).group(1)
+                    exploded_manifests_by_uid[uid] = exploded_manifest
+                exit_status_code = deploy_commands.deploy_exploded_manifests_in_parallel(
+                    exploded_manifests_by_uid,
+                    puppet_account_id,
+                    executor_account_id,
+                    concurrency,
+                    single_account=single_account,
+                    num_workers=num_workers,
+                    execution_mode=execution_mode,
+                    on_complete_url=on_complete_url,
+                    output_cache_starting_point=output_cache_starting_point,
+                )
+                sys.exit(exit_status_code)
             for exploded_manifest in exploded_manifests:
                 click.echo(f"Created and running {exploded_manifest}")
                 uid = re.search(".*exploded-(.*).yaml", exploded_manifest).group(1)
@@ -310,8 +329,7 @@ def bootstrap_spokes_in_ou(
     envvar="SCT_SHOULD_VALIDATE",
 )
 @click.option(
-    "--custom-source-action-git-url",
-    envvar="SCM_CUSTOM_SOURCE_ACTION_GIT_URL",
+    "--custom-source-action-git-url", envvar="SCM_CUSTOM_SOURCE_ACTION_GIT_URL",
 )
 @click.option(
     "--custom-source-action-git-web-hook-ip-address",
@@ -388,12 +406,10 @@ def bootstrap(
         scm_object_key=None,
         scm_skip_creation_of_repo=not create_repo,
         should_validate=should_validate,
-
         custom_source_action_git_url=None,
         custom_source_action_git_web_hook_ip_address=None,
         custom_source_action_custom_action_type_version=None,
         custom_source_action_custom_action_type_provider=None,
-
     )
     if source_provider == "CodeCommit":
         parameters.update(dict(repo=repository_name, branch=branch_name,))
@@ -458,8 +474,25 @@ def list_launches(expanded_manifest, format):
 @click.option(
     "--parameter-override-forced/--no-parameter-override-forced", default=False
 )
-def expand(f, single_account, parameter_override_file, parameter_override_forced):
-    params = dict(single_account=single_account)
+@click.option("--org-snapshot-file", default=None)
+@click.option(
+    "--org-snapshot-ttl",
+    default=constants.ORG_SNAPSHOT_TTL_IN_SECONDS_DEFAULT,
+    type=click.INT,
+)
+def expand(
+    f,
+    single_account,
+    parameter_override_file,
+    parameter_override_forced,
+    org_snapshot_file,
+    org_snapshot_ttl,
+):
+    params = dict(
+        single_account=single_account,
+        org_snapshot_file=org_snapshot_file,
+        org_snapshot_ttl=org_snapshot_ttl,
+    )
     if parameter_override_forced or misc_commands.is_a_parameter_override_execution():
         overrides = dict(**yaml.safe_load(parameter_override_file.read()))
         params.update(overrides)
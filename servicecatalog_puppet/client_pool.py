@@ -0,0 +1,162 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import datetime
+import logging
+import os
+import threading
+import weakref
+
+from betterboto import client as betterboto_client
+from boto3.session import Session
+
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+class ClientPool(object):
+    """
+    Shares assumed role credentials, per role arn, and clients, per role arn, region and service, between the tasks
+    running in a process.  Credentials are assumed again once they are within refresh_window of expiring, along with
+    any clients made with them.
+    """
+
+    def __init__(
+        self,
+        refresh_window=datetime.timedelta(
+            seconds=constants.CLIENT_POOL_CREDENTIALS_REFRESH_WINDOW_IN_SECONDS
+        ),
+    ):
+        self.refresh_window = refresh_window
+        self.reset()
+
+    def reset(self):
+        self.lock = threading.Lock()
+        self.locks = dict()
+        self.credentials = dict()
+        self.clients = dict()
+        self.account_ids = weakref.WeakKeyDictionary()
+        self.stats = dict(
+            credential_hits=0, credential_misses=0, client_hits=0, client_misses=0,
+        )
+
+    def get_lock(self, key):
+        with self.lock:
+            return self.locks.setdefault(key, threading.Lock())
+
+    def increment(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def is_expiring(self, credentials):
+        expiration = credentials.get("Expiration")
+        now = datetime.datetime.now(tz=expiration.tzinfo)
+        return expiration - now < self.refresh_window
+
+    def get_credentials(self, role_arn, role_session_name):
+        with self.get_lock(("credentials", role_arn)):
+            credentials = self.credentials.get(role_arn)
+            if credentials is not None and not self.is_expiring(credentials):
+                self.increment("credential_hits")
+                return credentials
+            self.increment("credential_misses")
+            credentials = (
+                Session()
+                .client("sts")
+                .assume_role(RoleArn=role_arn, RoleSessionName=role_session_name)
+                .get("Credentials")
+            )
+            self.credentials[role_arn] = credentials
+            return credentials
+
+    def get_client(self, service_name, role_arn, role_session_name, region_name=None):
+        credentials = self.get_credentials(role_arn, role_session_name)
+        key = ("client", role_arn, region_name, service_name)
+        with self.get_lock(key):
+            cached = self.clients.get(key)
+            if cached is not None and cached[0] is credentials:
+                self.increment("client_hits")
+                return cached[1]
+            self.increment("client_misses")
+            kwargs = dict(
+                service_name=service_name,
+                aws_access_key_id=credentials.get("AccessKeyId"),
+                aws_secret_access_key=credentials.get("SecretAccessKey"),
+                aws_session_token=credentials.get("SessionToken"),
+            )
+            if region_name is not None:
+                kwargs["region_name"] = region_name
+            client = betterboto_client.make_better(
+                service_name, Session().client(**kwargs)
+            )
+            self.clients[key] = (credentials, client)
+            with self.lock:
+                self.account_ids[client] = get_account_id_from_role_arn(role_arn)
+            return client
+
+    def get_account_id(self, client):
+        with self.lock:
+            return self.account_ids.get(client)
+
+    def after_fork_in_child(self):
+        # clients hold connection pools that must not be shared with the parent and locks may have been held by other
+        # threads when the fork happened, so only the credentials are kept
+        credentials = self.credentials
+        self.reset()
+        self.credentials = credentials
+
+
+def get_account_id_from_role_arn(role_arn):
+    return role_arn.split(":")[4]
+
+
+pool = ClientPool()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=pool.after_fork_in_child)
+
+
+class CrossAccountClientContextManager(object):
+    """
+    A drop in replacement for betterboto's CrossAccountClientContextManager that takes its client from the pool.
+    """
+
+    def __init__(self, service_name, role_arn, role_session_name, region_name=None):
+        self.service_name = service_name
+        self.role_arn = role_arn
+        self.role_session_name = role_session_name
+        self.region_name = region_name
+
+    def __enter__(self):
+        return pool.get_client(
+            self.service_name,
+            self.role_arn,
+            self.role_session_name,
+            region_name=self.region_name,
+        )
+
+    def __exit__(self, *args, **kwargs):
+        pass
+
+
+def get_stats():
+    return pool.get_stats()
+
+
+def get_stats_since(stats):
+    """
+    Returns how much each stat of the pool in this process has grown since stats were taken.
+    """
+    return {stat: value - stats.get(stat, 0) for stat, value in get_stats().items()}
+
+
+def get_account_id(client):
+    """
+    Returns the account id of a client from the pool, or None for a client made elsewhere.
+    """
+    return pool.get_account_id(client)
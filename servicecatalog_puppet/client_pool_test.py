@@ -0,0 +1,108 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import datetime
+import unittest
+from unittest import mock
+
+from servicecatalog_puppet import client_pool
+
+
+def credentials_expiring_in(seconds, access_key_id="AKIA"):
+    return dict(
+        AccessKeyId=access_key_id,
+        SecretAccessKey="secret",
+        SessionToken="token",
+        Expiration=datetime.datetime.now(tz=datetime.timezone.utc)
+        + datetime.timedelta(seconds=seconds),
+    )
+
+
+class ClientPoolTest(unittest.TestCase):
+    role_arn = "arn:aws:iam::012345678910:role/servicecatalog-puppet/PuppetRole"
+
+    def setUp(self):
+        self.session_patcher = mock.patch.object(client_pool, "Session")
+        self.session = self.session_patcher.start()
+        self.sts = mock.MagicMock()
+        self.sts.assume_role.return_value = dict(
+            Credentials=credentials_expiring_in(3600)
+        )
+
+        def client(service_name, **kwargs):
+            if service_name == "sts":
+                return self.sts
+            return mock.MagicMock(name=f"{service_name}-{kwargs.get('region_name')}")
+
+        self.session.return_value.client.side_effect = client
+        self.sut = client_pool.ClientPool()
+
+    def tearDown(self):
+        self.session_patcher.stop()
+
+    def test_reuses_credentials_and_clients(self):
+        # exercise
+        first = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+        second = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+        other_region = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-2")
+        other_service = self.sut.get_client("cloudformation", self.role_arn, "session")
+
+        # verify
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_region)
+        self.assertIsNot(first, other_service)
+        self.sts.assume_role.assert_called_once_with(
+            RoleArn=self.role_arn, RoleSessionName="session"
+        )
+        self.assertDictEqual(
+            dict(
+                credential_hits=3, credential_misses=1, client_hits=1, client_misses=3
+            ),
+            self.sut.get_stats(),
+        )
+
+    def test_assumes_the_role_again_when_the_credentials_are_expiring(self):
+        # setup
+        self.sts.assume_role.side_effect = [
+            dict(Credentials=credentials_expiring_in(60, "AKIA1")),
+            dict(Credentials=credentials_expiring_in(3600, "AKIA2")),
+        ]
+
+        # exercise
+        first = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+        second = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+
+        # verify
+        self.assertIsNot(first, second)
+        self.assertEqual(2, self.sts.assume_role.call_count)
+        self.assertEqual(
+            "AKIA2", self.sut.credentials.get(self.role_arn).get("AccessKeyId")
+        )
+
+    def test_after_fork_in_child_keeps_only_the_credentials(self):
+        # setup
+        self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+
+        # exercise
+        self.sut.after_fork_in_child()
+        self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+
+        # verify
+        self.sts.assume_role.assert_called_once()
+        self.assertDictEqual(
+            dict(
+                credential_hits=1, credential_misses=0, client_hits=0, client_misses=1
+            ),
+            self.sut.get_stats(),
+        )
+
+    def test_get_account_id_is_the_account_of_the_role(self):
+        # setup
+        client = self.sut.get_client("ssm", self.role_arn, "session", "eu-west-1")
+
+        # exercise
+        actual_result = self.sut.get_account_id(client)
+
+        # verify
+        self.assertEqual("012345678910", actual_result)
+        self.assertIsNone(self.sut.get_account_id(mock.MagicMock()))
@@ -1,11 +1,18 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
+import multiprocessing
 import os
+import shutil
+from concurrent import futures
 from datetime import datetime
 
+import click
+import terminaltables
+
 from servicecatalog_puppet import config, constants
 from servicecatalog_puppet.commands.misc import generate_tasks
+from servicecatalog_puppet.workflow import journal
 from servicecatalog_puppet.workflow import runner as runner
 import logging
 
@@ -24,6 +31,7 @@ def deploy(
     on_complete_url=None,
     running_exploded=False,
     output_cache_starting_point="",
+    should_use_local_scheduler=False,
 ):
     if os.environ.get("SCT_CACHE_INVALIDATOR"):
         logger.info(
@@ -45,10 +53,26 @@ def deploy(
             puppet_account_id, os.environ.get("AWS_DEFAULT_REGION")
         )
     )
+    os.environ["SCT_SHOULD_PARK_WHILE_WAITING"] = str(
+        config.get_should_park_while_waiting(puppet_account_id)
+    )
+    os.environ["SCT_OUTPUT_STORE"] = str(config.get_output_store(puppet_account_id))
+    os.environ["SCT_SHOULD_USE_HUB_CATALOGUE"] = str(
+        config.get_should_use_hub_catalogue(puppet_account_id)
+    )
+    os.environ["SCT_HUB_CATALOGUE_CACHE_TTL"] = str(
+        config.get_hub_catalogue_cache_ttl(puppet_account_id)
+    )
+    os.environ["SCT_SHOULD_USE_STACK_FINGERPRINTS"] = str(
+        config.get_should_use_stack_fingerprints(puppet_account_id)
+    )
+    os.environ["SCT_SHOULD_USE_PROVISIONING_DIGESTS"] = str(
+        config.get_should_use_provisioning_digests(puppet_account_id)
+    )
     tasks_to_run = generate_tasks(
         f, puppet_account_id, executor_account_id, execution_mode, is_dry_run
     )
-    runner.run_tasks(
+    return runner.run_tasks(
         puppet_account_id,
         executor_account_id,
         tasks_to_run,
@@ -59,4 +83,123 @@ def deploy(
         on_complete_url,
         running_exploded,
         output_cache_starting_point=output_cache_starting_point,
+        should_use_local_scheduler=should_use_local_scheduler,
     )
+
+
+def deploy_exploded_manifest(
+    working_directory, puppet_account_id, executor_account_id, **kwargs
+):
+    os.chdir(working_directory)
+    with open("manifest-expanded.yaml", "r") as f:
+        exit_status_code = deploy(
+            f, puppet_account_id, executor_account_id, running_exploded=True, **kwargs
+        )
+    return exit_status_code
+
+
+def deploy_exploded_manifests_in_parallel(
+    exploded_manifests,
+    puppet_account_id,
+    executor_account_id,
+    concurrency,
+    num_workers=10,
+    **kwargs,
+):
+    """
+    Deploys the exploded manifests, concurrency of them at a time, each in its own process with its own working
+    directory under exploded_results.  The manifests share nothing so they can run in any order.  num_workers is split
+    between the manifests running at the same time.  Once they have all run their journals are merged into this
+    working directory's journal and a summary of each is shown.
+
+    :param exploded_manifests: dict of uid to the path of the exploded manifest
+    :param concurrency: how many exploded manifests to deploy at the same time
+    :param num_workers: how many luigi workers to use in total
+    :param kwargs: passed on to deploy
+    :return: 0 if all of the exploded manifests deployed successfully, otherwise the first non zero exit status code
+    """
+    concurrency = max(1, min(concurrency, len(exploded_manifests)))
+    workers_per_manifest = max(1, num_workers // concurrency)
+    click.echo(
+        f"Deploying {len(exploded_manifests)} exploded manifests, {concurrency} at a time with {workers_per_manifest} workers each"
+    )
+
+    working_directories = dict()
+    for uid, exploded_manifest in exploded_manifests.items():
+        working_directory = os.path.abspath(
+            os.path.join(constants.EXPLODED_RESULTS_DIRECTORY, uid)
+        )
+        # cleared so nothing left from an earlier deploy of this uid, eg its results or outputs, is picked up again
+        if os.path.exists(working_directory):
+            shutil.rmtree(working_directory)
+        os.makedirs(working_directory)
+        shutil.copy(
+            exploded_manifest, os.path.join(working_directory, "manifest-expanded.yaml")
+        )
+        if os.path.exists("config.yaml"):
+            shutil.copy("config.yaml", working_directory)
+        working_directories[uid] = working_directory
+
+    exit_status_codes = dict()
+    # spawned rather than forked so each deploy starts with a fresh luigi, client pool and poller
+    with futures.ProcessPoolExecutor(
+        max_workers=concurrency, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        deploying = {
+            executor.submit(
+                deploy_exploded_manifest,
+                working_directory,
+                puppet_account_id,
+                executor_account_id,
+                num_workers=workers_per_manifest,
+                # the manifests would share task ids, as their paths are relative to their own working directories,
+                # so a shared scheduler would hand a task to one of them and leave its output out of the others
+                should_use_local_scheduler=concurrency > 1,
+                **kwargs,
+            ): uid
+            for uid, working_directory in working_directories.items()
+        }
+        for deployed in futures.as_completed(deploying):
+            uid = deploying[deployed]
+            try:
+                exit_status_codes[uid] = deployed.result()
+            except Exception as e:
+                logger.error(f"Deploying exploded manifest {uid} failed: {e}")
+                exit_status_codes[uid] = 1
+            click.echo(f"Finished exploded manifest {uid}: {exit_status_codes[uid]}")
+
+    return merge_exploded_results(working_directories, exit_status_codes)
+
+
+def merge_exploded_results(working_directories, exit_status_codes):
+    """
+    Appends the events each exploded manifest journaled to this working directory's journal, each tagged with the uid
+    of its exploded manifest, and shows a summary of each.
+
+    :return: 0 if all of the exploded manifests deployed successfully, otherwise the first non zero exit status code
+    """
+    journal.create()
+    table_data = [["Exploded manifest", "Exit status code", "Tasks run", "Failures"]]
+    for uid, working_directory in sorted(working_directories.items()):
+        tasks_run = 0
+        failures = 0
+        journal_path = os.path.join(working_directory, journal.get_journal_path())
+        if os.path.exists(journal_path):
+            with open(journal_path, "r") as f:
+                for line in f:
+                    event = journal.parse(line)
+                    if event is None:
+                        continue
+                    if event.get("event_type") == "processing_time":
+                        tasks_run += 1
+                    elif event.get("event_type") == "failure":
+                        failures += 1
+                    event["exploded_manifest"] = uid
+                    journal.append(event)
+        table_data.append([uid, exit_status_codes.get(uid), tasks_run, failures])
+    click.echo(terminaltables.AsciiTable(table_data).table)
+
+    for uid in sorted(exit_status_codes.keys()):
+        if exit_status_codes.get(uid) not in [0, None]:
+            return exit_status_codes.get(uid)
+    return 0
@@ -14,11 +14,19 @@ from servicecatalog_puppet import asset_helpers
 from servicecatalog_puppet import config
 from servicecatalog_puppet import constants
 from servicecatalog_puppet import manifest_utils
+from servicecatalog_puppet import org_snapshot
 
 logger = logging.getLogger(__name__)
 
 
-def expand(f, puppet_account_id, single_account, subset=None):
+def expand(
+    f,
+    puppet_account_id,
+    single_account,
+    subset=None,
+    org_snapshot_file=None,
+    org_snapshot_ttl=constants.ORG_SNAPSHOT_TTL_IN_SECONDS_DEFAULT,
+):
     click.echo("Expanding")
     manifest = manifest_utils.load(f, puppet_account_id)
     org_iam_role_arn = config.get_org_iam_role_arn(puppet_account_id)
@@ -30,7 +38,21 @@ def expand(f, puppet_account_id, single_account, subset=None):
         with betterboto_client.CrossAccountClientContextManager(
             "organizations", org_iam_role_arn, "org-iam-role"
         ) as client:
-            new_manifest = manifest_utils.expand_manifest(manifest, client)
+            org_snapshot_target = None
+            if org_snapshot_file is not None:
+                org_snapshot_target = org_snapshot.get_target(
+                    puppet_account_id, org_snapshot_file
+                )
+            snapshot = org_snapshot.get(client, org_snapshot_target, org_snapshot_ttl)
+            expansion_cache_target = manifest_utils.ExpansionCache.get_target(
+                puppet_account_id,
+                f.name.replace(".yaml", "-expanded-fingerprints.json"),
+            )
+            expansion_cache = manifest_utils.ExpansionCache.load(expansion_cache_target)
+            new_manifest = manifest_utils.expand_manifest(
+                manifest, snapshot, expansion_cache
+            )
+            expansion_cache.save(expansion_cache_target)
     click.echo("Expanded")
     if single_account:
         click.echo(f"Filtering for single account: {single_account}")
@@ -94,7 +116,11 @@ def explode(f):
     )
     expanded_manifest = manifest_utils.Manifest(expanded_manifest)
 
-    exploded = manifest_utils.explode(expanded_manifest)
+    exploded = manifest_utils.explode(
+        expanded_manifest,
+        config.get_exploded_manifests_bins(puppet_account_id),
+        puppet_account_id,
+    )
     logger.info(f"found {len(exploded)} graphs")
     count = 0
     for mani in exploded:
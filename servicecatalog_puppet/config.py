@@ -5,9 +5,12 @@ import functools
 import logging
 import os
 
+import luigi
 import yaml
 from betterboto import client as betterboto_client
 from jinja2 import Environment, FileSystemLoader
+from luigi import format
+from luigi.contrib import s3
 
 from servicecatalog_puppet import asset_helpers
 from servicecatalog_puppet import constants
@@ -74,6 +77,17 @@ def get_should_delete_rollback_complete_stacks(puppet_account_id, default_region
     )
 
 
+@functools.lru_cache(maxsize=32)
+def get_should_park_while_waiting(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_SHOULD_PARK_WHILE_WAITING},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_SHOULD_PARK_WHILE_WAITING,
+        constants.CONFIG_SHOULD_PARK_WHILE_WAITING_DEFAULT,
+    )
+
+
 @functools.lru_cache(maxsize=32)
 def is_caching_enabled(puppet_account_id, default_region=None):
     logger.info(
@@ -91,6 +105,23 @@ def is_caching_enabled(puppet_account_id, default_region=None):
     return caching_enabled
 
 
+def get_caching_bucket_location(puppet_account_id, path):
+    return f"s3://sc-puppet-caching-bucket-{puppet_account_id}-{get_home_region(puppet_account_id)}/{path}"
+
+
+def get_caching_target(puppet_account_id, path, local_path=None):
+    """
+    Returns where path is kept between runs: the caching bucket when caching is enabled, otherwise a local file.
+
+    :param local_path: the local file to use instead of path
+    """
+    if is_caching_enabled(puppet_account_id):
+        return s3.S3Target(
+            get_caching_bucket_location(puppet_account_id, path), format=format.UTF8
+        )
+    return luigi.LocalTarget(local_path or path, format=format.UTF8)
+
+
 @functools.lru_cache(maxsize=32)
 def get_should_use_eventbridge(puppet_account_id, default_region=None):
     logger.info(
@@ -143,6 +174,81 @@ def get_should_explode_manifest(puppet_account_id, default_region=None):
     )
 
 
+@functools.lru_cache(maxsize=32)
+def get_output_store(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_OUTPUT_STORE},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_OUTPUT_STORE, constants.CONFIG_OUTPUT_STORE_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_should_use_hub_catalogue(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_SHOULD_USE_HUB_CATALOGUE},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_SHOULD_USE_HUB_CATALOGUE,
+        constants.CONFIG_SHOULD_USE_HUB_CATALOGUE_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_hub_catalogue_cache_ttl(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_HUB_CATALOGUE_CACHE_TTL},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_HUB_CATALOGUE_CACHE_TTL,
+        constants.CONFIG_HUB_CATALOGUE_CACHE_TTL_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_should_use_stack_fingerprints(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_SHOULD_USE_STACK_FINGERPRINTS},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_SHOULD_USE_STACK_FINGERPRINTS,
+        constants.CONFIG_SHOULD_USE_STACK_FINGERPRINTS_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_should_use_provisioning_digests(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_SHOULD_USE_PROVISIONING_DIGESTS},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_SHOULD_USE_PROVISIONING_DIGESTS,
+        constants.CONFIG_SHOULD_USE_PROVISIONING_DIGESTS_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_exploded_manifests_concurrency(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_EXPLODED_MANIFESTS_CONCURRENCY},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_EXPLODED_MANIFESTS_CONCURRENCY,
+        constants.CONFIG_EXPLODED_MANIFESTS_CONCURRENCY_DEFAULT,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def get_exploded_manifests_bins(puppet_account_id, default_region=None):
+    logger.info(
+        f"getting {constants.CONFIG_EXPLODED_MANIFESTS_BINS},  default_region: {default_region}"
+    )
+    return get_config(puppet_account_id, default_region).get(
+        constants.CONFIG_EXPLODED_MANIFESTS_BINS
+    )
+
+
 @functools.lru_cache(maxsize=32)
 def get_global_sharing_mode_default(puppet_account_id, default_region=None):
     logger.info(
@@ -190,6 +296,15 @@ def get_puppet_role_path():
     )
 
 
+@functools.lru_cache()
+def get_metrics_emf_file():
+    logger.info("getting metrics_emf_file")
+    return os.getenv(
+        constants.METRICS_EMF_FILE_ENVIRONMENTAL_VARIABLE_NAME,
+        constants.METRICS_EMF_FILE_DEFAULT,
+    )
+
+
 @functools.lru_cache()
 def get_puppet_role_arn(puppet_account_id):
     logger.info("getting puppet_role_arn")
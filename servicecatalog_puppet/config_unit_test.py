@@ -80,6 +80,18 @@ with such.A("get_config") as it:
             True,
         ),
         ("get_should_use_product_plans", "should_use_product_plans", True),
+        ("get_should_park_while_waiting", "should_park_while_waiting", True),
+        ("get_exploded_manifests_concurrency", "exploded_manifests_concurrency", 4),
+        ("get_exploded_manifests_bins", "exploded_manifests_bins", 8),
+        ("get_output_store", "output_store", "sqlite"),
+        ("get_should_use_hub_catalogue", "should_use_hub_catalogue", False),
+        ("get_hub_catalogue_cache_ttl", "hub_catalogue_cache_ttl", 3600),
+        ("get_should_use_stack_fingerprints", "should_use_stack_fingerprints", True),
+        (
+            "get_should_use_provisioning_digests",
+            "should_use_provisioning_digests",
+            False,
+        ),
     )
     def test(case, method_to_call, key, expected_result):
         # setup
@@ -173,3 +185,38 @@ def test_get_puppet_account_id(mocked_betterboto_client):
 
     # verify
     assert actual_result == expected_result
+
+
+@mocker.patch("servicecatalog_puppet.config.get_home_region", return_value="eu-west-1")
+@mocker.patch("servicecatalog_puppet.config.is_caching_enabled", return_value=True)
+def test_get_caching_target_when_caching_is_enabled(
+    mocked_is_caching_enabled, mocked_get_home_region
+):
+    # setup
+    from servicecatalog_puppet import config as sut
+
+    expected_result = (
+        "s3://sc-puppet-caching-bucket-012345678910-eu-west-1/cache/a.json"
+    )
+
+    # exercise
+    actual_result = sut.get_caching_target("012345678910", "cache/a.json", "a.json")
+
+    # verify
+    assert actual_result.path == expected_result
+
+
+@mocker.patch("servicecatalog_puppet.config.is_caching_enabled", return_value=False)
+def test_get_caching_target_when_caching_is_disabled(mocked_is_caching_enabled):
+    # setup
+    from servicecatalog_puppet import config as sut
+
+    # exercise
+    actual_result = sut.get_caching_target("012345678910", "cache/a.json")
+    actual_result_with_local_path = sut.get_caching_target(
+        "012345678910", "cache/a.json", "a.json"
+    )
+
+    # verify
+    assert actual_result.path == "cache/a.json"
+    assert actual_result_with_local_path.path == "a.json"
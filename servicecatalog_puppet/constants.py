@@ -50,6 +50,8 @@ AFFINITY_ACCOUNT = "account"
 AFFINITY_ACCOUNT_AND_REGION = "account-and-region"
 
 RESULTS_DIRECTORY = "results"
+RESULTS_JOURNAL_DIRECTORY = "journal"
+RESULTS_JOURNAL_FILE_NAME = "events.jsonl"
 
 NO_CHANGE = "NO_CHANGE"
 CHANGE = "CHANGE"
@@ -64,6 +66,33 @@ HOME_REGION = os.environ.get(
 )
 
 EVENTBRIDGE_MAX_EVENTS_PER_CALL = 10
+CLOUDWATCH_MAX_METRIC_DATA_PER_CALL = 1000
+CLIENT_POOL_CREDENTIALS_REFRESH_WINDOW_IN_SECONDS = 300
+
+WAITER_RATE_PER_SECOND = 1
+WAITER_RATE_BURST = 5
+WAITER_INITIAL_DELAY_IN_SECONDS = 2
+WAITER_MAX_DELAY_IN_SECONDS = 30
+WAITER_BLOCKING_MAX_DELAY_IN_SECONDS = 5
+
+SSM_GET_PARAMETERS_MAX_BATCH_SIZE = 10
+SSM_PARAMETER_CACHE_DIRECTORY = "ssm-parameter-cache"
+
+HUB_CATALOGUE_WORKERS = 8
+HUB_CATALOGUE_CACHE_DIRECTORY = "hub-catalogue-cache"
+
+TEMPLATE_CACHE_DIRECTORY = "template-cache"
+
+ORG_SNAPSHOT_WORKERS = 4
+ORG_SNAPSHOT_TTL_IN_SECONDS_DEFAULT = 3600
+ORG_SNAPSHOT_DIRECTORY = "org-snapshot"
+EXPANSION_CACHE_DIRECTORY = "expansion-cache"
+
+PROCESSING_TIME_METRICS_NAMESPACE = "ServiceCatalogTools/Puppet/v2/ProcessingTime/Tasks"
+METRICS_MAX_QUEUE_SIZE = 10000
+METRICS_FLUSH_INTERVAL_IN_SECONDS = 30
+METRICS_EMF_FILE_ENVIRONMENTAL_VARIABLE_NAME = "SCT_METRICS_EMF_FILE"
+METRICS_EMF_FILE_DEFAULT = ""
 
 SPOKE_VERSION_SSM_PARAM_NAME = "service-catalog-puppet-spoke-version"
 PUPPET_VERSION_SSM_PARAM_NAME = "service-catalog-puppet-version"
@@ -109,6 +138,10 @@ MANIFEST_SHOULD_USE_STACKS_SERVICE_ROLE = "use_stacks_service_role"
 CONFIG_SHOULD_USE_STACKS_SERVICE_ROLE_DEFAULT = False
 CONFIG_SHOULD_USE_SHARED_SCHEDULER = "should_use_shared_scheduler"
 CONFIG_SHOULD_EXPLODE_MANIFEST = "should_explode_manifest"
+CONFIG_EXPLODED_MANIFESTS_CONCURRENCY = "exploded_manifests_concurrency"
+CONFIG_EXPLODED_MANIFESTS_CONCURRENCY_DEFAULT = 1
+CONFIG_EXPLODED_MANIFESTS_BINS = "exploded_manifests_bins"
+EXPLODED_RESULTS_DIRECTORY = "exploded_results"
 
 PUBLISHED_VERSION = pkg_resources.require("aws-service-catalog-puppet")[0].version
 VERSION_OVERRIDE = "SCP_VERSION_OVERRIDE"
@@ -208,5 +241,30 @@ MANIFEST_STATUS_FIELD_VALUE_IGNORED = "ignored"
 CONFIG_SHOULD_DELETE_ROLLBACK_COMPLETE_STACKS = "should_delete_rollback_complete_stacks"
 CONFIG_SHOULD_DELETE_ROLLBACK_COMPLETE_STACKS_DEFAULT = False
 
+CONFIG_SHOULD_PARK_WHILE_WAITING = "should_park_while_waiting"
+CONFIG_SHOULD_PARK_WHILE_WAITING_DEFAULT = False
+PARKED_OUTPUT_DIRECTORY = "parked"
+PARKED_TASKS_RECHECK_INTERVAL_IN_SECONDS = 15
+
+CONFIG_SHOULD_USE_HUB_CATALOGUE = "should_use_hub_catalogue"
+CONFIG_SHOULD_USE_HUB_CATALOGUE_DEFAULT = True
+CONFIG_HUB_CATALOGUE_CACHE_TTL = "hub_catalogue_cache_ttl"
+CONFIG_HUB_CATALOGUE_CACHE_TTL_DEFAULT = 0
+
+CONFIG_SHOULD_USE_STACK_FINGERPRINTS = "should_use_stack_fingerprints"
+CONFIG_SHOULD_USE_STACK_FINGERPRINTS_DEFAULT = False
+STACK_FINGERPRINTS_DIRECTORY = "stack-fingerprints"
+
+CONFIG_SHOULD_USE_PROVISIONING_DIGESTS = "should_use_provisioning_digests"
+CONFIG_SHOULD_USE_PROVISIONING_DIGESTS_DEFAULT = True
+PROVISIONING_DIGESTS_DIRECTORY = "provisioning-digests"
+
+CONFIG_OUTPUT_STORE = "output_store"
+OUTPUT_STORE_FILES = "files"
+OUTPUT_STORE_SQLITE = "sqlite"
+CONFIG_OUTPUT_STORE_DEFAULT = OUTPUT_STORE_FILES
+OUTPUT_STORE_FILE_NAME = "outputs.db"
+OUTPUT_STORE_TIMEOUT_IN_SECONDS = 60
+
 
 PUPPET_LOGGER_NAME = "puppet-logger"
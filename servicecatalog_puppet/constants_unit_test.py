@@ -61,6 +61,8 @@ def test_constants_values():
         constants.WORKSPACES,
     ]
     assert constants.RESULTS_DIRECTORY == "results"
+    assert constants.RESULTS_JOURNAL_DIRECTORY == "journal"
+    assert constants.RESULTS_JOURNAL_FILE_NAME == "events.jsonl"
     assert constants.NO_CHANGE == "NO_CHANGE"
     assert constants.CHANGE == "CHANGE"
     assert constants.EVENT_BUS_NAME == "servicecatalog-puppet-event-bus"
@@ -69,6 +71,14 @@ def test_constants_values():
     assert constants.SERVICE_CATALOG_PUPPET_OPS_CENTER_SOURCE == "servicecatalog-puppet"
 
     assert constants.EVENTBRIDGE_MAX_EVENTS_PER_CALL == 10
+    assert constants.CLOUDWATCH_MAX_METRIC_DATA_PER_CALL == 1000
+    assert (
+        constants.PROCESSING_TIME_METRICS_NAMESPACE
+        == "ServiceCatalogTools/Puppet/v2/ProcessingTime/Tasks"
+    )
+    assert (
+        constants.METRICS_EMF_FILE_ENVIRONMENTAL_VARIABLE_NAME == "SCT_METRICS_EMF_FILE"
+    )
     assert (
         constants.SPOKE_VERSION_SSM_PARAM_NAME == "service-catalog-puppet-spoke-version"
     )
@@ -1,10 +1,14 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
+import collections.abc
 import configparser
+import hashlib
+import heapq
 import json
 import logging
 import os
+import threading
 from copy import deepcopy
 
 import click
@@ -14,6 +18,7 @@ from deepmerge import always_merger
 
 from servicecatalog_puppet import config
 from servicecatalog_puppet import constants
+from servicecatalog_puppet import org_snapshot
 from servicecatalog_puppet.macros import macros
 
 logger = logging.getLogger(__file__)
@@ -113,43 +118,171 @@ def load(f, puppet_account_id):
     return manifest
 
 
-def expand_manifest(manifest, client):
+class ExpansionCache(object):
+    """
+    What each account entry and macro of a manifest expanded to, by a fingerprint of its inputs and of the part of the
+    organization it was expanded against.  Saved with the expanded manifest, the next expand only resolves the entries
+    whose fingerprint changed and reuses what the others expanded to last time.
+    """
+
+    def __init__(self, previous=None):
+        self.previous = previous or dict()
+        self.resolved = dict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, target):
+        if not target.exists():
+            return cls()
+        try:
+            with target.open("r") as f:
+                return cls(json.loads(f.read()))
+        except ValueError:
+            logger.warning(
+                f"Ignoring the expansion cache in {target.path} as it is corrupt"
+            )
+            return cls()
+
+    def save(self, target):
+        logger.info(
+            f"Expansion cache: {self.hits} entries reused, {self.misses} resolved"
+        )
+        with target.open("w") as f:
+            f.write(json.dumps(self.resolved, default=str))
+
+    @staticmethod
+    def get_target(puppet_account_id, file_path):
+        """
+        Returns where the expansion cache of the manifest is kept between runs: the caching bucket when caching is
+        enabled, otherwise file_path.
+        """
+        return config.get_caching_target(
+            puppet_account_id,
+            f"{constants.EXPANSION_CACHE_DIRECTORY}/{os.path.basename(file_path)}",
+            file_path,
+        )
+
+    def get_or_resolve(self, inputs, resolve):
+        """
+        :param inputs: everything the result of resolve depends on
+        :param resolve: called when inputs have not been resolved before
+        :return: what resolve returned for inputs
+        """
+        fingerprint = hashlib.sha256(
+            json.dumps(inputs, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        if fingerprint in self.previous:
+            self.hits += 1
+            result = self.previous.get(fingerprint)
+        else:
+            self.misses += 1
+            result = json.loads(json.dumps(resolve(), default=str))
+        self.resolved[fingerprint] = result
+        return deepcopy(result)
+
+
+def expand_accounts_entry(account, client):
+    if account.get("account_id"):
+        account_id = account.get("account_id")
+        logger.info("Found an account: {}".format(account_id))
+        return [expand_account(account, client, account_id)]
+    elif account.get("ou"):
+        ou = account.get("ou")
+        logger.info("Found an ou: {}".format(ou))
+        if ou.startswith("/"):
+            return expand_path(account, client)
+        else:
+            return expand_ou(account, client)
+    return []
+
+
+def get_organization_inputs_for_accounts_entry(account, client):
+    """
+    The details of the accounts an account entry covers, and of those it excludes, which its expansion depends on.
+    These are read from the snapshot only, so working them out makes no calls to organizations.
+
+    :param client: an OrgSnapshot
+    """
+    if account.get("account_id"):
+        account_ids = [account.get("account_id")]
+    elif account.get("ou"):
+        ou = account.get("ou")
+        if ou.startswith("/"):
+            ou = client.convert_path_to_ou(ou)
+        account_ids = [
+            child.get("Id")
+            for child in client.list_children_nested(ParentId=ou, ChildType="ACCOUNT")
+        ]
+    else:
+        account_ids = []
+    excluded_account_ids = list()
+    for ou_exclusion in account.get("exclude", {}).get("ous", []):
+        if ou_exclusion.startswith("/"):
+            ou_exclusion = client.convert_path_to_ou(ou_exclusion)
+        excluded_account_ids += [
+            child.get("Id")
+            for child in client.list_children_nested(
+                ParentId=ou_exclusion, ChildType="ACCOUNT"
+            )
+        ]
+    return dict(
+        accounts=[client.accounts.get(account_id) for account_id in account_ids],
+        excluded=sorted(excluded_account_ids),
+    )
+
+
+def resolve_macros(parameters, client, cache=None):
+    for parameter_name, parameter_details in parameters.items():
+        if parameter_details.get("macro"):
+            macro = parameter_details.get("macro")
+            macro_to_run = macros.get(macro.get("method"))
+
+            def resolve():
+                return macro_to_run(client, macro.get("args"))
+
+            if cache is None or not isinstance(client, org_snapshot.OrgSnapshot):
+                result = resolve()
+            else:
+                result = cache.get_or_resolve(
+                    dict(macro=macro, organization=client.get_fingerprint()), resolve
+                )
+            parameter_details["default"] = result
+            del parameter_details["macro"]
+
+
+def expand_manifest(manifest, client, cache=None):
+    """
+    :param client: an organizations client, or an OrgSnapshot
+    :param cache: an ExpansionCache, only used with an OrgSnapshot as the fingerprints are worked out from it
+    """
     new_manifest = deepcopy(manifest)
     temp_accounts = []
 
     logger.info("Starting the expand")
 
+    if not isinstance(client, org_snapshot.OrgSnapshot):
+        cache = None
+
     for account in manifest.get("accounts"):
-        if account.get("account_id"):
-            account_id = account.get("account_id")
-            logger.info("Found an account: {}".format(account_id))
-            expanded_account = expand_account(account, client, account_id)
-            temp_accounts.append(expanded_account)
-        elif account.get("ou"):
-            ou = account.get("ou")
-            logger.info("Found an ou: {}".format(ou))
-            if ou.startswith("/"):
-                temp_accounts += expand_path(account, client)
-            else:
-                temp_accounts += expand_ou(account, client)
+        if cache is None:
+            temp_accounts += expand_accounts_entry(account, client)
+        else:
+            temp_accounts += cache.get_or_resolve(
+                dict(
+                    entry=account,
+                    organization=get_organization_inputs_for_accounts_entry(
+                        account, client
+                    ),
+                ),
+                lambda: expand_accounts_entry(deepcopy(account), client),
+            )
 
-    for parameter_name, parameter_details in new_manifest.get("parameters", {}).items():
-        if parameter_details.get("macro"):
-            macro_to_run = macros.get(parameter_details.get("macro").get("method"))
-            result = macro_to_run(client, parameter_details.get("macro").get("args"))
-            parameter_details["default"] = result
-            del parameter_details["macro"]
+    resolve_macros(new_manifest.get("parameters", {}), client, cache)
 
     accounts_by_id = {}
     for account in temp_accounts:
-        for parameter_name, parameter_details in account.get("parameters", {}).items():
-            if parameter_details.get("macro"):
-                macro_to_run = macros.get(parameter_details.get("macro").get("method"))
-                result = macro_to_run(
-                    client, parameter_details.get("macro").get("args")
-                )
-                parameter_details["default"] = result
-                del parameter_details["macro"]
+        resolve_macros(account.get("parameters", {}), client, cache)
 
         account_id = account.get("account_id")
         if account.get("append") or account.get("overwrite"):
@@ -194,18 +327,7 @@ def expand_manifest(manifest, client):
 
     for section in [constants.LAUNCHES, constants.STACKS]:
         for name, details in new_manifest.get(section, {}).items():
-            for parameter_name, parameter_details in details.get(
-                "parameters", {}
-            ).items():
-                if parameter_details.get("macro"):
-                    macro_to_run = macros.get(
-                        parameter_details.get("macro").get("method")
-                    )
-                    result = macro_to_run(
-                        client, parameter_details.get("macro").get("args")
-                    )
-                    parameter_details["default"] = result
-                    del parameter_details["macro"]
+            resolve_macros(details.get("parameters", {}), client, cache)
 
     return new_manifest
 
@@ -387,6 +509,96 @@ def get_from_dict(d, path):
     return result
 
 
+def get_additional_parameters(section_name, account_id, account):
+    if section_name in [constants.SPOKE_LOCAL_PORTFOLIOS, constants.ASSERTIONS]:
+        return dict(account_id=account_id)
+    return dict(account_id=account_id, account_parameters=account.get("parameters", {}))
+
+
+class SectionItemDeployments(object):
+    """
+    The task definitions for a single section item along with lookups by account and region
+    """
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.tasks_by_region = dict()
+        self.tasks_by_account = dict()
+        self.tasks_by_account_and_region = dict()
+        self.regions_by_account = dict()
+        for task in tasks:
+            account_id = task.get("account_id")
+            region = task.get("region")
+            self.tasks_by_region.setdefault(region, []).append(task)
+            self.tasks_by_account.setdefault(account_id, []).append(task)
+            self.tasks_by_account_and_region.setdefault(
+                (account_id, region), []
+            ).append(task)
+            self.regions_by_account.setdefault(account_id, dict())[region] = True
+
+    def get_tasks_for_region(self, region):
+        return list(self.tasks_by_region.get(region, []))
+
+    def get_tasks_for_account(self, account_id):
+        return list(self.tasks_by_account.get(account_id, []))
+
+    def get_tasks_for_account_and_region(self, account_id, region):
+        return list(self.tasks_by_account_and_region.get((account_id, region), []))
+
+
+class DeploymentIndex(object):
+    """
+    Lookups of accounts by id and tag, of task definitions by section item and of the affinities each item is depended
+    upon with, for a manifest.  Everything other than the accounts is worked out the first time it is asked for.
+    """
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.accounts_by_id = dict()
+        self.accounts_by_tag = dict()
+        self.deployments = dict()
+        self.affinities_used_by_dependents = None
+        for account in manifest.get(constants.ACCOUNTS, []):
+            self.accounts_by_id[str(account.get("account_id"))] = account
+            for tag in dict.fromkeys(account.get("tags", [])):
+                self.accounts_by_tag.setdefault(tag, []).append(account)
+
+    def get_account(self, account_id):
+        account = self.accounts_by_id.get(str(account_id))
+        if account is None:
+            raise Exception(f"Could not find account: {account_id}")
+        return account
+
+    def get_accounts_for_tag(self, tag):
+        return self.accounts_by_tag.get(tag, [])
+
+    def get_affinities_used_by_dependents(self, section_name_singular, item_name):
+        if self.affinities_used_by_dependents is None:
+            affinities_used_by_dependents = dict()
+            for section_name in constants.ALL_SECTION_NAMES:
+                for details in (self.manifest.get(section_name) or {}).values():
+                    for depends_on in details.get("depends_on", []):
+                        affinities_used_by_dependents.setdefault(
+                            (depends_on.get("type"), depends_on.get("name")), dict()
+                        )[depends_on.get(constants.AFFINITY)] = True
+            self.affinities_used_by_dependents = affinities_used_by_dependents
+        return self.affinities_used_by_dependents.get(
+            (section_name_singular, item_name), {}
+        )
+
+    def get_deployments_for(self, puppet_account_id, section_name, item_name):
+        key = (puppet_account_id, section_name, item_name)
+        deployments = self.deployments.get(key)
+        if deployments is None:
+            deployments = SectionItemDeployments(
+                self.manifest.generate_tasks_for(
+                    self, puppet_account_id, section_name, item_name
+                )
+            )
+            self.deployments[key] = deployments
+        return deployments
+
+
 class Manifest(dict):
     def has_cache(self):
         return self.get("id_cache") is not None
@@ -406,7 +618,14 @@ class Manifest(dict):
     def get_tasks_for(
         self, puppet_account_id, section_name, item_name, single_account="None"
     ):
-        accounts = self.get(constants.ACCOUNTS)
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, item_name
+        )
+        if single_account != "None":
+            return deployments.get_tasks_for_account(single_account)
+        return list(deployments.tasks)
+
+    def generate_tasks_for(self, index, puppet_account_id, section_name, item_name):
         section = self.get(section_name)
         provisioning_tasks = list()
         item = section[item_name]
@@ -525,195 +744,66 @@ class Manifest(dict):
             ),
         }.get(section_name)
 
-        tags = item.get(deploy_to).get("tags", [])
-        for tag in tags:
+        for tag in item.get(deploy_to).get("tags", []):
             tag_name = tag.get("tag")
             regions = tag.get("regions")
-            for account in accounts:
+            for account in index.get_accounts_for_tag(tag_name):
                 account_id = str(account.get("account_id"))
-                if single_account != "None" and single_account != account_id:
-                    continue
-                additional_parameters = {
-                    "launches": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                    "apps": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                    "workspaces": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                    "stacks": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                    "spoke-local-portfolios": dict(account_id=account_id,),
-                    "assertions": dict(account_id=account_id,),
-                    "lambda-invocations": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                    "code-build-runs": dict(
-                        account_id=account_id,
-                        account_parameters=account.get("parameters", {}),
-                    ),
-                }.get(section_name)
-                if tag_name in account.get("tags"):
-                    if isinstance(regions, str):
-                        if regions in [
-                            "enabled",
-                            "regions_enabled",
-                            "enabled_regions",
-                        ]:
-                            for region_enabled in account.get("regions_enabled"):
-                                provisioning_tasks.append(
-                                    dict(
-                                        **common_parameters,
-                                        **additional_parameters,
-                                        region=region_enabled,
-                                    )
-                                )
-                        elif regions == "default_region":
-                            provisioning_tasks.append(
-                                dict(
-                                    **common_parameters,
-                                    **additional_parameters,
-                                    region=account.get("default_region"),
-                                )
-                            )
-                        elif regions == "all":
-                            all_regions = config.get_regions(puppet_account_id)
-                            for region_enabled in all_regions:
-                                provisioning_tasks.append(
-                                    dict(
-                                        **common_parameters,
-                                        **additional_parameters,
-                                        region=region_enabled,
-                                    )
-                                )
-
-                        else:
-                            raise Exception(
-                                f"Unsupported regions {regions} setting for {constants.LAUNCHES}: {item_name}"
-                            )
-                    elif isinstance(regions, list):
-                        for region_ in regions:
-                            provisioning_tasks.append(
-                                dict(
-                                    **common_parameters,
-                                    **additional_parameters,
-                                    region=region_,
-                                )
-                            )
-                    elif isinstance(regions, tuple):
-                        for region_ in regions:
-                            provisioning_tasks.append(
-                                dict(
-                                    **common_parameters,
-                                    **additional_parameters,
-                                    region=region_,
-                                )
-                            )
-
-                    else:
-                        raise Exception(
-                            f"Unsupported regions {regions} setting for {constants.LAUNCHES}: {item_name}"
-                        )
-
-        for account_to_deploy_to in item.get(deploy_to).get("accounts", []):
-            account_id_of_account_to_deploy_to = account_to_deploy_to.get("account_id")
-            regions = account_to_deploy_to.get("regions")
-
-            account = self.get_account(account_id_of_account_to_deploy_to)
-            account_id = account_id_of_account_to_deploy_to
-            if single_account != "None" and single_account != account_id:
-                continue
-            additional_parameters = {
-                "launches": dict(
-                    account_id=account_id,
-                    account_parameters=account.get("parameters", {}),
-                ),
-                "stacks": dict(
-                    account_id=account_id,
-                    account_parameters=account.get("parameters", {}),
-                ),
-                "spoke-local-portfolios": dict(account_id=account_id,),
-                "assertions": dict(account_id=account_id,),
-                "lambda-invocations": dict(
-                    account_id=account_id,
-                    account_parameters=account.get("parameters", {}),
-                ),
-                "code-build-runs": dict(
-                    account_id=account_id,
-                    account_parameters=account.get("parameters", {}),
-                ),
-            }.get(section_name)
-
-            if isinstance(regions, str):
-                if regions in [
-                    "enabled",
-                    "regions_enabled",
-                    "enabled_regions",
-                ]:
-                    for region_enabled in account.get("regions_enabled"):
-                        provisioning_tasks.append(
-                            dict(
-                                **common_parameters,
-                                **additional_parameters,
-                                region=region_enabled,
-                            )
-                        )
-                elif regions == "default_region":
+                for region in self.get_regions_for_account(
+                    puppet_account_id, account, regions, item_name
+                ):
                     provisioning_tasks.append(
                         dict(
                             **common_parameters,
-                            **additional_parameters,
-                            region=account.get("default_region"),
+                            **get_additional_parameters(
+                                section_name, account_id, account
+                            ),
+                            region=region,
                         )
                     )
-                elif regions == "all":
-                    all_regions = config.get_regions(puppet_account_id)
-                    for region_enabled in all_regions:
-                        provisioning_tasks.append(
-                            dict(
-                                **common_parameters,
-                                **additional_parameters,
-                                region=region_enabled,
-                            )
-                        )
 
-                else:
-                    raise Exception(
-                        f"Unsupported regions {regions} setting for {constants.LAUNCHES}: {item_name}"
-                    )
-            elif isinstance(regions, list):
-                for region_ in regions:
-                    provisioning_tasks.append(
-                        dict(
-                            **common_parameters,
-                            **additional_parameters,
-                            region=region_,
-                        )
-                    )
-            elif isinstance(regions, tuple):
-                for region_ in regions:
-                    provisioning_tasks.append(
-                        dict(
-                            **common_parameters,
-                            **additional_parameters,
-                            region=region_,
-                        )
+        for account_to_deploy_to in item.get(deploy_to).get("accounts", []):
+            account_id = account_to_deploy_to.get("account_id")
+            regions = account_to_deploy_to.get("regions")
+            account = index.get_account(account_id)
+            for region in self.get_regions_for_account(
+                puppet_account_id, account, regions, item_name
+            ):
+                provisioning_tasks.append(
+                    dict(
+                        **common_parameters,
+                        **get_additional_parameters(section_name, account_id, account),
+                        region=region,
                     )
-
-            else:
-                raise Exception(
-                    f"Unsupported regions {regions} setting for {constants.LAUNCHES}: {item_name}"
                 )
         return provisioning_tasks
 
+    def get_regions_for_account(self, puppet_account_id, account, regions, item_name):
+        if isinstance(regions, str):
+            if regions in [
+                "enabled",
+                "regions_enabled",
+                "enabled_regions",
+            ]:
+                return account.get("regions_enabled")
+            elif regions == "default_region":
+                return [account.get("default_region")]
+            elif regions == "all":
+                return config.get_regions(puppet_account_id)
+        elif isinstance(regions, (list, tuple)):
+            return regions
+        raise Exception(
+            f"Unsupported regions {regions} setting for {constants.LAUNCHES}: {item_name}"
+        )
+
+    def get_deployment_index(self):
+        return DeploymentIndex(self)
+
+    def get_affinities_used_by_dependents(self, section_name_singular, item_name):
+        return self.get_deployment_index().get_affinities_used_by_dependents(
+            section_name_singular, item_name
+        )
+
     def get_tasks_for_launch_and_region(
         self,
         puppet_account_id,
@@ -722,16 +812,12 @@ class Manifest(dict):
         region,
         single_account="None",
     ):
-        return [
-            task
-            for task in self.get_tasks_for(
-                puppet_account_id,
-                section_name,
-                launch_name,
-                single_account=single_account,
-            )
-            if task.get("region") == region
-        ]
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, launch_name
+        )
+        if single_account != "None":
+            return deployments.get_tasks_for_account_and_region(single_account, region)
+        return deployments.get_tasks_for_region(region)
 
     def get_tasks_for_launch_and_account(
         self,
@@ -741,16 +827,12 @@ class Manifest(dict):
         account_id,
         single_account="None",
     ):
-        return [
-            task
-            for task in self.get_tasks_for(
-                puppet_account_id,
-                section_nam,
-                launch_name,
-                single_account=single_account,
-            )
-            if task.get("account_id") == account_id
-        ]
+        if single_account != "None" and single_account != account_id:
+            return []
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_nam, launch_name
+        )
+        return deployments.get_tasks_for_account(account_id)
 
     def get_tasks_for_launch_and_account_and_region(
         self,
@@ -761,52 +843,39 @@ class Manifest(dict):
         region,
         single_account="None",
     ):
-        return [
-            task
-            for task in self.get_tasks_for(
-                puppet_account_id,
-                section_name,
-                launch_name,
-                single_account=single_account,
-            )
-            if task.get("account_id") == account_id and task.get("region") == region
-        ]
+        if single_account != "None" and single_account != account_id:
+            return []
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, launch_name
+        )
+        return deployments.get_tasks_for_account_and_region(account_id, region)
 
     def get_regions_used_for_section_item(
         self, puppet_account_id, section_name, item_name
     ):
-        return list(
-            set(
-                task.get("region")
-                for task in self.get_tasks_for(
-                    puppet_account_id, section_name, item_name
-                )
-            )
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, item_name
         )
+        return list(deployments.tasks_by_region.keys())
 
     def get_account_ids_used_for_section_item(
         self, puppet_account_id, section_name, item_name
     ):
-        return list(
-            set(
-                task.get("account_id")
-                for task in self.get_tasks_for(
-                    puppet_account_id, section_name, item_name
-                )
-            )
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, item_name
         )
+        return list(deployments.tasks_by_account.keys())
 
     def get_account_ids_and_regions_used_for_section_item(
         self, puppet_account_id, section_name, item_name
     ):
-        result = dict()
-        for task in self.get_tasks_for(puppet_account_id, section_name, item_name):
-            if result.get(task.get("account_id")) is None:
-                result[task.get("account_id")] = list()
-            result[task.get("account_id")].append(task.get("region"))
-        for account_id in result.keys():
-            result[account_id] = list(set(result[account_id]))
-        return result
+        deployments = self.get_deployment_index().get_deployments_for(
+            puppet_account_id, section_name, item_name
+        )
+        return {
+            account_id: list(regions.keys())
+            for account_id, regions in deployments.regions_by_account.items()
+        }
 
     def get_mapping(self, mapping, account_id, region):
         manifest_mappings = self.get("mappings")
@@ -840,10 +909,7 @@ class Manifest(dict):
         return result
 
     def get_account(self, account_id):
-        for account in self.get("accounts"):
-            if account.get("account_id") == str(account_id):
-                return account
-        raise Exception(f"Could not find account: {account_id}")
+        return self.get_deployment_index().get_account(account_id)
 
     def get_sharing_policies_by_region(self):
         sharing_policies_by_region = {}
@@ -901,7 +967,7 @@ class Manifest(dict):
                     shares_by_region_portfolio_account[region] = {}
                 if shares_by_region_portfolio_account[region].get(portfolio) is None:
                     shares_by_region_portfolio_account[region][portfolio] = {}
-                result = self.get_account(account_id)
+                result = dict(task.account)
                 result[section] = launch_details
                 shares_by_region_portfolio_account[region][portfolio][
                     account_id
@@ -930,7 +996,6 @@ class Manifest(dict):
         launch_or_spoke_local_portfolio,
     ):
         launch_details = self.get(launch_or_spoke_local_portfolio).get(launch_name)
-        accounts = self.get("accounts")
         if launch_details is None:
             raise Exception(f"launch_details is None for {launch_name}")
         if launch_or_spoke_local_portfolio == "lambda-invocations":
@@ -941,113 +1006,131 @@ class Manifest(dict):
             deploy_to = launch_details.get("deploy_to") or launch_details.get(
                 "share_with"
             )
+        index = self.get_deployment_index()
         task_defs = []
         for tag_list_item in deploy_to.get("tags", []):
-            for account in accounts:
-                for tag in account.get("tags", []):
-                    if tag == tag_list_item.get("tag"):
-                        tag_account_def = deepcopy(configuration)
-                        tag_account_def["account_id"] = account.get("account_id")
-                        tag_account_def["account_parameters"] = account.get(
-                            "parameters", {}
-                        )
-
-                        regions = tag_list_item.get("regions", "default_region")
-                        if isinstance(regions, str):
-                            if regions in [
-                                "enabled",
-                                "regions_enabled",
-                                "enabled_regions",
-                            ]:
-                                for region_enabled in account.get("regions_enabled"):
-                                    region_tag_account_def = deepcopy(tag_account_def)
-                                    region_tag_account_def["region"] = region_enabled
-                                    task_defs.append(region_tag_account_def)
-                            elif regions == "default_region":
-                                region_tag_account_def = deepcopy(tag_account_def)
-                                region_tag_account_def["region"] = account.get(
-                                    "default_region"
-                                )
-                                task_defs.append(region_tag_account_def)
-                            elif regions == "all":
-                                all_regions = config.get_regions(puppet_account_id)
-                                for region_enabled in all_regions:
-                                    region_tag_account_def = deepcopy(tag_account_def)
-                                    region_tag_account_def["region"] = region_enabled
-                                    task_defs.append(region_tag_account_def)
-                            else:
-                                raise Exception(
-                                    f"Unsupported regions {regions} setting for launch: {launch_name}"
-                                )
-                        elif isinstance(regions, list):
-                            for region in regions:
-                                region_tag_account_def = deepcopy(tag_account_def)
-                                region_tag_account_def["region"] = region
-                                task_defs.append(region_tag_account_def)
-                        elif isinstance(regions, tuple):
-                            for region in regions:
-                                region_tag_account_def = deepcopy(tag_account_def)
-                                region_tag_account_def["region"] = region
-                                task_defs.append(region_tag_account_def)
-                        else:
-                            raise Exception(
-                                f"Unexpected regions of {regions} set for launch {launch_name}"
-                            )
+            for account in index.get_accounts_for_tag(tag_list_item.get("tag")):
+                for region in self.get_regions_for_account(
+                    puppet_account_id,
+                    account,
+                    tag_list_item.get("regions", "default_region"),
+                    launch_name,
+                ):
+                    task_defs.append(TaskDefinition(configuration, account, region))
 
         for account_list_item in deploy_to.get("accounts", []):
-            for account in accounts:
-                if account.get("account_id") == account_list_item.get("account_id"):
-                    account_account_def = deepcopy(configuration)
-                    account_account_def["account_id"] = account.get("account_id")
-                    account_account_def["account_parameters"] = account.get(
-                        "parameters", {}
-                    )
-
-                    regions = account_list_item.get("regions", "default_region")
-                    if isinstance(regions, str):
-                        if regions in ["enabled", "regions_enabled", "enabled_regions"]:
-                            for region_enabled in account.get("regions_enabled"):
-                                region_account_account_def = deepcopy(
-                                    account_account_def
-                                )
-                                region_account_account_def["region"] = region_enabled
-                                task_defs.append(region_account_account_def)
-                        elif regions in ["default_region"]:
-                            region_account_account_def = deepcopy(account_account_def)
-                            region_account_account_def["region"] = account.get(
-                                "default_region"
-                            )
-                            task_defs.append(region_account_account_def)
-                        elif regions in ["all"]:
-                            all_regions = config.get_regions(puppet_account_id)
-                            for region_enabled in all_regions:
-                                region_account_account_def = deepcopy(
-                                    account_account_def
-                                )
-                                region_account_account_def["region"] = region_enabled
-                                task_defs.append(region_account_account_def)
-                        else:
-                            raise Exception(
-                                f"Unsupported regions {regions} setting for launch: {launch_name}"
-                            )
-
-                    elif isinstance(regions, list):
-                        for region in regions:
-                            region_account_account_def = deepcopy(account_account_def)
-                            region_account_account_def["region"] = region
-                            task_defs.append(region_account_account_def)
-                    elif isinstance(regions, tuple):
-                        for region in regions:
-                            region_account_account_def = deepcopy(account_account_def)
-                            region_account_account_def["region"] = region
-                            task_defs.append(region_account_account_def)
-                    else:
-                        raise Exception(
-                            f"Unexpected regions of {regions} set for launch {launch_name}"
-                        )
+            # accounts not in the manifest, eg filtered out when expanding for a single account, are skipped
+            account = index.accounts_by_id.get(str(account_list_item.get("account_id")))
+            if account is None:
+                continue
+            for region in self.get_regions_for_account(
+                puppet_account_id,
+                account,
+                account_list_item.get("regions", "default_region"),
+                launch_name,
+            ):
+                task_defs.append(TaskDefinition(configuration, account, region))
         return task_defs
 
 
+class TaskDefinition(collections.abc.Mapping):
+    """
+    A read only task definition for an account and region.  It refers to the configuration and the account it was
+    made for, which are shared between all of the definitions made from them, rather than holding copies of them.
+    """
+
+    __slots__ = ("configuration", "account", "region")
+
+    def __init__(self, configuration, account, region):
+        self.configuration = configuration
+        self.account = account
+        self.region = region
+
+    def __getitem__(self, key):
+        if key == "account_id":
+            return self.account.get("account_id")
+        if key == "account_parameters":
+            return self.account.get("parameters", {})
+        if key == "region":
+            return self.region
+        return self.configuration[key]
+
+    def __iter__(self):
+        for key in self.configuration:
+            if key not in ["account_id", "account_parameters", "region"]:
+                yield key
+        yield from ["account_id", "account_parameters", "region"]
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _read_only(self, *args, **kwargs):
+    raise Exception("This manifest is shared between tasks and cannot be modified")
+
+
+class ReadOnlyManifest(Manifest):
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def get_deployment_index(self):
+        index = self.__dict__.get("deployment_index")
+        if index is None:
+            index = DeploymentIndex(self)
+            self.__dict__["deployment_index"] = index
+        return index
+
+    def __copy__(self):
+        return Manifest(self)
+
+    def __deepcopy__(self, memo):
+        return Manifest(deepcopy(dict(self), memo))
+
+
+_parsed_manifests_by_path = dict()
+_parsed_manifests_lock = threading.Lock()
+
+
+def get_parsed_manifest(manifest_file_path):
+    """
+    Returns the parsed manifest for manifest_file_path.  The file is only read again when its mtime or size changes and
+    it is only parsed again when the content hash changes, so every task using the same manifest shares one instance.
+    :param manifest_file_path: path to the (expanded) manifest
+    :return: a ReadOnlyManifest, use deepcopy to get a modifiable copy
+    """
+    path = os.path.abspath(manifest_file_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _parsed_manifests_lock:
+        cached = _parsed_manifests_by_path.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+
+        manifest = None
+        for _, other_digest, other_manifest in _parsed_manifests_by_path.values():
+            if other_digest == digest:
+                manifest = other_manifest
+                break
+        if manifest is None:
+            logger.info(f"parsing manifest {manifest_file_path} ({digest})")
+            manifest = ReadOnlyManifest(yaml.safe_load(content))
+
+        _parsed_manifests_by_path[path] = (signature, digest, manifest)
+        return manifest
+
+
 def create_minimal_manifest(manifest):
     minimal_manifest = deepcopy(manifest)
     # minimal_manifest[constants.ACCOUNTS] = dict()
@@ -1084,18 +1167,78 @@ def convert_to_graph(expanded_manifest, G):
     return G
 
 
-def explode(expanded_manifest):
+def get_cost_of_section_item(index, puppet_account_id, section_name, item_name):
+    """
+    Estimates how many tasks deploying a section item will create, which is how many account and region pairs it is
+    deployed to.
+
+    :return: the estimated number of tasks
+    """
+    deployments = index.get_deployments_for(puppet_account_id, section_name, item_name)
+    return max(1, len(deployments.tasks))
+
+
+def pack_into_bins(costs, num_bins):
+    """
+    Packs the items into at most num_bins bins of roughly equal cost, placing the most costly items first each into the
+    cheapest bin so far.
+
+    :param costs: list of the cost of each item
+    :param num_bins: the most bins to pack the items into
+    :return: list of the bins, each a list of the indexes of the items in it
+    """
+    bins = [(0, i, []) for i in range(min(num_bins, len(costs)))]
+    heapq.heapify(bins)
+    for item in sorted(range(len(costs)), key=lambda i: (-costs[i], i)):
+        cost, i, items = heapq.heappop(bins)
+        items.append(item)
+        heapq.heappush(bins, (cost + costs[item], i, items))
+    return [sorted(items) for _, _, items in sorted(bins, key=lambda b: b[1])]
+
+
+def explode(expanded_manifest, num_bins=None, puppet_account_id=None):
+    """
+    Splits the manifest into a manifest for each group of items connected by depends_on.  When num_bins is given the
+    groups are packed into that many manifests instead, each with a roughly equal number of tasks.
+
+    :param expanded_manifest: the expanded manifest to split
+    :param num_bins: the number of manifests to pack the groups into
+    :param puppet_account_id: the puppet account id, used to estimate the number of tasks in each group
+    :return: list of the exploded manifests
+    """
     G = convert_to_graph(expanded_manifest, nx.Graph())
 
     S = [G.subgraph(c).copy() for c in nx.connected_components(G)]
+    if num_bins:
+        index = DeploymentIndex(Manifest(expanded_manifest))
+        costs = [
+            sum(
+                get_cost_of_section_item(
+                    index,
+                    puppet_account_id,
+                    node[1].get("section"),
+                    node[1].get("item_name"),
+                )
+                for node in s.nodes(data=True)
+            )
+            for s in S
+        ]
+        bins = pack_into_bins(costs, num_bins)
+        logger.info(
+            f"Packed {len(S)} graphs into {len(bins)} bins costing {[sum(costs[i] for i in b) for b in bins]}"
+        )
+    else:
+        bins = [[i] for i in range(len(S))]
+
     exploded = list()
-    for s in S:
+    for b in bins:
         m = create_minimal_manifest(expanded_manifest)
-        for node in s.nodes(data=True):
-            data = deepcopy(node[1])
-            del data["section"]
-            del data["item_name"]
-            m[node[1].get("section")][node[1].get("item_name")] = data
+        for i in b:
+            for node in S[i].nodes(data=True):
+                data = deepcopy(node[1])
+                del data["section"]
+                del data["item_name"]
+                m[node[1].get("section")][node[1].get("item_name")] = data
         exploded.append(m)
     return exploded
 
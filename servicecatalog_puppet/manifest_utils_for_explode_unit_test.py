@@ -363,3 +363,64 @@ class TestManifestForExplode(unittest.TestCase):
 
         # verify
         self.assertListEqual(actual_results, expected_results)
+
+    def test_explode_into_bins_of_roughly_equal_cost(self):
+        # setup
+        launch_to_all_accounts = dict(
+            product="launch_to_all_accounts",
+            deploy_to=dict(
+                tags=[
+                    dict(tag=tag, regions="default_region")
+                    for tag in ["group:A", "group:B", "group:C"]
+                ]
+            ),
+        )
+        launch_to_account_a = dict(
+            product="launch_to_account_a",
+            deploy_to=dict(tags=[dict(tag="group:A", regions="default_region")]),
+        )
+        launch_to_account_b = dict(
+            product="launch_to_account_b",
+            deploy_to=dict(tags=[dict(tag="group:B", regions="default_region")]),
+        )
+        expanded_manifest = dict()
+        expanded_manifest[constants.ACCOUNTS] = self.accounts
+        expanded_manifest[constants.LAUNCHES] = dict(
+            launch_to_account_a=launch_to_account_a,
+            launch_to_all_accounts=launch_to_all_accounts,
+            launch_to_account_b=launch_to_account_b,
+        )
+        expanded_manifest[constants.STACKS] = dict()
+        expanded_manifest[constants.SPOKE_LOCAL_PORTFOLIOS] = dict()
+        expanded_manifest[constants.ACTIONS] = dict()
+        expanded_manifest[constants.LAMBDA_INVOCATIONS] = dict()
+        expanded_manifest[constants.ASSERTIONS] = dict()
+
+        expected_results_1 = deepcopy(expanded_manifest)
+        expected_results_1[constants.LAUNCHES] = dict(
+            launch_to_all_accounts=launch_to_all_accounts,
+        )
+        expected_results_2 = deepcopy(expanded_manifest)
+        expected_results_2[constants.LAUNCHES] = dict(
+            launch_to_account_a=launch_to_account_a,
+            launch_to_account_b=launch_to_account_b,
+        )
+        expected_results = [expected_results_1, expected_results_2]
+
+        # exercise
+        actual_results = self.sut(expanded_manifest, 2, "012345678910")
+
+        # verify
+        self.assertListEqual(actual_results, expected_results)
+
+    def test_pack_into_bins(self):
+        # setup
+        from servicecatalog_puppet import manifest_utils
+
+        costs = [1, 5, 2, 2, 1, 3]
+
+        # exercise
+        actual_results = manifest_utils.pack_into_bins(costs, 3)
+
+        # verify
+        self.assertListEqual([[1], [0, 4, 5], [2, 3]], actual_results)
@@ -348,6 +348,61 @@ class TestManifest(unittest.TestCase):
             self.account_b,
         )
 
+    def test_get_task_defs_from_details_refers_to_the_configuration(self):
+        # setup
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.update(deepcopy(self.launches))
+        configuration = dict(launch_parameters=dict(foo="bar"))
+
+        # exercise
+        actual_result = self.sut.get_task_defs_from_details(
+            self.puppet_account_id, "launch_c", configuration, "launches"
+        )
+
+        # verify
+        self.assertEqual(
+            [
+                dict(
+                    launch_parameters=dict(foo="bar"),
+                    account_id="009876543210",
+                    account_parameters={},
+                    region="us-west-2",
+                )
+            ],
+            [dict(task_def) for task_def in actual_result],
+        )
+        self.assertIs(
+            configuration.get("launch_parameters"),
+            actual_result[0].get("launch_parameters"),
+        )
+        with self.assertRaises(TypeError):
+            actual_result[0]["region"] = "eu-west-1"
+
+    def test_get_task_defs_from_details_skips_accounts_not_in_the_manifest(self):
+        # setup
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.update(deepcopy(self.launches))
+        self.sut["launches"]["launch_c"]["deploy_to"] = dict(
+            accounts=[
+                dict(account_id="111111111111", regions="default_region"),
+                dict(account_id="009876543210", regions="default_region"),
+            ]
+        )
+
+        # exercise
+        actual_result = self.sut.get_task_defs_from_details(
+            self.puppet_account_id, "launch_c", dict(), "launches"
+        )
+
+        # verify
+        self.assertEqual(
+            [("009876543210", "us-west-1")],
+            [
+                (task_def.get("account_id"), task_def.get("region"))
+                for task_def in actual_result
+            ],
+        )
+
     def test_get_sharing_policies_by_region(self):
         # setup
         self.sut.update(deepcopy(self.accounts))
@@ -370,3 +425,206 @@ class TestManifest(unittest.TestCase):
             actual_result.get("ap-west-1"),
             dict(organizations=[], accounts=["432100098765"]),
         )
+
+    def test_get_tasks_for_with_accounts_sharing_a_tag(self):
+        # setup
+        puppet_account_id = "01234567890"
+        section_name = "launches"
+        item_name = "launch_c"
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.get("accounts")[2]["tags"] = ["group:B", "group:B"]
+        self.sut.update(deepcopy(self.launches))
+        expected_result = [
+            ("009876543210", "us-west-2"),
+            ("432100098765", "ap-west-2"),
+        ]
+
+        # exercise
+        actual_results = self.sut.get_tasks_for(
+            puppet_account_id, section_name, item_name
+        )
+
+        # verify
+        self.assertListEqual(
+            expected_result,
+            [(task.get("account_id"), task.get("region")) for task in actual_results],
+        )
+
+    def test_get_tasks_for_single_account(self):
+        # setup
+        puppet_account_id = "01234567890"
+        section_name = "launches"
+        item_name = "launch_c"
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.get("accounts")[2]["tags"] = ["group:B"]
+        self.sut.update(deepcopy(self.launches))
+
+        # exercise
+        actual_results = self.sut.get_tasks_for(
+            puppet_account_id, section_name, item_name, single_account="432100098765"
+        )
+
+        # verify
+        self.assertEqual(1, len(actual_results))
+        self.assertEqual("432100098765", actual_results[0].get("account_id"))
+
+    def test_get_account_ids_and_regions_used_for_section_item(self):
+        # setup
+        puppet_account_id = "01234567890"
+        section_name = "launches"
+        item_name = "launch_a"
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.update(deepcopy(self.launches))
+        self.sut[section_name][item_name]["deploy_to"] = dict(
+            accounts=[
+                dict(account_id="012345678910", regions=["eu-west-1", "eu-west-2"]),
+                dict(account_id="012345678910", regions=["eu-west-2"]),
+            ]
+        )
+        expected_result = {"012345678910": ["eu-west-1", "eu-west-2"]}
+
+        # exercise
+        actual_results = self.sut.get_account_ids_and_regions_used_for_section_item(
+            puppet_account_id, section_name, item_name
+        )
+
+        # verify
+        self.assertDictEqual(expected_result, actual_results)
+
+    def test_get_account_for_unknown_account(self):
+        # setup
+        self.sut.update(deepcopy(self.accounts))
+
+        # exercise and verify
+        with self.assertRaises(Exception):
+            self.sut.get_account("999999999999")
+
+    def test_get_affinities_used_by_dependents(self):
+        # setup
+        self.sut.update(deepcopy(self.accounts))
+        self.sut.update(deepcopy(self.launches))
+        self.sut.update(deepcopy(self.assertions))
+        self.sut["launches"]["launch_b"]["depends_on"] = [
+            dict(name="launch_a", type="launch", affinity="region"),
+        ]
+        self.sut["launches"]["launch_c"]["depends_on"] = [
+            dict(name="launch_a", type="launch", affinity="account"),
+            dict(name="launch_b", type="launch", affinity="launch"),
+        ]
+        self.sut["assertions"]["assertion_a"]["depends_on"] = [
+            dict(name="launch_a", type="launch", affinity="region"),
+        ]
+
+        # exercise
+        actual_results = dict(
+            launch_a=self.sut.get_affinities_used_by_dependents("launch", "launch_a"),
+            launch_b=self.sut.get_affinities_used_by_dependents("launch", "launch_b"),
+            launch_c=self.sut.get_affinities_used_by_dependents("launch", "launch_c"),
+            stack_a=self.sut.get_affinities_used_by_dependents("stack", "launch_a"),
+        )
+
+        # verify
+        self.assertDictEqual(
+            dict(
+                launch_a=dict(region=True, account=True),
+                launch_b=dict(launch=True),
+                launch_c=dict(),
+                stack_a=dict(),
+            ),
+            actual_results,
+        )
+
+    def test_read_only_manifest_reuses_its_deployment_index(self):
+        # setup
+        from servicecatalog_puppet.manifest_utils import ReadOnlyManifest
+
+        puppet_account_id = "01234567890"
+        sut = ReadOnlyManifest(**deepcopy(self.accounts), **deepcopy(self.launches))
+
+        # exercise
+        first = sut.get_tasks_for(puppet_account_id, "launches", "launch_a")
+        first.clear()
+        second = sut.get_tasks_for(puppet_account_id, "launches", "launch_a")
+
+        # verify
+        self.assertIs(sut.get_deployment_index(), sut.get_deployment_index())
+        self.assertEqual(1, len(second))
+
+
+class TestGetParsedManifest(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from servicecatalog_puppet import manifest_utils
+
+        self.module = manifest_utils
+        self.directory = tempfile.TemporaryDirectory()
+        self.manifest_file_path = f"{self.directory.name}/manifest-expanded.yaml"
+        self.write_manifest("launches: {}\n")
+
+    def tearDown(self):
+        self.module._parsed_manifests_by_path.clear()
+        self.directory.cleanup()
+
+    def write_manifest(self, content, mtime_ns=None):
+        import os
+
+        with open(self.manifest_file_path, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.manifest_file_path, ns=(mtime_ns, mtime_ns))
+
+    def test_is_only_parsed_once(self):
+        # exercise
+        first = self.module.get_parsed_manifest(self.manifest_file_path)
+        second = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # verify
+        self.assertIs(first, second)
+        self.assertEqual({"launches": {}}, first)
+
+    def test_is_parsed_again_when_the_file_changes(self):
+        # setup
+        self.write_manifest("launches: {}\n", mtime_ns=1000000000)
+        first = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # exercise
+        self.write_manifest("stacks: {}\n", mtime_ns=2000000000)
+        second = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # verify
+        self.assertIsNot(first, second)
+        self.assertEqual({"stacks": {}}, second)
+
+    def test_is_not_parsed_again_when_only_the_mtime_changes(self):
+        # setup
+        self.write_manifest("launches: {}\n", mtime_ns=1000000000)
+        first = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # exercise
+        self.write_manifest("launches: {}\n", mtime_ns=2000000000)
+        second = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # verify
+        self.assertIs(first, second)
+
+    def test_is_read_only(self):
+        # setup
+        manifest = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # exercise and verify
+        with self.assertRaises(Exception):
+            manifest["launches"] = {"foo": {}}
+        with self.assertRaises(Exception):
+            manifest.update({"launches": {"foo": {}}})
+
+    def test_deepcopy_is_modifiable(self):
+        # setup
+        manifest = self.module.get_parsed_manifest(self.manifest_file_path)
+
+        # exercise
+        copied = deepcopy(manifest)
+        copied["id_cache"] = {}
+
+        # verify
+        self.assertIsInstance(copied, self.module.Manifest)
+        self.assertIsNone(manifest.get("id_cache"))
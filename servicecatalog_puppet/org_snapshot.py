@@ -0,0 +1,214 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent import futures
+
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(__file__)
+
+
+class OrgSnapshot(object):
+    """
+    The accounts and organizational units of an organization, taken once, answering the organizations calls expanding a
+    manifest makes: describe_account, convert_path_to_ou and list_children_nested.  Anything else is passed on to
+    client.
+    """
+
+    def __init__(
+        self, client, created, roots, organizational_units, accounts, children
+    ):
+        self.client = client
+        self.created = created
+        self.roots = roots
+        self.organizational_units = organizational_units
+        self.accounts = accounts
+        self.children = children
+        self.fingerprint = None
+
+    @classmethod
+    def take(cls, client, max_workers=constants.ORG_SNAPSHOT_WORKERS):
+        """
+        Lists the accounts while walking the tree one level at a time, listing the children of each parent in a level
+        in parallel.
+
+        :param client: an organizations client
+        :return: an OrgSnapshot
+        """
+        created = time.time()
+        roots = [root.get("Id") for root in client.list_roots().get("Roots", [])]
+        organizational_units = dict()
+        children = dict()
+
+        def list_children_of(parent_id):
+            return (
+                parent_id,
+                client.list_organizational_units_for_parent_single_page(
+                    ParentId=parent_id
+                ).get("OrganizationalUnits", []),
+                client.list_children_single_page(
+                    ParentId=parent_id, ChildType="ACCOUNT"
+                ).get("Children", []),
+            )
+
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            listing_accounts = executor.submit(client.list_accounts_single_page)
+            level = roots
+            while len(level) > 0:
+                next_level = list()
+                for parent_id, units, accounts in executor.map(list_children_of, level):
+                    children[parent_id] = dict(
+                        ORGANIZATIONAL_UNIT=[unit.get("Id") for unit in units],
+                        ACCOUNT=[account.get("Id") for account in accounts],
+                    )
+                    for unit in units:
+                        organizational_units[unit.get("Id")] = dict(
+                            Id=unit.get("Id"), Name=unit.get("Name"), Parent=parent_id
+                        )
+                        next_level.append(unit.get("Id"))
+                level = next_level
+            accounts = {
+                account.get("Id"): account
+                for account in listing_accounts.result().get("Accounts", [])
+            }
+
+        logger.info(
+            f"Took a snapshot of {len(accounts)} accounts in {len(organizational_units)} organizational units"
+        )
+        return cls(client, created, roots, organizational_units, accounts, children)
+
+    @classmethod
+    def load(cls, client, target):
+        with target.open("r") as f:
+            snapshot = json.loads(f.read())
+        return cls(client, **snapshot)
+
+    def save(self, target):
+        with target.open("w") as f:
+            f.write(
+                json.dumps(
+                    dict(
+                        created=self.created,
+                        roots=self.roots,
+                        organizational_units=self.organizational_units,
+                        accounts=self.accounts,
+                        children=self.children,
+                    ),
+                    default=str,
+                )
+            )
+
+    def get_fingerprint(self):
+        """
+        :return: a hash of the accounts and organizational units in the snapshot
+        """
+        if self.fingerprint is None:
+            self.fingerprint = hashlib.sha256(
+                json.dumps(
+                    [
+                        self.roots,
+                        self.organizational_units,
+                        self.accounts,
+                        self.children,
+                    ],
+                    sort_keys=True,
+                    default=str,
+                ).encode()
+            ).hexdigest()
+        return self.fingerprint
+
+    def describe_account(self, AccountId):
+        account = self.accounts.get(AccountId)
+        if account is None:
+            return self.client.describe_account(AccountId=AccountId)
+        return dict(Account=account)
+
+    def convert_path_to_ou(self, path):
+        if path == "/":
+            assert len(self.roots) == 1, "You have {} roots".format(len(self.roots))
+            return self.roots[0]
+        parts = path.strip("/").split("/")
+        for root in self.roots:
+            parent_id = root
+            for part in parts:
+                parent_id = self.find_child_named(parent_id, part)
+                if parent_id is None:
+                    break
+            if parent_id is not None:
+                return parent_id
+        raise Exception(f"Could not find an organizational unit with the path {path}")
+
+    def find_child_named(self, parent_id, name):
+        for child_id in self.get_children(parent_id, "ORGANIZATIONAL_UNIT"):
+            if self.organizational_units.get(child_id).get("Name") == name:
+                return child_id
+        return None
+
+    def get_children(self, parent_id, child_type):
+        if parent_id not in self.children:
+            raise Exception(f"{parent_id} is not in the snapshot of the organization")
+        return self.children.get(parent_id).get(child_type)
+
+    def list_children_nested(self, ParentId, ChildType):
+        """
+        Returns what organizations list_children_nested would, from the snapshot.
+        """
+        if ChildType == "ACCOUNT":
+            result = [
+                dict(Id=account_id)
+                for account_id in self.get_children(ParentId, "ACCOUNT")
+            ]
+        elif ChildType == "ORGANIZATIONAL_UNIT":
+            result = [ParentId]
+        else:
+            raise Exception("Unsupported ChildType: {}".format(ChildType))
+        for child_id in self.get_children(ParentId, "ORGANIZATIONAL_UNIT"):
+            result += self.list_children_nested(ParentId=child_id, ChildType=ChildType)
+        return result
+
+    def __getattr__(self, name):
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+
+def get_target(puppet_account_id, file_path):
+    """
+    Returns where the snapshot of the organization is kept between runs: the caching bucket when caching is enabled,
+    otherwise file_path.
+    """
+    return config.get_caching_target(
+        puppet_account_id,
+        f"{constants.ORG_SNAPSHOT_DIRECTORY}/{os.path.basename(file_path)}",
+        file_path,
+    )
+
+
+def get(client, target=None, ttl=constants.ORG_SNAPSHOT_TTL_IN_SECONDS_DEFAULT):
+    """
+    Returns a snapshot of the organization.  When target is given, the snapshot saved there is used if it was taken
+    within ttl seconds, otherwise a new one is taken and saved there.
+
+    :param client: an organizations client
+    :param target: where to save the snapshot between runs, see get_target
+    :param ttl: how many seconds a saved snapshot can be used for
+    :return: an OrgSnapshot
+    """
+    if target is not None and target.exists():
+        snapshot = OrgSnapshot.load(client, target)
+        age = time.time() - snapshot.created
+        if age < ttl:
+            logger.info(f"Using the snapshot of the organization in {target.path}")
+            return snapshot
+        logger.info(f"The snapshot in {target.path} is {int(age)} seconds old")
+    snapshot = OrgSnapshot.take(client)
+    if target is not None:
+        snapshot.save(target)
+    return snapshot
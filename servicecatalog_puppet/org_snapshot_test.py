@@ -0,0 +1,207 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet import manifest_utils
+from servicecatalog_puppet import org_snapshot
+
+
+class OrgSnapshotTest(unittest.TestCase):
+    organizational_units = {
+        "r-root": [dict(Id="ou-a", Name="A")],
+        "ou-a": [dict(Id="ou-b", Name="B")],
+        "ou-b": [],
+    }
+    accounts = {
+        "r-root": [dict(Id="000000000000")],
+        "ou-a": [dict(Id="111111111111")],
+        "ou-b": [dict(Id="222222222222"), dict(Id="333333333333")],
+    }
+
+    def setUp(self):
+        self.client = mock.MagicMock()
+        self.client.list_roots.return_value = dict(Roots=[dict(Id="r-root")])
+        self.client.list_organizational_units_for_parent_single_page.side_effect = lambda ParentId: dict(
+            OrganizationalUnits=self.organizational_units.get(ParentId)
+        )
+        self.client.list_children_single_page.side_effect = lambda ParentId, ChildType: dict(
+            Children=self.accounts.get(ParentId)
+        )
+        self.client.list_accounts_single_page.return_value = dict(
+            Accounts=[
+                dict(
+                    Id=account_id,
+                    Arn=f"arn:aws:organizations::000000000000:account/o-aaaaaaaa/{account_id}",
+                    Email=f"{account_id}@test.com",
+                    Name=account_id,
+                    Status="ACTIVE",
+                )
+                for account_id in [
+                    "000000000000",
+                    "111111111111",
+                    "222222222222",
+                    "333333333333",
+                ]
+            ]
+        )
+        self.sut = org_snapshot.OrgSnapshot.take(self.client)
+
+    def test_convert_path_to_ou(self):
+        # exercise
+        actual_result = [
+            self.sut.convert_path_to_ou(path) for path in ["/", "/A", "/A/B"]
+        ]
+
+        # verify
+        self.assertEqual(["r-root", "ou-a", "ou-b"], actual_result)
+
+    def test_list_children_nested(self):
+        # exercise
+        actual_result = self.sut.list_children_nested(
+            ParentId="ou-a", ChildType="ACCOUNT"
+        )
+
+        # verify
+        self.assertEqual(
+            [
+                dict(Id="111111111111"),
+                dict(Id="222222222222"),
+                dict(Id="333333333333"),
+            ],
+            actual_result,
+        )
+
+    def test_expand_manifest_resolves_from_the_snapshot(self):
+        # setup
+        manifest = dict(
+            accounts=[
+                dict(
+                    ou="/A",
+                    default_region="eu-west-1",
+                    regions_enabled=["eu-west-1"],
+                    tags=["group:A"],
+                    exclude=dict(ous=["/A/B"]),
+                )
+            ]
+        )
+
+        # exercise
+        actual_result = manifest_utils.expand_manifest(manifest, self.sut)
+
+        # verify
+        self.assertEqual(
+            ["111111111111"],
+            [account.get("account_id") for account in actual_result.get("accounts")],
+        )
+        self.client.describe_account.assert_not_called()
+
+    def test_get_uses_a_saved_snapshot_within_the_ttl(self):
+        # setup
+        with tempfile.TemporaryDirectory() as directory:
+            target = luigi.LocalTarget(os.path.join(directory, "org-snapshot.json"))
+            self.sut.save(target)
+
+            # exercise
+            actual_result = org_snapshot.get(self.client, target, ttl=60)
+
+        # verify
+        self.assertDictEqual(self.sut.children, actual_result.children)
+        self.client.list_roots.assert_called_once()
+
+    def test_get_takes_a_new_snapshot_once_the_ttl_has_passed(self):
+        # setup
+        self.sut.created = time.time() - 120
+        with tempfile.TemporaryDirectory() as directory:
+            target = luigi.LocalTarget(os.path.join(directory, "org-snapshot.json"))
+            self.sut.save(target)
+
+            # exercise
+            actual_result = org_snapshot.get(self.client, target, ttl=60)
+
+        # verify
+        self.assertGreater(actual_result.created, self.sut.created)
+        self.assertEqual(2, self.client.list_roots.call_count)
+
+    def test_expand_manifest_reuses_what_unchanged_entries_expanded_to(self):
+        # setup
+        manifest = dict(
+            accounts=[
+                dict(ou="/A/B", tags=["group:B"]),
+                dict(account_id="000000000000", tags=["group:root"]),
+            ]
+        )
+        cache = manifest_utils.ExpansionCache()
+        expected_result = manifest_utils.expand_manifest(manifest, self.sut, cache)
+
+        # exercise
+        next_cache = manifest_utils.ExpansionCache(cache.resolved)
+        with mock.patch.object(manifest_utils, "expand_accounts_entry") as expand:
+            actual_result = manifest_utils.expand_manifest(
+                manifest, self.sut, next_cache
+            )
+
+        # verify
+        self.assertDictEqual(expected_result, actual_result)
+        self.assertEqual(2, next_cache.hits)
+        expand.assert_not_called()
+
+    def test_expand_manifest_resolves_entries_whose_organization_changed(self):
+        # setup
+        manifest = dict(
+            accounts=[
+                dict(ou="/A/B", tags=["group:B"]),
+                dict(account_id="000000000000", tags=["group:root"]),
+            ]
+        )
+        cache = manifest_utils.ExpansionCache()
+        manifest_utils.expand_manifest(manifest, self.sut, cache)
+        self.sut.children["ou-b"]["ACCOUNT"].remove("333333333333")
+
+        # exercise
+        next_cache = manifest_utils.ExpansionCache(cache.resolved)
+        actual_result = manifest_utils.expand_manifest(manifest, self.sut, next_cache)
+
+        # verify
+        self.assertEqual(
+            ["222222222222", "000000000000"],
+            [account.get("account_id") for account in actual_result.get("accounts")],
+        )
+        self.assertEqual(1, next_cache.hits)
+        self.assertEqual(1, next_cache.misses)
+
+    def test_organization_inputs_are_read_from_the_snapshot_only(self):
+        # exercise
+        actual_result = manifest_utils.get_organization_inputs_for_accounts_entry(
+            dict(account_id="999999999999"), self.sut
+        )
+
+        # verify
+        self.assertEqual(dict(accounts=[None], excluded=[]), actual_result)
+        self.client.describe_account.assert_not_called()
+
+    def test_expansion_cache_is_saved_to_and_loaded_from_its_target(self):
+        # setup
+        cache = manifest_utils.ExpansionCache()
+        cache.get_or_resolve(dict(entry="a"), lambda: ["expanded"])
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch.object(
+                manifest_utils.config, "is_caching_enabled", return_value=False
+            ):
+                target = manifest_utils.ExpansionCache.get_target(
+                    "puppet_account_id",
+                    os.path.join(directory, "manifest-expanded-fingerprints.json"),
+                )
+            cache.save(target)
+
+            # exercise
+            actual_result = manifest_utils.ExpansionCache.load(target)
+
+        # verify
+        self.assertDictEqual(cache.resolved, actual_result.previous)
@@ -0,0 +1,201 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+
+from servicecatalog_puppet import client_pool, constants
+
+logger = logging.getLogger(__file__)
+
+
+class RateBudget(object):
+    """
+    A token bucket per key allowing rate calls per second, with bursts of up to burst calls.
+    """
+
+    def __init__(
+        self,
+        rate=constants.WAITER_RATE_PER_SECOND,
+        burst=constants.WAITER_RATE_BURST,
+        clock=time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.buckets = dict()
+
+    def get_delay(self, key):
+        """
+        Takes a token for key when one is available.
+
+        :return: 0 if a token was taken, otherwise how many seconds until one will be available
+        """
+        now = self.clock()
+        tokens, last = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            return 0
+        self.buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+def get_back_off(
+    attempt,
+    initial_delay=constants.WAITER_INITIAL_DELAY_IN_SECONDS,
+    max_delay=constants.WAITER_MAX_DELAY_IN_SECONDS,
+):
+    """
+    Exponential back off with equal jitter: somewhere between half and all of initial_delay * 2 ^ attempt, capped at
+    max_delay.
+    """
+    delay = min(max_delay, initial_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class Wait(object):
+    def __init__(
+        self, check, key, on_done=None, max_delay=constants.WAITER_MAX_DELAY_IN_SECONDS
+    ):
+        self.check = check
+        self.key = key
+        self.on_done = on_done
+        self.max_delay = max_delay
+        self.attempt = 0
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+    def finish(self, result, exception):
+        self.result = result
+        self.exception = exception
+        self.done.set()
+        if self.on_done is not None:
+            try:
+                self.on_done(result, exception)
+            except Exception:
+                logger.exception(f"on_done of the wait for {self.key} failed")
+
+
+class Poller(object):
+    """
+    A single thread that calls the check of every wait in flight when it is due, within the rate budget of its key,
+    and wakes the thread waiting on it once the check says it is done.
+
+    There is one poller per process and luigi runs each task in its own process when workers > 1, so the budget only
+    covers the waits made from one process.  Parked waits are all checked from the runner process by
+    parking.CompletionTracker, so their budget covers the whole run.
+
+    A blocking wait holds a worker slot until it is done so its back off is capped at
+    WAITER_BLOCKING_MAX_DELAY_IN_SECONDS, close to the interval the checks were made at before.  A watch holds no slot
+    and backs off to WAITER_MAX_DELAY_IN_SECONDS.
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget or RateBudget()
+        self.reset()
+
+    def reset(self):
+        self.condition = threading.Condition()
+        self.due = list()
+        self.counter = itertools.count()
+        self.thread = None
+        self.checks_made = 0
+
+    def wait_for(self, check, key):
+        """
+        Blocks until check returns (True, result) and returns result, or raises what check raised.
+
+        :param check: a callable returning a tuple of (is_done, result)
+        :param key: what the rate budget is spent from, see get_key
+        """
+        wait = Wait(
+            check, key, max_delay=constants.WAITER_BLOCKING_MAX_DELAY_IN_SECONDS
+        )
+        self.schedule(wait, 0)
+        wait.done.wait()
+        if wait.exception is not None:
+            raise wait.exception
+        return wait.result
+
+    def watch(self, check, key, on_done=None):
+        """
+        Checks check, as wait_for does, without blocking the caller.
+
+        :param on_done: called from the poller thread with (result, exception) once check is done or has raised
+        :return: the Wait
+        """
+        wait = Wait(check, key, on_done)
+        self.schedule(wait, 0)
+        return wait
+
+    def schedule(self, wait, delay):
+        with self.condition:
+            heapq.heappush(
+                self.due, (time.monotonic() + delay, next(self.counter), wait)
+            )
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def next_due(self):
+        with self.condition:
+            while True:
+                if len(self.due) > 0:
+                    due_at, _, wait = self.due[0]
+                    delay = due_at - time.monotonic()
+                    if delay <= 0:
+                        heapq.heappop(self.due)
+                        return wait
+                    self.condition.wait(delay)
+                else:
+                    self.condition.wait()
+
+    def run(self):
+        while True:
+            wait = self.next_due()
+            delay = self.budget.get_delay(wait.key)
+            if delay > 0:
+                self.schedule(wait, delay)
+                continue
+            self.checks_made += 1
+            try:
+                is_done, result = wait.check()
+            except Exception as e:
+                wait.finish(None, e)
+                continue
+            if is_done:
+                wait.finish(result, None)
+            else:
+                wait.attempt += 1
+                self.schedule(
+                    wait, get_back_off(wait.attempt - 1, max_delay=wait.max_delay)
+                )
+
+
+poller = Poller()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=poller.reset)
+
+
+def get_key(client, api):
+    """
+    Returns the key the rate budget for calling api with client is spent from: its account id, region and api.
+    """
+    return client_pool.get_account_id(client), client.meta.region_name, api
+
+
+def wait_for(check, key):
+    return poller.wait_for(check, key)
+
+
+def watch(check, key, on_done=None):
+    return poller.watch(check, key, on_done)
@@ -0,0 +1,152 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest import mock
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet import waiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sut = waiter.RateBudget(rate=2, burst=3, clock=self.clock)
+
+    def test_allows_a_burst_then_waits_for_tokens(self):
+        # exercise
+        actual_result = [self.sut.get_delay("key") for _ in range(4)]
+
+        # verify
+        self.assertEqual([0, 0, 0, 0.5], actual_result)
+
+    def test_refills_over_time(self):
+        # setup
+        for _ in range(3):
+            self.sut.get_delay("key")
+
+        # exercise
+        self.clock.now += 0.5
+        actual_result = self.sut.get_delay("key")
+
+        # verify
+        self.assertEqual(0, actual_result)
+
+    def test_budgets_are_per_key(self):
+        # setup
+        for _ in range(3):
+            self.sut.get_delay("key")
+
+        # exercise
+        actual_result = self.sut.get_delay("other_key")
+
+        # verify
+        self.assertEqual(0, actual_result)
+
+
+class GetBackOffTest(unittest.TestCase):
+    def test_grows_exponentially_with_jitter(self):
+        # exercise
+        actual_result = [
+            waiter.get_back_off(attempt, initial_delay=2, max_delay=30)
+            for attempt in range(6)
+        ]
+
+        # verify
+        for attempt, delay in enumerate(actual_result):
+            expected_ceiling = min(30, 2 * (2 ** attempt))
+            self.assertGreaterEqual(delay, expected_ceiling / 2)
+            self.assertLessEqual(delay, expected_ceiling)
+
+
+class GetKeyTest(unittest.TestCase):
+    def test_is_the_account_region_and_api_of_the_client(self):
+        # setup
+        client = mock.MagicMock()
+        client.meta.region_name = "eu-west-1"
+
+        # exercise
+        with mock.patch.object(
+            waiter.client_pool, "get_account_id", return_value="012345678910"
+        ) as get_account_id:
+            actual_result = waiter.get_key(client, "describe_record")
+
+        # verify
+        get_account_id.assert_called_once_with(client)
+        self.assertEqual(
+            ("012345678910", "eu-west-1", "describe_record"), actual_result
+        )
+
+
+class PollerTest(unittest.TestCase):
+    def setUp(self):
+        self.back_off_patcher = mock.patch.object(
+            waiter, "get_back_off", return_value=0.001
+        )
+        self.back_off_patcher.start()
+        self.sut = waiter.Poller(waiter.RateBudget(rate=1000, burst=1000))
+
+    def tearDown(self):
+        self.back_off_patcher.stop()
+
+    def test_wait_for_returns_the_result_once_done(self):
+        # setup
+        statuses = iter(["IN_PROGRESS", "IN_PROGRESS", "SUCCEEDED"])
+
+        def check():
+            status = next(statuses)
+            return status != "IN_PROGRESS", status
+
+        # exercise
+        actual_result = self.sut.wait_for(check, ("client", "describe_record"))
+
+        # verify
+        self.assertEqual("SUCCEEDED", actual_result)
+        self.assertEqual(3, self.sut.checks_made)
+
+    def test_wait_for_backs_off_no_further_than_a_blocking_wait_may(self):
+        # setup
+        statuses = iter([False, True])
+
+        # exercise
+        self.sut.wait_for(lambda: (next(statuses), None), ("client", "describe_record"))
+
+        # verify
+        waiter.get_back_off.assert_called_once_with(
+            0, max_delay=constants.WAITER_BLOCKING_MAX_DELAY_IN_SECONDS
+        )
+
+    def test_watch_backs_off_further_than_a_blocking_wait(self):
+        # setup
+        statuses = iter([False, True])
+
+        # exercise
+        wait = self.sut.watch(
+            lambda: (next(statuses), None), ("client", "describe_record")
+        )
+        wait.done.wait()
+
+        # verify
+        waiter.get_back_off.assert_called_once_with(
+            0, max_delay=constants.WAITER_MAX_DELAY_IN_SECONDS
+        )
+
+    def test_wait_for_raises_what_the_check_raised(self):
+        # setup
+        def check():
+            raise Exception("Execute failed: TAINTED")
+
+        # exercise
+        with self.assertRaises(Exception) as context:
+            self.sut.wait_for(check, ("client", "describe_provisioned_product"))
+
+        # verify
+        self.assertEqual("Execute failed: TAINTED", str(context.exception))
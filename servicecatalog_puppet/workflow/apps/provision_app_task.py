@@ -4,6 +4,7 @@
 import luigi
 
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.apps import app_base_task
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
 
@@ -25,9 +26,9 @@ class ProvisionAppTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
     worker_timeout = luigi.IntParameter(default=0, significant=False)
@@ -4,6 +4,8 @@
 import luigi
 
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import parking
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.codebuild_runs import code_build_run_base_task
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
 
@@ -23,9 +25,9 @@ class DoExecuteCodeBuildRunTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     project_name = luigi.Parameter()
     requested_priority = luigi.IntParameter()
@@ -52,7 +54,8 @@ class DoExecuteCodeBuildRunTask(
         return requirements
 
     def run(self):
-        with self.hub_client("codebuild") as codebuild:
+        codebuild_client = self.hub_client("codebuild")
+        with codebuild_client as codebuild:
             provided_parameters = self.get_parameter_values()
             parameters_to_use = list()
 
@@ -81,8 +84,22 @@ class DoExecuteCodeBuildRunTask(
             parameters_to_use.append(
                 dict(name="TARGET_REGION", value=self.region, type="PLAINTEXT",)
             )
-            codebuild.start_build_and_wait_for_completion(
-                projectName=self.project_name,
-                environmentVariablesOverride=parameters_to_use,
-            )
+            if self.should_park_while_waiting:
+                build_id = parking.submit_once(
+                    self,
+                    lambda: codebuild.start_build(
+                        projectName=self.project_name,
+                        environmentVariablesOverride=parameters_to_use,
+                    )
+                    .get("build")
+                    .get("id"),
+                )
+            else:
+                codebuild.start_build_and_wait_for_completion(
+                    projectName=self.project_name,
+                    environmentVariablesOverride=parameters_to_use,
+                )
+        if self.should_park_while_waiting:
+            completion = yield parking.park(self, "build", build_id, codebuild_client)
+            parking.get_result(completion)
         self.write_output(self.params_for_results_display())
@@ -4,6 +4,7 @@
 import luigi
 
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.codebuild_runs import code_build_run_base_task
 from servicecatalog_puppet.workflow.codebuild_runs import do_execute_code_build_run_task
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
@@ -24,9 +25,9 @@ class ExecuteCodeBuildRunTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     project_name = luigi.Parameter()
     requested_priority = luigi.IntParameter()
@@ -1,6 +1,8 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
+import functools
+
 from servicecatalog_puppet import constants
 from servicecatalog_puppet.workflow.generate import generate_shares_task
 
@@ -32,14 +34,28 @@ def generate_dependency_tasks(
     return these_dependencies
 
 
-def generate_dependency_task(
-    depends_on,
-    manifest_file_path,
-    puppet_account_id,
-    account_id,
-    region,
-    is_running_in_hub,
-):
+HUB_ONLY_DEPENDENCY_TYPES = [
+    constants.SPOKE_LOCAL_PORTFOLIO,
+    constants.ASSERTION,
+    constants.CODE_BUILD_RUN,
+    constants.LAMBDA_INVOCATION,
+]
+
+AFFINITY_SCOPES = {
+    constants.AFFINITY_ACCOUNT: (True, False),
+    constants.AFFINITY_REGION: (False, True),
+    constants.AFFINITY_ACCOUNT_AND_REGION: (True, True),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def get_dependency_task_registry():
+    """
+    Returns the task class for each type and affinity of dependency.  The task modules are imported here rather than
+    at the top of this module as they use DependenciesMixin.
+
+    :return: dict of (type, affinity) to a tuple of the task class and the name of its parameter naming the item
+    """
     from servicecatalog_puppet.workflow.launch import (
         launch_task,
         launch_for_account_task,
@@ -89,196 +105,154 @@ def generate_dependency_task(
         workspace_for_account_and_region_task,
     )
 
-    common_args = dict(
-        manifest_file_path=manifest_file_path, puppet_account_id=puppet_account_id,
-    )
+    sections = [
+        (
+            constants.LAUNCH,
+            "launch_name",
+            launch_task.LaunchTask,
+            launch_for_account_task.LaunchForAccountTask,
+            launch_for_region_task.LaunchForRegionTask,
+            launch_for_account_and_region_task.LaunchForAccountAndRegionTask,
+        ),
+        (
+            constants.STACK,
+            "stack_name",
+            stack_task.StackTask,
+            stack_for_account_task.StackForAccountTask,
+            stack_for_region_task.StackForRegionTask,
+            stack_for_account_and_region_task.StackForAccountAndRegionTask,
+        ),
+        (
+            constants.APP,
+            "app_name",
+            app_task.AppTask,
+            app_for_account_task.AppForAccountTask,
+            app_for_region_task.AppForRegionTask,
+            app_for_account_and_region_task.AppForAccountAndRegionTask,
+        ),
+        (
+            constants.WORKSPACE,
+            "workspace_name",
+            workspace_task.WorkspaceTask,
+            workspace_for_account_task.WorkspaceForAccountTask,
+            workspace_for_region_task.WorkspaceForRegionTask,
+            workspace_for_account_and_region_task.WorkspaceForAccountAndRegionTask,
+        ),
+        (
+            constants.SPOKE_LOCAL_PORTFOLIO,
+            "spoke_local_portfolio_name",
+            spoke_local_portfolio_task.SpokeLocalPortfolioTask,
+            spoke_local_portfolio_for_account_task.SpokeLocalPortfolioForAccountTask,
+            spoke_local_portfolio_for_region_task.SpokeLocalPortfolioForRegionTask,
+            spoke_local_portfolio_for_account_and_region_task.SpokeLocalPortfolioForAccountAndRegionTask,
+        ),
+        (
+            constants.ASSERTION,
+            "assertion_name",
+            assertion_task.AssertionTask,
+            assertion_for_account_task.AssertionForAccountTask,
+            assertion_for_region_task.AssertionForRegionTask,
+            assertion_for_account_and_region_task.AssertionForAccountAndRegionTask,
+        ),
+        (
+            constants.CODE_BUILD_RUN,
+            "code_build_run_name",
+            code_build_run_task.CodeBuildRunTask,
+            code_build_run_for_account_task.CodeBuildRunForAccountTask,
+            code_build_run_for_region_task.CodeBuildRunForRegionTask,
+            code_build_run_for_account_and_region_task.CodeBuildRunForAccountAndRegionTask,
+        ),
+        (
+            constants.LAMBDA_INVOCATION,
+            "lambda_invocation_name",
+            lambda_invocation_task.LambdaInvocationTask,
+            lambda_invocation_for_account_task.LambdaInvocationForAccountTask,
+            lambda_invocation_for_region_task.LambdaInvocationForRegionTask,
+            lambda_invocation_for_account_and_region_task.LambdaInvocationForAccountAndRegionTask,
+        ),
+    ]
 
-    if depends_on.get("type") == constants.LAUNCH:
-        if depends_on.get(constants.AFFINITY) == constants.LAUNCH:
-            return launch_task.LaunchTask(
-                **common_args, launch_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return launch_for_account_task.LaunchForAccountTask(
-                **common_args,
-                launch_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return launch_for_region_task.LaunchForRegionTask(
-                **common_args, launch_name=depends_on.get("name"), region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return launch_for_account_and_region_task.LaunchForAccountAndRegionTask(
-                **common_args,
-                launch_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
+    registry = dict()
+    for (
+        section,
+        name_parameter,
+        task_klass,
+        for_account_task_klass,
+        for_region_task_klass,
+        for_account_and_region_task_klass,
+    ) in sections:
+        registry[(section, section)] = (task_klass, name_parameter)
+        registry[(section, constants.AFFINITY_ACCOUNT)] = (
+            for_account_task_klass,
+            name_parameter,
+        )
+        registry[(section, constants.AFFINITY_REGION)] = (
+            for_region_task_klass,
+            name_parameter,
+        )
+        registry[(section, constants.AFFINITY_ACCOUNT_AND_REGION)] = (
+            for_account_and_region_task_klass,
+            name_parameter,
+        )
+    return registry
 
-    elif depends_on.get("type") == constants.STACK:
-        if depends_on.get(constants.AFFINITY) == constants.STACK:
-            return stack_task.StackTask(
-                **common_args, stack_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return stack_for_account_task.StackForAccountTask(
-                **common_args, stack_name=depends_on.get("name"), account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return stack_for_region_task.StackForRegionTask(
-                **common_args, stack_name=depends_on.get("name"), region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return stack_for_account_and_region_task.StackForAccountAndRegionTask(
-                **common_args,
-                stack_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
 
-    elif depends_on.get("type") == constants.APP:
-        if depends_on.get(constants.AFFINITY) == constants.APP:
-            return app_task.AppTask(**common_args, app_name=depends_on.get("name"),)
-        if depends_on.get(constants.AFFINITY) == "account":
-            return app_for_account_task.AppForAccountTask(
-                **common_args, app_name=depends_on.get("name"), account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return app_for_region_task.AppForRegionTask(
-                **common_args, app_name=depends_on.get("name"), region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return app_for_account_and_region_task.AppForAccountAndRegionTask(
-                **common_args,
-                app_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
+@functools.lru_cache(maxsize=None)
+def get_dependency_task(
+    depends_on_type,
+    affinity,
+    name,
+    manifest_file_path,
+    puppet_account_id,
+    account_id,
+    region,
+):
+    """
+    Returns the task for the dependency, interned so the many tasks depending on the same item share one instance
+    rather than each building its own for luigi to dedupe.  account_id and region are only used, and so should only be
+    given, when the affinity scopes the dependency to them.
+    """
+    task_klass, name_parameter = get_dependency_task_registry()[
+        (depends_on_type, affinity)
+    ]
+    kwargs = {
+        "manifest_file_path": manifest_file_path,
+        "puppet_account_id": puppet_account_id,
+        name_parameter: name,
+    }
+    uses_account_id, uses_region = AFFINITY_SCOPES.get(affinity, (False, False))
+    if uses_account_id:
+        kwargs["account_id"] = account_id
+    if uses_region:
+        kwargs["region"] = region
+    return task_klass(**kwargs)
 
-    elif depends_on.get("type") == constants.WORKSPACE:
-        if depends_on.get(constants.AFFINITY) == constants.WORKSPACE:
-            return workspace_task.WorkspaceTask(
-                **common_args, workspace_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return workspace_for_account_task.WorkspaceForAccountTask(
-                **common_args,
-                workspace_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return workspace_for_region_task.WorkspaceForRegionTask(
-                **common_args, workspace_name=depends_on.get("name"), region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return workspace_for_account_and_region_task.WorkspaceForAccountAndRegionTask(
-                **common_args,
-                workspace_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
 
-    elif (
-        is_running_in_hub and depends_on.get("type") == constants.SPOKE_LOCAL_PORTFOLIO
+def generate_dependency_task(
+    depends_on,
+    manifest_file_path,
+    puppet_account_id,
+    account_id,
+    region,
+    is_running_in_hub,
+):
+    depends_on_type = depends_on.get("type")
+    affinity = depends_on.get(constants.AFFINITY)
+    if (depends_on_type, affinity) not in get_dependency_task_registry() or (
+        depends_on_type in HUB_ONLY_DEPENDENCY_TYPES and not is_running_in_hub
     ):
-        if depends_on.get(constants.AFFINITY) == constants.SPOKE_LOCAL_PORTFOLIO:
-            return spoke_local_portfolio_task.SpokeLocalPortfolioTask(
-                **common_args, spoke_local_portfolio_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return spoke_local_portfolio_for_account_task.SpokeLocalPortfolioForAccountTask(
-                **common_args,
-                spoke_local_portfolio_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return spoke_local_portfolio_for_region_task.SpokeLocalPortfolioForRegionTask(
-                **common_args,
-                spoke_local_portfolio_name=depends_on.get("name"),
-                region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return spoke_local_portfolio_for_account_and_region_task.SpokeLocalPortfolioForAccountAndRegionTask(
-                **common_args,
-                spoke_local_portfolio_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
-    elif is_running_in_hub and depends_on.get("type") == constants.ASSERTION:
-        if depends_on.get(constants.AFFINITY) == constants.ASSERTION:
-            return assertion_task.AssertionTask(
-                **common_args, assertion_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return assertion_for_account_task.AssertionForAccountTask(
-                **common_args,
-                assertion_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return assertion_for_region_task.AssertionForRegionTask(
-                **common_args, assertion_name=depends_on.get("name"), region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return assertion_for_account_and_region_task.AssertionForAccountAndRegionTask(
-                **common_args,
-                assertion_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
-
-    elif is_running_in_hub and depends_on.get("type") == constants.CODE_BUILD_RUN:
-        if depends_on.get(constants.AFFINITY) == constants.CODE_BUILD_RUN:
-            return code_build_run_task.CodeBuildRunTask(
-                **common_args, code_build_run_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return code_build_run_for_account_task.CodeBuildRunForAccountTask(
-                **common_args,
-                code_build_run_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return code_build_run_for_region_task.CodeBuildRunForRegionTask(
-                **common_args,
-                code_build_run_name=depends_on.get("name"),
-                region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return code_build_run_for_account_and_region_task.CodeBuildRunForAccountAndRegionTask(
-                **common_args,
-                code_build_run_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
-
-    elif is_running_in_hub and depends_on.get("type") == constants.LAMBDA_INVOCATION:
-        if depends_on.get(constants.AFFINITY) == constants.LAMBDA_INVOCATION:
-            return lambda_invocation_task.LambdaInvocationTask(
-                **common_args, lambda_invocation_name=depends_on.get("name"),
-            )
-        if depends_on.get(constants.AFFINITY) == "account":
-            return lambda_invocation_for_account_task.LambdaInvocationForAccountTask(
-                **common_args,
-                lambda_invocation_name=depends_on.get("name"),
-                account_id=account_id,
-            )
-        if depends_on.get(constants.AFFINITY) == "region":
-            return lambda_invocation_for_region_task.LambdaInvocationForRegionTask(
-                **common_args,
-                lambda_invocation_name=depends_on.get("name"),
-                region=region,
-            )
-        if depends_on.get(constants.AFFINITY) == "account-and-region":
-            return lambda_invocation_for_account_and_region_task.LambdaInvocationForAccountAndRegionTask(
-                **common_args,
-                lambda_invocation_name=depends_on.get("name"),
-                account_id=account_id,
-                region=region,
-            )
+        raise Exception(f"Unhandled: {depends_on}")
 
-    raise Exception(f"Unhandled: {depends_on}")
+    uses_account_id, uses_region = AFFINITY_SCOPES.get(affinity, (False, False))
+    return get_dependency_task(
+        depends_on_type,
+        affinity,
+        depends_on.get("name"),
+        manifest_file_path,
+        puppet_account_id,
+        account_id if uses_account_id else None,
+        region if uses_region else None,
+    )
 
 
 class DependenciesMixin(object):
@@ -0,0 +1,77 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import dependency
+
+
+class GenerateDependencyTaskTest(unittest.TestCase):
+    manifest_file_path = "manifest_file_path"
+    puppet_account_id = "puppet_account_id"
+
+    def generate(self, depends_on, account_id, region, is_running_in_hub=True):
+        return dependency.generate_dependency_task(
+            depends_on,
+            self.manifest_file_path,
+            self.puppet_account_id,
+            account_id,
+            region,
+            is_running_in_hub,
+        )
+
+    def test_the_same_task_is_used_wherever_the_affinity_does_not_scope_it(self):
+        # setup
+        depends_on = dict(
+            name="launch-a", type=constants.LAUNCH, affinity=constants.LAUNCH
+        )
+
+        # exercise
+        first = self.generate(depends_on, "012345678910", "eu-west-1")
+        second = self.generate(depends_on, "109876543210", "us-east-1")
+
+        # verify
+        self.assertIs(first, second)
+        self.assertEqual("LaunchTask", first.get_task_family())
+        self.assertEqual("launch-a", first.launch_name)
+
+    def test_the_affinity_scopes_the_task(self):
+        # setup
+        depends_on = dict(
+            name="stack-a",
+            type=constants.STACK,
+            affinity=constants.AFFINITY_ACCOUNT_AND_REGION,
+        )
+
+        # exercise
+        first = self.generate(depends_on, "012345678910", "eu-west-1")
+        second = self.generate(depends_on, "012345678910", "us-east-1")
+
+        # verify
+        self.assertIsNot(first, second)
+        self.assertEqual("StackForAccountAndRegionTask", first.get_task_family())
+        self.assertEqual(
+            ("012345678910", "eu-west-1"), (first.account_id, first.region)
+        )
+
+    def test_an_unknown_affinity_is_unhandled(self):
+        # setup
+        depends_on = dict(name="launch-a", type=constants.LAUNCH, affinity="planet")
+
+        # exercise
+        with self.assertRaises(Exception) as context:
+            self.generate(depends_on, "012345678910", "eu-west-1")
+
+        # verify
+        self.assertTrue(str(context.exception).startswith("Unhandled: "))
+
+    def test_a_hub_only_type_is_unhandled_in_a_spoke(self):
+        # setup
+        depends_on = dict(
+            name="assertion-a", type=constants.ASSERTION, affinity=constants.ASSERTION,
+        )
+
+        # exercise
+        with self.assertRaises(Exception):
+            self.generate(depends_on, "012345678910", "eu-west-1", False)
@@ -9,6 +9,7 @@ from deepmerge import always_merger
 
 from servicecatalog_puppet import config, constants
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import parameter_cache
 from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.general import boto3_task
 from servicecatalog_puppet.workflow.workspaces import Limits
@@ -54,18 +55,83 @@ class GetSSMParamByPathTask(tasks.PuppetTask):
             return []
 
     def run(self):
-        parameters = dict()
-        with self.hub_regional_client("ssm") as ssm:
-            paginator = ssm.get_paginator("get_parameters_by_path")
-            for page in paginator.paginate(Path=self.path, Recursive=self.recursive):
-                for parameter in page.get("Parameters", []):
-                    parameters[parameter.get("Name")] = dict(
-                        Value=parameter.get("Value")
-                    )
+        parameters = parameter_cache.get_path(
+            self, self.region, self.path, self.recursive
+        )
+        if parameters is None:
+            parameters = dict()
+            with self.hub_regional_client("ssm") as ssm:
+                paginator = ssm.get_paginator("get_parameters_by_path")
+                for page in paginator.paginate(
+                    Path=self.path, Recursive=self.recursive
+                ):
+                    for parameter in page.get("Parameters", []):
+                        parameters[parameter.get("Name")] = dict(
+                            Value=parameter.get("Value")
+                        )
+            parameter_cache.put_path(self.region, self.path, self.recursive, parameters)
 
         self.write_output(parameters)
 
 
+class GetSSMParamBatchTask(tasks.PuppetTask):
+    """
+    Gets a SSM parameter from the hub account.  Luigi runs up to SSM_GET_PARAMETERS_MAX_BATCH_SIZE of these that are
+    pending for the same account and region as a single batch, with name being their names joined by commas, so they
+    are got with one call to get_parameters.  A parameter that is not found is written as not found so the rest of the
+    batch still succeeds.
+    """
+
+    name = luigi.Parameter(batch_method=",".join)
+    region = luigi.Parameter(default=None)
+    puppet_account_id = luigi.Parameter(default="")
+
+    max_batch_size = constants.SSM_GET_PARAMETERS_MAX_BATCH_SIZE
+
+    def params_for_results_display(self):
+        return {
+            "name": self.name,
+            "region": self.region,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+    def resources_used(self):
+        identifier = f"{self.region}-{self.puppet_account_id}"
+        return [
+            (identifier, Limits.SSM_GET_PARAMETER_PER_REGION_OF_ACCOUNT),
+        ]
+
+    def run(self):
+        names = self.name.split(",")
+        parameters = dict()
+        for name in names:
+            parameter = parameter_cache.get(self, self.region, name)
+            if parameter is not None:
+                parameters[name] = parameter
+        names_to_get = [name for name in names if name not in parameters]
+        if len(names_to_get) > 0:
+            with self.hub_regional_client("ssm") as ssm:
+                response = ssm.get_parameters(Names=names_to_get)
+            for parameter in response.get("Parameters", []):
+                name = parameter.get("Name") + parameter.get("Selector", "")
+                parameters[name] = parameter
+
+        for name in names:
+            parameter = parameters.get(name)
+            if parameter is None:
+                result = {"Name": name, "Region": self.region, "NotFound": True}
+            else:
+                result = {
+                    "Name": name,
+                    "Region": self.region,
+                    "Value": parameter.get("Value"),
+                    "Version": parameter.get("Version"),
+                }
+            GetSSMParamBatchTask(
+                name=name, region=self.region, puppet_account_id=self.puppet_account_id,
+            ).write_output(result)
+
+
 class GetSSMParamTask(tasks.PuppetTask):
     parameter_name = luigi.Parameter()
     name = luigi.Parameter()
@@ -88,8 +154,11 @@ class GetSSMParamTask(tasks.PuppetTask):
             "cache_invalidator": self.cache_invalidator,
         }
 
+    def should_use_batch(self):
+        return self.path == "" and len(self.depends_on) == 0
+
     def resources_used(self):
-        if self.path:
+        if self.path or self.should_use_batch():
             return []
         else:
             identifier = f"{self.region}-{self.puppet_account_id}"
@@ -111,6 +180,13 @@ class GetSSMParamTask(tasks.PuppetTask):
                 spoke_region=self.spoke_region,
             )
 
+        if self.should_use_batch():
+            deps["batch"] = GetSSMParamBatchTask(
+                name=self.name,
+                region=self.region,
+                puppet_account_id=self.puppet_account_id,
+            )
+
         if len(self.depends_on) > 0:
             deps["dependencies"] = dependency.generate_dependency_tasks(
                 self.depends_on,
@@ -123,7 +199,18 @@ class GetSSMParamTask(tasks.PuppetTask):
         return deps
 
     def run(self):
-        if self.path == "":
+        if self.should_use_batch():
+            parameter = self.load_from_input("batch")
+            if parameter.get("NotFound"):
+                raise Exception(
+                    f"ParameterNotFound: {self.name} in {self.region} for {self.parameter_name}"
+                )
+            self.write_output(parameter)
+        elif self.path == "":
+            parameter = parameter_cache.get(self, self.region, self.name)
+            if parameter is not None:
+                self.write_output(parameter)
+                return
             with self.hub_regional_client("ssm") as ssm:
                 try:
                     p = ssm.get_parameter(Name=self.name,)
@@ -1,7 +1,8 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
-from unittest import skip
+import json
+from unittest import mock, skip
 
 from servicecatalog_puppet.workflow import tasks_unit_tests_helper
 
@@ -72,3 +73,148 @@ class GetSSMParamTaskTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
 
         # verify
         raise NotImplementedError()
+
+
+class GetSSMParamTaskUsingBatchTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.general import get_ssm_param_task
+
+        self.module = get_ssm_param_task
+
+        self.sut = self.module.GetSSMParamTask(
+            parameter_name="parameter_name",
+            name="/a",
+            region="region",
+            path="",
+            recursive=True,
+            puppet_account_id="puppet_account_id",
+        )
+
+        self.wire_up_mocks()
+
+    def test_requires(self):
+        # exercise
+        actual_result = self.sut.requires()
+
+        # verify
+        self.assertEqual(
+            dict(
+                batch=self.module.GetSSMParamBatchTask(
+                    name="/a", region="region", puppet_account_id="puppet_account_id"
+                )
+            ),
+            actual_result,
+        )
+        self.assertEqual([], self.sut.resources_used())
+
+    def test_run(self):
+        # setup
+        parameter = dict(Name="/a", Region="region", Value="b", Version=1)
+        self.inject_into_input("batch", json.dumps(parameter))
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.assert_output(parameter)
+
+    def test_run_when_the_parameter_is_not_found(self):
+        # setup
+        self.inject_into_input(
+            "batch", json.dumps(dict(Name="/a", Region="region", NotFound=True))
+        )
+
+        # exercise
+        with self.assertRaises(Exception) as context:
+            self.sut.run()
+
+        # verify
+        self.assertIn("ParameterNotFound: /a", str(context.exception))
+        self.sut.write_output.assert_not_called()
+
+
+class GetSSMParamBatchTaskTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.general import get_ssm_param_task
+
+        self.module = get_ssm_param_task
+
+        self.sut = self.module.GetSSMParamBatchTask(
+            name="/a,/b,/c:2", region="region", puppet_account_id="puppet_account_id",
+        )
+
+        self.wire_up_mocks()
+
+    def test_batch_param_names(self):
+        # exercise
+        actual_result = self.module.GetSSMParamBatchTask.batch_param_names()
+
+        # verify
+        self.assertEqual(["name"], actual_result)
+
+    def test_run(self):
+        # setup
+        self.inject_hub_regional_client_called_with_response(
+            "ssm",
+            "get_parameters",
+            dict(
+                Parameters=[
+                    dict(Name="/a", Value="a", Version=1),
+                    dict(Name="/c", Selector=":2", Value="c", Version=2),
+                ],
+                InvalidParameters=["/b"],
+            ),
+        )
+
+        # exercise
+        with mock.patch.object(
+            self.module.parameter_cache, "get", return_value=None
+        ), mock.patch.object(
+            self.module.GetSSMParamBatchTask, "write_output", autospec=True
+        ) as write_output:
+            self.sut.run()
+
+        # verify
+        self.assert_hub_regional_client_called_with(
+            "ssm", "get_parameters", dict(Names=["/a", "/b", "/c:2"])
+        )
+        self.assertEqual(
+            [
+                ("/a", dict(Name="/a", Region="region", Value="a", Version=1)),
+                ("/b", dict(Name="/b", Region="region", NotFound=True)),
+                ("/c:2", dict(Name="/c:2", Region="region", Value="c", Version=2)),
+            ],
+            [(call[0][0].name, call[0][1]) for call in write_output.call_args_list],
+        )
+
+    def test_run_only_gets_parameters_that_are_not_cached(self):
+        # setup
+        cached = {"/a": dict(Name="/a", Region="region", Value="a", Version=1)}
+        self.inject_hub_regional_client_called_with_response(
+            "ssm",
+            "get_parameters",
+            dict(Parameters=[dict(Name="/b", Value="b", Version=1)]),
+        )
+
+        # exercise
+        with mock.patch.object(
+            self.module.parameter_cache,
+            "get",
+            side_effect=lambda task, region, name: cached.get(name),
+        ), mock.patch.object(
+            self.module.GetSSMParamBatchTask, "write_output", autospec=True
+        ) as write_output:
+            self.sut.run()
+
+        # verify
+        self.assert_hub_regional_client_called_with(
+            "ssm", "get_parameters", dict(Names=["/b", "/c:2"])
+        )
+        self.assertEqual(
+            [
+                ("/a", dict(Name="/a", Region="region", Value="a", Version=1)),
+                ("/b", dict(Name="/b", Region="region", Value="b", Version=1)),
+                ("/c:2", dict(Name="/c:2", Region="region", NotFound=True)),
+            ],
+            [(call[0][0].name, call[0][1]) for call in write_output.call_args_list],
+        )
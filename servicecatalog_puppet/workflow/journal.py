@@ -0,0 +1,102 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import os
+from pathlib import Path
+
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+def get_journal_path():
+    return (
+        Path(constants.RESULTS_DIRECTORY)
+        / constants.RESULTS_JOURNAL_DIRECTORY
+        / constants.RESULTS_JOURNAL_FILE_NAME
+    )
+
+
+def create():
+    os.makedirs(get_journal_path().parent)
+    open(get_journal_path(), "w").close()
+
+
+def append(event):
+    """
+    Appends the event to the journal as a single line.  The file is opened in append mode and written to with a
+    single call so events from tasks running in other worker processes are not interleaved.
+
+    :param event: a dict with at least event_type and task_type
+    """
+    line = json.dumps(event, default=str) + "\n"
+    fd = os.open(get_journal_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def parse(line, event_types=None, task_types=None):
+    """
+    Parses a line of the journal, returning None when it is incomplete or not of the given types.
+    """
+    line = line.strip()
+    if line == "":
+        return None
+    try:
+        event = json.loads(line)
+    except json.JSONDecodeError:
+        logger.warning(f"Skipping incomplete journal entry: {line[:100]}")
+        return None
+    if event_types is not None and event.get("event_type") not in event_types:
+        return None
+    if task_types is not None and event.get("task_type") not in task_types:
+        return None
+    return event
+
+
+def read(event_types=None, task_types=None):
+    """
+    Yields the events in the journal in the order they were recorded, optionally only those of the given types.
+
+    :param event_types: the event types to yield, or None for all
+    :param task_types: the task types to yield, or None for all
+    :return: a generator of (event, line) tuples, where line is the event as recorded
+    """
+    if not os.path.exists(get_journal_path()):
+        return
+    with open(get_journal_path(), "r") as f:
+        for line in f:
+            event = parse(line, event_types, task_types)
+            if event is not None:
+                yield event, line.strip()
+
+
+def follow(stop, event_types=None, poll_interval_in_seconds=0.5):
+    """
+    Yields the events in the journal as they are recorded until stop is set.  Events recorded before stop was set are
+    always yielded.
+
+    :param stop: a threading.Event
+    :param event_types: the event types to yield, or None for all
+    :param poll_interval_in_seconds: how long to wait for new events when the end of the journal is reached
+    :return: a generator of events
+    """
+    with open(get_journal_path(), "r") as f:
+        partial = ""
+        while True:
+            stopping = stop.is_set()
+            line = f.readline()
+            if line.endswith("\n"):
+                event = parse(partial + line, event_types)
+                partial = ""
+                if event is not None:
+                    yield event
+            else:
+                partial += line
+                if stopping:
+                    return
+                stop.wait(poll_interval_in_seconds)
@@ -0,0 +1,106 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from servicecatalog_puppet.workflow import journal
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        journal.create()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_read_returns_events_in_the_order_they_were_appended(self):
+        # setup
+        journal.append(dict(event_type="start", task_type="A"))
+        journal.append(dict(event_type="success", task_type="A"))
+
+        # exercise
+        actual_result = [event for event, _ in journal.read()]
+
+        # verify
+        self.assertListEqual(
+            [
+                dict(event_type="start", task_type="A"),
+                dict(event_type="success", task_type="A"),
+            ],
+            actual_result,
+        )
+
+    def test_read_filters_by_event_and_task_type(self):
+        # setup
+        journal.append(dict(event_type="dry_run", task_type="A", effect="NO_CHANGE"))
+        journal.append(dict(event_type="dry_run", task_type="B", effect="CHANGE"))
+        journal.append(dict(event_type="success", task_type="A"))
+
+        # exercise
+        actual_result = [
+            event
+            for event, _ in journal.read(event_types=["dry_run"], task_types=["A"])
+        ]
+
+        # verify
+        self.assertListEqual(
+            [dict(event_type="dry_run", task_type="A", effect="NO_CHANGE")],
+            actual_result,
+        )
+
+    def test_read_returns_the_line_as_recorded(self):
+        # setup
+        journal.append(dict(event_type="processing_time", task_type="A", duration=1))
+
+        # exercise
+        _, line = next(journal.read())
+
+        # verify
+        self.assertEqual(
+            dict(event_type="processing_time", task_type="A", duration=1),
+            json.loads(line),
+        )
+
+    def test_read_skips_incomplete_events(self):
+        # setup
+        journal.append(dict(event_type="start", task_type="A"))
+        with open(journal.get_journal_path(), "a") as f:
+            f.write('{"event_type": "succ')
+
+        # exercise
+        actual_result = [event for event, _ in journal.read()]
+
+        # verify
+        self.assertListEqual([dict(event_type="start", task_type="A")], actual_result)
+
+    def test_follow_yields_events_recorded_before_stop(self):
+        # setup
+        stop = threading.Event()
+        journal.append(dict(event_type="processing_time", task_type="A"))
+        journal.append(dict(event_type="start", task_type="B"))
+        journal.append(dict(event_type="processing_time", task_type="B"))
+        stop.set()
+
+        # exercise
+        actual_result = list(
+            journal.follow(
+                stop, event_types=["processing_time"], poll_interval_in_seconds=0
+            )
+        )
+
+        # verify
+        self.assertListEqual(
+            [
+                dict(event_type="processing_time", task_type="A"),
+                dict(event_type="processing_time", task_type="B"),
+            ],
+            actual_result,
+        )
@@ -0,0 +1,26 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+
+
+def is_recorded(target, key, value):
+    """
+    Returns True when value was recorded in target against key.  The key is something that changes whenever what value
+    describes is changed, by the framework or not, so a value recorded against an earlier key is never used.
+    """
+    if key is None or not target.exists():
+        return False
+    try:
+        with target.open("r") as f:
+            recorded = json.loads(f.read())
+    except ValueError:
+        return False
+    return recorded == dict(key=key, value=value)
+
+
+def record(target, key, value):
+    if key is None:
+        return
+    with target.open("w") as f:
+        f.write(json.dumps(dict(key=key, value=value)))
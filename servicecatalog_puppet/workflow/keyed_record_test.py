@@ -0,0 +1,71 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+
+import luigi
+
+from servicecatalog_puppet.workflow import keyed_record
+
+
+class KeyedRecordTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.target = luigi.LocalTarget(os.path.join(self.directory.name, "a.json"))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_is_recorded_against_the_same_key(self):
+        # setup
+        keyed_record.record(self.target, "key-1", "value")
+
+        # exercise
+        actual_result = keyed_record.is_recorded(self.target, "key-1", "value")
+
+        # verify
+        self.assertTrue(actual_result)
+
+    def test_is_not_recorded_against_a_later_key(self):
+        # setup
+        keyed_record.record(self.target, "key-1", "value")
+
+        # exercise
+        actual_result = keyed_record.is_recorded(self.target, "key-2", "value")
+
+        # verify
+        self.assertFalse(actual_result)
+
+    def test_is_not_recorded_with_another_value(self):
+        # setup
+        keyed_record.record(self.target, "key-1", "value")
+
+        # exercise
+        actual_result = keyed_record.is_recorded(self.target, "key-1", "changed")
+
+        # verify
+        self.assertFalse(actual_result)
+
+    def test_is_not_recorded_without_a_key(self):
+        # setup
+        keyed_record.record(self.target, None, "value")
+
+        # exercise
+        actual_result = keyed_record.is_recorded(self.target, None, "value")
+
+        # verify
+        self.assertFalse(actual_result)
+        self.assertFalse(self.target.exists())
+
+    def test_is_not_recorded_when_the_record_is_corrupt(self):
+        # setup
+        with self.target.open("w") as f:
+            f.write("{")
+
+        # exercise
+        actual_result = keyed_record.is_recorded(self.target, "key-1", "value")
+
+        # verify
+        self.assertFalse(actual_result)
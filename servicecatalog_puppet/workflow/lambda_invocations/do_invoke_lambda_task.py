@@ -6,6 +6,7 @@ import json
 import luigi
 
 from servicecatalog_puppet import config
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.general import get_ssm_param_task
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
 
@@ -23,9 +24,9 @@ class DoInvokeLambdaTask(
 
     puppet_account_id = luigi.Parameter()
 
-    launch_parameters = luigi.DictParameter()
-    manifest_parameters = luigi.DictParameter()
-    account_parameters = luigi.DictParameter()
+    launch_parameters = tasks.InternedDictParameter()
+    manifest_parameters = tasks.InternedDictParameter()
+    account_parameters = tasks.InternedDictParameter()
 
     manifest_file_path = luigi.Parameter()
 
@@ -4,6 +4,7 @@
 import luigi
 
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.lambda_invocations import do_invoke_lambda_task
 from servicecatalog_puppet.workflow.lambda_invocations import (
     lambda_invocation_base_task,
@@ -28,9 +29,9 @@ class InvokeLambdaTask(
 
     puppet_account_id = luigi.Parameter()
 
-    launch_parameters = luigi.DictParameter()
-    manifest_parameters = luigi.DictParameter()
-    account_parameters = luigi.DictParameter()
+    launch_parameters = tasks.InternedDictParameter()
+    manifest_parameters = tasks.InternedDictParameter()
+    account_parameters = tasks.InternedDictParameter()
 
     all_params = []
 
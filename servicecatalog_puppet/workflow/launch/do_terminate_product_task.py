@@ -8,6 +8,7 @@ import luigi
 from servicecatalog_puppet import aws
 from servicecatalog_puppet import constants
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.launch import provisioning_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_version_details_by_names_task,
@@ -29,9 +30,9 @@ class DoTerminateProductTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
     worker_timeout = luigi.IntParameter(default=0, significant=False)
@@ -3,16 +3,18 @@
 
 import json
 
-import luigi
-
 from servicecatalog_puppet import aws
 from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import keyed_record
+from servicecatalog_puppet.workflow import output_store
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.launch import provision_product_task
+from servicecatalog_puppet.workflow.launch import provisioning_digest
 
 
 class ProvisionProductDryRunTask(provision_product_task.ProvisionProductTask):
     def output(self):
-        return luigi.LocalTarget(self.output_location)
+        return output_store.get_target(self.output_location)
 
     @property
     def output_location(self):
@@ -40,19 +42,19 @@ class ProvisionProductDryRunTask(provision_product_task.ProvisionProductTask):
             self.info(f"looking for previous failures")
             path_name = self.portfolio
 
-            response = service_catalog.scan_provisioned_products_single_page(
-                AccessLevelFilter={"Key": "Account", "Value": "self"},
-            )
+            provisioned_products_by_name = self.load_from_input("provisioned_products")
 
             provisioned_product_id = False
             provisioning_artifact_id = None
+            last_provisioning_record_id = None
             current_status = "NOT_PROVISIONED"
-            for r in response.get("ProvisionedProducts", []):
-                if r.get("Name") == self.launch_name:
-                    current_status = r.get("Status")
-                    if current_status in ["AVAILABLE", "TAINTED"]:
-                        provisioned_product_id = r.get("Id")
-                        provisioning_artifact_id = r.get("ProvisioningArtifactId")
+            r = provisioned_products_by_name.get(self.launch_name)
+            if r is not None:
+                current_status = r.get("Status")
+                if current_status in ["AVAILABLE", "TAINTED"]:
+                    provisioned_product_id = r.get("Id")
+                    provisioning_artifact_id = r.get("ProvisioningArtifactId")
+                    last_provisioning_record_id = r.get("LastProvisioningRecordId")
 
             if provisioning_artifact_id is None:
                 self.info(f"params unchanged")
@@ -92,11 +94,26 @@ class ProvisionProductDryRunTask(provision_product_task.ProvisionProductTask):
                     if provisioning_artifact_id == version_id:
                         self.info(f"found previous good provision")
                         if provisioned_product_id:
-                            self.info(f"checking params for diffs")
-                            provisioned_parameters = aws.get_parameters_for_stack(
-                                cloudformation,
-                                f"SC-{self.account_id}-{provisioned_product_id}",
-                            )
+                            if (
+                                self.should_use_provisioning_digests
+                                and keyed_record.is_recorded(
+                                    provisioning_digest.get_target(
+                                        self.puppet_account_id, provisioned_product_id
+                                    ),
+                                    last_provisioning_record_id,
+                                    provisioning_digest.get(
+                                        product_id, version_id, params_to_use
+                                    ),
+                                )
+                            ):
+                                self.info(f"digest unchanged")
+                                provisioned_parameters = params_to_use
+                            else:
+                                self.info(f"checking params for diffs")
+                                provisioned_parameters = aws.get_parameters_for_stack(
+                                    cloudformation,
+                                    f"SC-{self.account_id}-{provisioned_product_id}",
+                                )
                             self.info(f"current params: {provisioned_parameters}")
                             self.info(f"new params: {params_to_use}")
 
@@ -145,19 +162,15 @@ class ProvisionProductDryRunTask(provision_product_task.ProvisionProductTask):
     def write_result(
         self, current_version, new_version, effect, current_status, active, notes=""
     ):
+        result = {
+            "current_version": current_version,
+            "new_version": new_version,
+            "effect": effect,
+            "current_status": current_status,
+            "active": active,
+            "notes": notes,
+            "params": self.param_kwargs,
+        }
         with self.output().open("w") as f:
-            f.write(
-                json.dumps(
-                    {
-                        "current_version": current_version,
-                        "new_version": new_version,
-                        "effect": effect,
-                        "current_status": current_status,
-                        "active": active,
-                        "notes": notes,
-                        "params": self.param_kwargs,
-                    },
-                    indent=4,
-                    default=str,
-                )
-            )
+            f.write(json.dumps(result, indent=4, default=str,))
+        tasks.record_event("dry_run", self, result)
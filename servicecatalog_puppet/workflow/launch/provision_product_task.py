@@ -8,9 +8,14 @@ import luigi
 from servicecatalog_puppet import aws
 from servicecatalog_puppet import constants
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import keyed_record
+from servicecatalog_puppet.workflow import parameter_cache
+from servicecatalog_puppet.workflow import parking
 from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.launch import provisioning_artifact_parameters_task
+from servicecatalog_puppet.workflow.launch import provisioning_digest
 from servicecatalog_puppet.workflow.launch import provisioning_task
+from servicecatalog_puppet.workflow.launch import scan_provisioned_products_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_version_details_by_names_task,
 )
@@ -31,9 +36,9 @@ class ProvisionProductTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
     worker_timeout = luigi.IntParameter(default=0, significant=False)
@@ -69,6 +74,11 @@ class ProvisionProductTask(
                 version=self.version,
                 region=self.region,
             ),
+            "provisioned_products": scan_provisioned_products_task.ScanProvisionedProductsTask(
+                puppet_account_id=self.puppet_account_id,
+                account_id=self.account_id,
+                region=self.region,
+            ),
             "details": get_version_details_by_names_task.GetVersionDetailsByNames(
                 manifest_file_path=self.manifest_file_path,
                 puppet_account_id=self.puppet_account_id,
@@ -107,11 +117,23 @@ class ProvisionProductTask(
             )
         return apis
 
-    def run(self):
-        details = self.load_from_input("details")
-        product_id = details.get("product_details").get("ProductId")
-        version_id = details.get("version_details").get("Id")
+    def get_provisioned_products_snapshot(self):
+        """
+        Returns the provisioned products in the account and region by name.  The snapshot is only used by the first
+        attempt of this task, as that attempt may change the provisioned product, and later attempts scan again.
+
+        :return: the provisioned products by name, or None when a scan is needed
+        """
+        snapshot_used = luigi.LocalTarget(
+            f"output/{self.uid}.provisioned-products-snapshot-used"
+        )
+        if snapshot_used.exists():
+            return None
+        with snapshot_used.open("w") as f:
+            f.write("")
+        return self.load_from_input("provisioned_products")
 
+    def run(self):
         task_output = dict(
             **self.params_for_results_display(),
             account_parameters=tasks.unwrap(self.account_parameters),
@@ -119,8 +141,84 @@ class ProvisionProductTask(
             manifest_parameters=tasks.unwrap(self.manifest_parameters),
         )
 
+        if self.should_park_while_waiting:
+            provisioning = parking.submit_once(self, self.provision)
+            if provisioning.get("is_in_progress"):
+                completion = yield parking.park(
+                    self,
+                    "provisioned_product",
+                    provisioning.get("provisioned_product_id"),
+                    self.spoke_regional_client("servicecatalog"),
+                )
+                parking.get_result(completion)
+        else:
+            provisioning = self.provision()
+        provisioned_product_id = provisioning.get("provisioned_product_id")
+
+        self.info(f"self.execution is {self.execution}")
+        if self.execution == constants.EXECUTION_MODE_HUB:
+            self.info(
+                f"Running in execution mode: {self.execution}, checking for SSM outputs"
+            )
+            with self.spoke_regional_client("cloudformation") as spoke_cloudformation:
+                stack_details = aws.get_stack_output_for(
+                    spoke_cloudformation,
+                    f"SC-{self.account_id}-{provisioned_product_id}",
+                )
+
+            for ssm_param_output in self.ssm_param_outputs:
+                self.info(f"writing SSM Param: {ssm_param_output.get('stack_output')}")
+                with self.hub_client("ssm") as ssm:
+                    found_match = False
+                    # TODO push into another task
+                    for output in stack_details.get("Outputs", []):
+                        if output.get("OutputKey") == ssm_param_output.get(
+                            "stack_output"
+                        ):
+                            ssm_parameter_name = ssm_param_output.get("param_name")
+                            ssm_parameter_name = ssm_parameter_name.replace(
+                                "${AWS::Region}", self.region
+                            )
+                            ssm_parameter_name = ssm_parameter_name.replace(
+                                "${AWS::AccountId}", self.account_id
+                            )
+                            found_match = True
+                            self.info(f"found value")
+                            parameter_cache.put_parameter_and_wait(
+                                ssm,
+                                Name=ssm_parameter_name,
+                                Value=output.get("OutputValue"),
+                                Type=ssm_param_output.get("param_type", "String"),
+                                Overwrite=True,
+                            )
+                    if not found_match:
+                        raise Exception(
+                            f"[{self.uid}] Could not find match for {ssm_param_output.get('stack_output')}"
+                        )
+
+            self.write_output(task_output)
+        else:
+            self.write_output(task_output)
+        self.info("finished")
+
+    def provision(self):
+        """
+        Provisions the product when it needs to be.  When parking while waiting, provisioning and updates that do not
+        use product plans are started without waiting for them to complete.
+
+        :return: dict of the provisioned_product_id and whether it is_in_progress
+        """
+        details = self.load_from_input("details")
+        product_id = details.get("product_details").get("ProductId")
+        version_id = details.get("version_details").get("Id")
+
         all_params = self.get_parameter_values()
 
+        execution = self.execution
+        if self.should_park_while_waiting:
+            execution = constants.EXECUTION_MODE_ASYNC
+        is_in_progress = False
+
         with self.spoke_regional_client("servicecatalog") as service_catalog:
             path_name = self.portfolio
 
@@ -128,6 +226,7 @@ class ProvisionProductTask(
                 provisioned_product_id,
                 provisioning_artifact_id,
                 provisioned_product_status,
+                last_provisioning_record_id,
             ) = aws.terminate_if_status_is_not_available(
                 service_catalog,
                 self.launch_name,
@@ -135,6 +234,7 @@ class ProvisionProductTask(
                 self.account_id,
                 self.region,
                 self.should_delete_rollback_complete_stacks,
+                self.get_provisioned_products_snapshot(),
             )
             self.info(
                 f"pp_id: {provisioned_product_id}, paid : {provisioning_artifact_id}"
@@ -162,20 +262,41 @@ class ProvisionProductTask(
                 if provisioning_artifact_id == version_id:
                     self.info(f"found previous good provision")
                     if provisioned_product_id:
-                        self.info(f"checking params for diffs")
-                        provisioned_parameters = aws.get_parameters_for_stack(
-                            cloudformation,
-                            f"SC-{self.account_id}-{provisioned_product_id}",
+                        digest = provisioning_digest.get(
+                            product_id, version_id, params_to_use
                         )
-                        self.info(f"current params: {provisioned_parameters}")
-
-                        self.info(f"new params: {params_to_use}")
-
-                        if provisioned_parameters == params_to_use:
-                            self.info(f"params unchanged")
+                        digest_target = provisioning_digest.get_target(
+                            self.puppet_account_id, provisioned_product_id
+                        )
+                        if (
+                            self.should_use_provisioning_digests
+                            and keyed_record.is_recorded(
+                                digest_target, last_provisioning_record_id, digest
+                            )
+                        ):
+                            self.info(f"digest unchanged")
                             need_to_provision = False
                         else:
-                            self.info(f"params changed")
+                            self.info(f"checking params for diffs")
+                            provisioned_parameters = aws.get_parameters_for_stack(
+                                cloudformation,
+                                f"SC-{self.account_id}-{provisioned_product_id}",
+                            )
+                            self.info(f"current params: {provisioned_parameters}")
+
+                            self.info(f"new params: {params_to_use}")
+
+                            if provisioned_parameters == params_to_use:
+                                self.info(f"params unchanged")
+                                need_to_provision = False
+                                if self.should_use_provisioning_digests:
+                                    keyed_record.record(
+                                        digest_target,
+                                        last_provisioning_record_id,
+                                        digest,
+                                    )
+                            else:
+                                self.info(f"params changed")
 
                 if provisioned_product_status == "TAINTED":
                     need_to_provision = True
@@ -236,8 +357,9 @@ class ProvisionProductTask(
                                 path_name,
                                 params_to_use,
                                 self.version,
-                                self.execution,
+                                execution,
                             )
+                            is_in_progress = execution != self.execution
 
                     else:
                         provisioned_product_id = aws.provision_product(
@@ -252,58 +374,11 @@ class ProvisionProductTask(
                             params_to_use,
                             self.version,
                             self.should_use_sns,
-                            self.execution,
+                            execution,
                         )
+                        is_in_progress = execution != self.execution
 
-                self.info(f"self.execution is {self.execution}")
-                if self.execution == constants.EXECUTION_MODE_HUB:
-                    self.info(
-                        f"Running in execution mode: {self.execution}, checking for SSM outputs"
-                    )
-                    with self.spoke_regional_client(
-                        "cloudformation"
-                    ) as spoke_cloudformation:
-                        stack_details = aws.get_stack_output_for(
-                            spoke_cloudformation,
-                            f"SC-{self.account_id}-{provisioned_product_id}",
-                        )
-
-                    for ssm_param_output in self.ssm_param_outputs:
-                        self.info(
-                            f"writing SSM Param: {ssm_param_output.get('stack_output')}"
-                        )
-                        with self.hub_client("ssm") as ssm:
-                            found_match = False
-                            # TODO push into another task
-                            for output in stack_details.get("Outputs", []):
-                                if output.get("OutputKey") == ssm_param_output.get(
-                                    "stack_output"
-                                ):
-                                    ssm_parameter_name = ssm_param_output.get(
-                                        "param_name"
-                                    )
-                                    ssm_parameter_name = ssm_parameter_name.replace(
-                                        "${AWS::Region}", self.region
-                                    )
-                                    ssm_parameter_name = ssm_parameter_name.replace(
-                                        "${AWS::AccountId}", self.account_id
-                                    )
-                                    found_match = True
-                                    self.info(f"found value")
-                                    ssm.put_parameter_and_wait(
-                                        Name=ssm_parameter_name,
-                                        Value=output.get("OutputValue"),
-                                        Type=ssm_param_output.get(
-                                            "param_type", "String"
-                                        ),
-                                        Overwrite=True,
-                                    )
-                            if not found_match:
-                                raise Exception(
-                                    f"[{self.uid}] Could not find match for {ssm_param_output.get('stack_output')}"
-                                )
-
-                    self.write_output(task_output)
-                else:
-                    self.write_output(task_output)
-                self.info("finished")
+        return dict(
+            provisioned_product_id=provisioned_product_id,
+            is_in_progress=is_in_progress,
+        )
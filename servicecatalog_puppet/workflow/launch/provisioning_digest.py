@@ -0,0 +1,33 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+
+
+def get(product_id, version_id, parameters):
+    """
+    Returns the digest of provisioning the version of the product with the parameters.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            dict(product_id=product_id, version_id=version_id, parameters=parameters),
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def get_target(puppet_account_id, provisioned_product_id):
+    """
+    Returns where the digest of the provisioned product is kept between runs.  It is recorded against the last
+    provisioning record of the provisioned product, see keyed_record.  Any provisioning or update since, by the
+    framework or not, gives the provisioned product a new record.
+    """
+    return config.get_caching_target(
+        puppet_account_id,
+        f"{constants.PROVISIONING_DIGESTS_DIRECTORY}/{provisioned_product_id}.json",
+    )
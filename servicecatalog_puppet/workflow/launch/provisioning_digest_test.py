@@ -0,0 +1,147 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet.workflow import keyed_record
+from servicecatalog_puppet.workflow import tasks_unit_tests_helper
+from servicecatalog_puppet.workflow.launch import provisioning_digest
+
+
+class ProvisioningDigestTest(unittest.TestCase):
+    def test_get_ignores_the_order_of_the_parameters(self):
+        # exercise
+        first = provisioning_digest.get("prod", "pa", dict(A="a", B="b"))
+        second = provisioning_digest.get("prod", "pa", dict(B="b", A="a"))
+
+        # verify
+        self.assertEqual(first, second)
+
+
+@mock.patch.dict(os.environ, {"SCT_SHOULD_USE_PROVISIONING_DIGESTS": "True"})
+class ProvisionProductTaskDigestTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    product_id = "prod-1"
+    version_id = "pa-1"
+    provisioned_product_id = "pp-1"
+    parameters = dict(A="a")
+
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.launch import provision_product_task
+
+        self.module = provision_product_task
+        self.directory = tempfile.TemporaryDirectory()
+        self.get_target_patcher = mock.patch.object(
+            provisioning_digest,
+            "get_target",
+            side_effect=lambda puppet_account_id, provisioned_product_id: luigi.LocalTarget(
+                os.path.join(self.directory.name, f"{provisioned_product_id}.json")
+            ),
+        )
+        self.get_target_patcher.start()
+        self.get_parameters_for_stack_patcher = mock.patch.object(
+            self.module.aws, "get_parameters_for_stack", return_value=self.parameters,
+        )
+        self.get_parameters_for_stack = self.get_parameters_for_stack_patcher.start()
+
+    def tearDown(self) -> None:
+        self.get_parameters_for_stack_patcher.stop()
+        self.get_target_patcher.stop()
+        self.directory.cleanup()
+
+    def given_a_provisioned_product(self, record_id):
+        self.sut = self.module.ProvisionProductTask(
+            manifest_file_path="manifest_file_path",
+            launch_name="launch_name",
+            portfolio="portfolio",
+            product="product",
+            version="version",
+            region="region",
+            account_id="account_id",
+            puppet_account_id="puppet_account_id",
+            execution="hub",
+        )
+        self.wire_up_mocks()
+        self.sut.load_from_input = mock.MagicMock(
+            return_value=dict(
+                product_details=dict(ProductId=self.product_id),
+                version_details=dict(Id=self.version_id),
+            )
+        )
+        self.sut.get_parameter_values = mock.MagicMock(return_value=self.parameters)
+        self.sut.get_provisioned_products_snapshot = mock.MagicMock(return_value=None)
+        self.sut.input().get().open.return_value.__enter__.return_value = io.StringIO(
+            json.dumps([dict(ParameterKey="A")])
+        )
+        self.terminate_patcher = mock.patch.object(
+            self.module.aws,
+            "terminate_if_status_is_not_available",
+            return_value=(
+                self.provisioned_product_id,
+                self.version_id,
+                "AVAILABLE",
+                record_id,
+            ),
+        )
+        self.terminate_patcher.start()
+        self.addCleanup(self.terminate_patcher.stop)
+
+    def test_provision_records_the_digest_when_the_params_are_unchanged(self):
+        # setup
+        self.given_a_provisioned_product("rec-1")
+
+        # exercise
+        self.sut.provision()
+
+        # verify
+        self.get_parameters_for_stack.assert_called_once()
+        self.assertTrue(
+            keyed_record.is_recorded(
+                provisioning_digest.get_target(
+                    "puppet_account_id", self.provisioned_product_id
+                ),
+                "rec-1",
+                provisioning_digest.get(
+                    self.product_id, self.version_id, self.parameters
+                ),
+            )
+        )
+
+    def test_provision_does_not_read_the_stack_when_the_digest_is_recorded(self):
+        # setup
+        self.given_a_provisioned_product("rec-1")
+        self.sut.provision()
+        self.get_parameters_for_stack.reset_mock()
+        self.given_a_provisioned_product("rec-1")
+
+        # exercise
+        actual_result = self.sut.provision()
+
+        # verify
+        self.get_parameters_for_stack.assert_not_called()
+        self.assertEqual(
+            dict(
+                provisioned_product_id=self.provisioned_product_id,
+                is_in_progress=False,
+            ),
+            actual_result,
+        )
+
+    def test_provision_reads_the_stack_when_it_has_been_provisioned_since(self):
+        # setup
+        self.given_a_provisioned_product("rec-1")
+        self.sut.provision()
+        self.get_parameters_for_stack.reset_mock()
+        self.given_a_provisioned_product("rec-2")
+
+        # exercise
+        self.sut.provision()
+
+        # verify
+        self.get_parameters_for_stack.assert_called_once()
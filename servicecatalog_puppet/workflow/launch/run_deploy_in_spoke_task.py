@@ -101,4 +101,6 @@ class RunDeployInSpokeTask(tasks.PuppetTask, manifest_mixin.ManifestMixen):
                 projectName=constants.EXECUTION_SPOKE_CODEBUILD_PROJECT_NAME,
                 environmentVariablesOverride=vars,
             )
-        self.write_output(dict(account_id=self.account_id, **response))
+        spoke_execution = dict(account_id=self.account_id, **response)
+        self.write_output(spoke_execution)
+        tasks.record_event("spoke_execution", self, spoke_execution)
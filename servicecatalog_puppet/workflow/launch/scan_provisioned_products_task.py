@@ -0,0 +1,38 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import luigi
+
+from servicecatalog_puppet import aws
+from servicecatalog_puppet.workflow import tasks
+
+
+class ScanProvisionedProductsTask(tasks.PuppetTask):
+    """
+    Scans the provisioned products of an account and region once, so every launch into it can look its provisioned
+    product up by name.
+    """
+
+    puppet_account_id = luigi.Parameter()
+    account_id = luigi.Parameter()
+    region = luigi.Parameter()
+
+    def params_for_results_display(self):
+        return {
+            "puppet_account_id": self.puppet_account_id,
+            "account_id": self.account_id,
+            "region": self.region,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+    def api_calls_used(self):
+        return [
+            f"servicecatalog.scan_provisioned_products_single_page_{self.account_id}_{self.region}",
+        ]
+
+    def run(self):
+        with self.spoke_regional_client("servicecatalog") as service_catalog:
+            provisioned_products_by_name = aws.get_provisioned_products_by_name(
+                service_catalog, f"{self.account_id}:{self.region}"
+            )
+        self.write_output(provisioned_products_by_name)
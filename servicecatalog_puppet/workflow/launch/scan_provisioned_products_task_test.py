@@ -0,0 +1,69 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+from servicecatalog_puppet.workflow import tasks_unit_tests_helper
+
+
+class ScanProvisionedProductsTaskTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    puppet_account_id = "puppet_account_id"
+    account_id = "account_id"
+    region = "region"
+
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.launch import scan_provisioned_products_task
+
+        self.module = scan_provisioned_products_task
+
+        self.sut = self.module.ScanProvisionedProductsTask(
+            puppet_account_id=self.puppet_account_id,
+            account_id=self.account_id,
+            region=self.region,
+        )
+
+        self.wire_up_mocks()
+
+    def test_params_for_results_display(self):
+        # setup
+        expected_result = {
+            "puppet_account_id": self.puppet_account_id,
+            "account_id": self.account_id,
+            "region": self.region,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+        # exercise
+        actual_result = self.sut.params_for_results_display()
+
+        # verify
+        self.assertDictEqual(expected_result, actual_result)
+
+    def test_api_calls_used(self):
+        # setup
+        expected_result = [
+            f"servicecatalog.scan_provisioned_products_single_page_{self.account_id}_{self.region}",
+        ]
+
+        # exercise
+        actual_result = self.sut.api_calls_used()
+
+        # verify
+        self.assertEqual(expected_result, actual_result)
+
+    def test_run(self):
+        # setup
+        launch_a = dict(Name="launch_a", Id="pp-a", Status="AVAILABLE")
+        launch_b = dict(Name="launch_b", Id="pp-b", Status="ERROR")
+        paginator = self.spoke_regional_client_mock.get_paginator.return_value
+        paginator.paginate.return_value = [
+            dict(ProvisionedProducts=[launch_a]),
+            dict(ProvisionedProducts=[launch_b]),
+        ]
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.spoke_regional_client_mock.get_paginator.assert_called_once_with(
+            "scan_provisioned_products"
+        )
+        self.assert_output(dict(launch_a=launch_a, launch_b=launch_b))
@@ -7,6 +7,7 @@ import luigi
 
 from servicecatalog_puppet import aws
 from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.launch import do_terminate_product_task
 
 
@@ -23,9 +24,9 @@ class TerminateProductDryRunTask(do_terminate_product_task.DoTerminateProductTas
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
 
@@ -38,20 +39,16 @@ class TerminateProductDryRunTask(do_terminate_product_task.DoTerminateProductTas
     try_count = 1
 
     def write_result(self, current_version, new_version, effect, notes=""):
+        result = {
+            "current_version": current_version,
+            "new_version": new_version,
+            "effect": effect,
+            "notes": notes,
+            "params": self.param_kwargs,
+        }
         with self.output().open("w") as f:
-            f.write(
-                json.dumps(
-                    {
-                        "current_version": current_version,
-                        "new_version": new_version,
-                        "effect": effect,
-                        "notes": notes,
-                        "params": self.param_kwargs,
-                    },
-                    indent=4,
-                    default=str,
-                )
-            )
+            f.write(json.dumps(result, indent=4, default=str,))
+        tasks.record_event("dry_run", self, result)
 
     def api_calls_used(self):
         return [
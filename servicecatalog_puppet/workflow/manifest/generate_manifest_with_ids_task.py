@@ -12,8 +12,10 @@ import shutil
 import zipfile
 
 from servicecatalog_puppet import config, constants
+from servicecatalog_puppet.workflow import output_store
 from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_portfolio_by_portfolio_name_task,
 )
@@ -38,6 +40,14 @@ class GenerateManifestWithIdsTask(tasks.PuppetTask, manifest_mixin.ManifestMixen
         for launch_name, launch_details in self.manifest.get_launches_items():
             portfolio = launch_details.get("portfolio")
             for region in regions:
+                if self.should_use_hub_catalogue:
+                    requirements[region] = get_hub_catalogue_task.GetHubCatalogueTask(
+                        manifest_file_path=self.manifest_file_path,
+                        puppet_account_id=self.puppet_account_id,
+                        region=region,
+                    )
+                    continue
+
                 if requirements.get(region) is None:
                     requirements[region] = dict()
 
@@ -148,7 +158,19 @@ class GenerateManifestWithIdsTask(tasks.PuppetTask, manifest_mixin.ManifestMixen
         global_id_cache = dict()
         new_manifest["id_cache"] = global_id_cache
 
+        portfolio_names = dict.fromkeys(
+            launch_details.get("portfolio")
+            for launch_name, launch_details in self.manifest.get_launches_items()
+        )
+
         for region in regions:
+            if self.should_use_hub_catalogue:
+                if self.input().get(region) is not None:
+                    global_id_cache[region] = get_hub_catalogue_task.get_id_cache(
+                        self.load_from_input(region), portfolio_names
+                    )
+                continue
+
             regional_id_cache = dict()
             r = self.input().get(region)
             for launch_name, launch_details in self.manifest.get_launches_items():
@@ -199,10 +221,14 @@ class GenerateManifestWithIdsTask(tasks.PuppetTask, manifest_mixin.ManifestMixen
         cached_output_signed_url = None
         if self.input().get("parameters") or self.input().get("parameter_by_paths"):
 
-            with zipfile.ZipFile("output/GetSSMParamTask.zip", "w", zipfile.ZIP_DEFLATED) as zip:
+            with zipfile.ZipFile(
+                "output/GetSSMParamTask.zip", "w", zipfile.ZIP_DEFLATED
+            ) as zip:
                 files = glob.glob("output/GetSSMParam*/**", recursive=True)
                 for filename in files:
                     zip.write(filename, filename)
+                if output_store.is_enabled():
+                    output_store.write_to_zip(zip, "output/GetSSMParam")
 
             with self.hub_client("s3") as s3:
                 key = f"{os.getenv('CODEBUILD_BUILD_NUMBER', '0')}-cached-output.zip"
@@ -1,10 +1,7 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
-from functools import lru_cache
-
 import luigi
-import yaml
 
 from servicecatalog_puppet import constants
 from servicecatalog_puppet import manifest_utils
@@ -22,7 +19,5 @@ class ManifestMixen(object):
         )
 
     @property
-    @lru_cache()
     def manifest(self):
-        content = open(self.manifest_file_path, "r").read()
-        return manifest_utils.Manifest(yaml.safe_load(content))
+        return manifest_utils.get_parsed_manifest(self.manifest_file_path)
@@ -69,9 +69,6 @@ class SectionTask(tasks.PuppetTask, manifest_mixin.ManifestMixen):
 
         dependencies = list()
 
-        affinities_used = dict()
-        is_a_dependency = False
-
         details = self.manifest.get(section_name_plural).get(name)
         self_execution = details.get("execution")
         should_run = True
@@ -99,17 +96,10 @@ class SectionTask(tasks.PuppetTask, manifest_mixin.ManifestMixen):
             should_run = False
 
         if should_run:
-            for manifest_section_name in constants.ALL_SECTION_NAMES:
-                for n, d in self.manifest.get(manifest_section_name, {}).items():
-                    for dep in d.get("depends_on", []):
-                        if (
-                            dep.get("type") == section_name_singular
-                            and dep.get("name") == name
-                        ):
-                            is_a_dependency = True
-                            affinities_used[dep.get("affinity")] = True
-
-            if is_a_dependency:
+            affinities_used = self.manifest.get_affinities_used_by_dependents(
+                section_name_singular, name
+            )
+            if affinities_used:
                 if affinities_used.get(constants.AFFINITY_REGION):
                     for region in self.manifest.get_regions_used_for_section_item(
                         self.puppet_account_id, section_name_plural, name
@@ -0,0 +1,206 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from betterboto import client as betterboto_client
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import journal
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+NOTE_WORTHY_PARAMETERS = [
+    "launch_name",
+    "region",
+    "account_id",
+    "puppet_account_id",
+    "portfolio",
+    "product",
+    "version",
+]
+
+_CLOSE = object()
+
+
+def get_processing_time_datum(event):
+    """
+    Converts a processing_time event from the journal into a CloudWatch MetricData entry, timestamped with when the
+    event was recorded rather than when it is converted.
+    """
+    task_type = event.get("task_type")
+    task_params = dict(**event.get("task_params", {}))
+    task_params.update(event.get("params_for_results", {}))
+
+    dimensions = [
+        dict(Name="task_type", Value=task_type,),
+        dict(
+            Name="codebuild_build_id",
+            Value=os.getenv("CODEBUILD_BUILD_ID", "LOCAL_BUILD"),
+        ),
+    ]
+    for note_worthy in NOTE_WORTHY_PARAMETERS:
+        if task_params.get(note_worthy):
+            dimensions.append(
+                dict(Name=str(note_worthy), Value=str(task_params.get(note_worthy)))
+            )
+
+    return dict(
+        MetricName="Tasks",
+        Dimensions=[dict(Name="TaskType", Value=task_type)] + dimensions,
+        Value=event.get("duration"),
+        Unit="Seconds",
+        Timestamp=event.get("timestamp", time.time()),
+    )
+
+
+class CloudWatchSink(object):
+    def __init__(self, namespace):
+        self.namespace = namespace
+
+    def __call__(self, metric_data):
+        with betterboto_client.CrossAccountClientContextManager(
+            "cloudwatch",
+            config.get_puppet_role_arn(config.get_puppet_account_id()),
+            "cloudwatch-puppethub",
+        ) as cloudwatch:
+            cloudwatch.put_metric_data(
+                Namespace=self.namespace, MetricData=metric_data,
+            )
+
+
+class EmfFileSink(object):
+    """
+    Writes metric data as CloudWatch embedded metric format lines so runs can be measured without calling AWS.
+    """
+
+    def __init__(self, path, namespace):
+        self.path = path
+        self.namespace = namespace
+
+    def __call__(self, metric_data):
+        with open(self.path, "a") as f:
+            for datum in metric_data:
+                line = {
+                    "_aws": {
+                        "Timestamp": int(datum.get("Timestamp") * 1000),
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": self.namespace,
+                                "Dimensions": [
+                                    [d.get("Name") for d in datum.get("Dimensions")]
+                                ],
+                                "Metrics": [
+                                    {
+                                        "Name": datum.get("MetricName"),
+                                        "Unit": datum.get("Unit"),
+                                    }
+                                ],
+                            }
+                        ],
+                    },
+                    datum.get("MetricName"): datum.get("Value"),
+                }
+                for d in datum.get("Dimensions"):
+                    line[d.get("Name")] = d.get("Value")
+                f.write(json.dumps(line, default=str) + "\n")
+
+
+class MetricsEmitter(object):
+    """
+    Buffers metric data and hands it to the sink, from a background thread, in batches of up to batch_size.  A batch is
+    also flushed once it is flush_interval_in_seconds old.  put blocks while the queue is full.
+    """
+
+    def __init__(
+        self,
+        sink,
+        batch_size=constants.CLOUDWATCH_MAX_METRIC_DATA_PER_CALL,
+        max_queue_size=constants.METRICS_MAX_QUEUE_SIZE,
+        flush_interval_in_seconds=constants.METRICS_FLUSH_INTERVAL_IN_SECONDS,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval_in_seconds = flush_interval_in_seconds
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.flushed = 0
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def put(self, datum):
+        self.queue.put(datum)
+
+    def close(self):
+        self.queue.put(_CLOSE)
+        self.thread.join()
+
+    def flush(self, batch):
+        if len(batch) == 0:
+            return
+        try:
+            self.sink(batch)
+            self.flushed += len(batch)
+        except Exception as e:
+            logger.warning(f"Could not send {len(batch)} metrics: {e}")
+
+    def run(self):
+        batch = list()
+        deadline = time.time() + self.flush_interval_in_seconds
+        while True:
+            try:
+                datum = self.queue.get(timeout=max(0, deadline - time.time()))
+            except queue.Empty:
+                datum = None
+            if datum is _CLOSE:
+                self.flush(batch)
+                return
+            if datum is not None:
+                batch.append(datum)
+            if len(batch) >= self.batch_size or time.time() >= deadline:
+                self.flush(batch)
+                batch = list()
+                deadline = time.time() + self.flush_interval_in_seconds
+
+
+class ProcessingTimeMetrics(object):
+    """
+    Follows the journal while the tasks run and emits a metric for each processing_time event.
+    """
+
+    def __init__(self, emitter):
+        self.emitter = emitter
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.emitter.start()
+        self.thread.start()
+        return self
+
+    def run(self):
+        for event in journal.follow(self.stop, event_types=["processing_time"]):
+            self.emitter.put(get_processing_time_datum(event))
+
+    def close(self):
+        self.stop.set()
+        self.thread.join()
+        self.emitter.close()
+        logger.info(f"Sent {self.emitter.flushed} processing time metrics")
+
+
+def start_processing_time_metrics():
+    emf_file = config.get_metrics_emf_file()
+    if emf_file != "":
+        sink = EmfFileSink(emf_file, constants.PROCESSING_TIME_METRICS_NAMESPACE)
+    else:
+        sink = CloudWatchSink(constants.PROCESSING_TIME_METRICS_NAMESPACE)
+    return ProcessingTimeMetrics(MetricsEmitter(sink)).start()
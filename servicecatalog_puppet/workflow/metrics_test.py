@@ -0,0 +1,128 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+import tempfile
+import unittest
+
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import metrics
+
+
+class RecordingSink(object):
+    def __init__(self):
+        self.batches = list()
+
+    def __call__(self, metric_data):
+        self.batches.append(list(metric_data))
+
+
+class MetricsEmitterTest(unittest.TestCase):
+    def test_flushes_in_batches_and_on_close(self):
+        # setup
+        sink = RecordingSink()
+        sut = metrics.MetricsEmitter(
+            sink, batch_size=2, max_queue_size=1, flush_interval_in_seconds=60
+        ).start()
+
+        # exercise
+        for i in range(5):
+            sut.put(i)
+        sut.close()
+
+        # verify
+        self.assertListEqual([[0, 1], [2, 3], [4]], sink.batches)
+        self.assertEqual(5, sut.flushed)
+
+    def test_a_failing_sink_does_not_stop_the_emitter(self):
+        # setup
+        def sink(metric_data):
+            raise Exception("throttled")
+
+        sut = metrics.MetricsEmitter(sink, batch_size=1).start()
+
+        # exercise
+        sut.put(1)
+        sut.put(2)
+        sut.close()
+
+        # verify
+        self.assertEqual(0, sut.flushed)
+
+
+class GetProcessingTimeDatumTest(unittest.TestCase):
+    def test_dimensions(self):
+        # setup
+        event = dict(
+            event_type="processing_time",
+            task_type="ProvisionProductTask",
+            task_params=dict(launch_name="launch-a", region="eu-west-1", retry=1),
+            params_for_results=dict(account_id="012345678910"),
+            duration=1.5,
+        )
+
+        # exercise
+        actual_result = metrics.get_processing_time_datum(event)
+
+        # verify
+        self.assertEqual("Tasks", actual_result.get("MetricName"))
+        self.assertEqual(1.5, actual_result.get("Value"))
+        self.assertListEqual(
+            [
+                "TaskType",
+                "task_type",
+                "codebuild_build_id",
+                "launch_name",
+                "region",
+                "account_id",
+            ],
+            [d.get("Name") for d in actual_result.get("Dimensions")],
+        )
+
+    def test_timestamp_is_when_the_event_was_recorded(self):
+        # setup
+        event = dict(
+            event_type="processing_time",
+            timestamp=1600000000.0,
+            task_type="ProvisionProductTask",
+            duration=1.5,
+        )
+
+        # exercise
+        actual_result = metrics.get_processing_time_datum(event)
+
+        # verify
+        self.assertEqual(1600000000.0, actual_result.get("Timestamp"))
+
+
+class ProcessingTimeMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        journal.create()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_writes_emf_lines_for_processing_time_events(self):
+        # setup
+        sink = metrics.EmfFileSink("metrics.jsonl", "Namespace")
+        sut = metrics.ProcessingTimeMetrics(metrics.MetricsEmitter(sink)).start()
+
+        # exercise
+        journal.append(dict(event_type="start", task_type="A"))
+        journal.append(dict(event_type="processing_time", task_type="A", duration=2))
+        sut.close()
+
+        # verify
+        lines = [json.loads(l) for l in open("metrics.jsonl", "r").readlines()]
+        self.assertEqual(1, len(lines))
+        self.assertEqual(2, lines[0].get("Tasks"))
+        self.assertEqual("A", lines[0].get("TaskType"))
+        self.assertEqual(
+            "Namespace",
+            lines[0].get("_aws").get("CloudWatchMetrics")[0].get("Namespace"),
+        )
@@ -0,0 +1,200 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import glob
+import io
+import logging
+import os
+import sqlite3
+import threading
+
+import luigi
+
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+def is_enabled():
+    return (
+        os.environ.get("SCT_OUTPUT_STORE", constants.CONFIG_OUTPUT_STORE_DEFAULT)
+        == constants.OUTPUT_STORE_SQLITE
+    )
+
+
+def get_target(path):
+    """
+    Returns the target a task writes its output to: an entry in the output store when it is enabled, otherwise a file.
+
+    :param path: the path of the output, used as the key in the output store
+    :return: a luigi Target
+    """
+    if is_enabled():
+        return StoreTarget(path)
+    return luigi.LocalTarget(path)
+
+
+class OutputStore(object):
+    """
+    Task outputs kept as rows in a single sqlite database instead of a file each.  The database is in WAL mode so the
+    worker processes can read while another writes.  Luigi forks its workers so each process opens its own connection.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connections = dict()
+        self.lock = threading.Lock()
+
+    def get_connection(self):
+        pid = os.getpid()
+        connection = self.connections.get(pid)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=constants.OUTPUT_STORE_TIMEOUT_IN_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS outputs (key TEXT PRIMARY KEY, content TEXT NOT NULL)"
+            )
+            # the connections inherited from the parent stay referenced, closing them in a forked child is unsafe
+            self.connections[pid] = connection
+        return connection
+
+    def exists(self, key):
+        with self.lock:
+            row = (
+                self.get_connection()
+                .execute("SELECT 1 FROM outputs WHERE key = ?", (key,))
+                .fetchone()
+            )
+        return row is not None
+
+    def get(self, key):
+        with self.lock:
+            row = (
+                self.get_connection()
+                .execute("SELECT content FROM outputs WHERE key = ?", (key,))
+                .fetchone()
+            )
+        if row is None:
+            raise FileNotFoundError(f"{key} is not in the output store {self.path}")
+        return row[0]
+
+    def put(self, key, content):
+        with self.lock:
+            self.get_connection().execute(
+                "INSERT OR REPLACE INTO outputs (key, content) VALUES (?, ?)",
+                (key, content),
+            )
+
+    def remove(self, key):
+        with self.lock:
+            self.get_connection().execute("DELETE FROM outputs WHERE key = ?", (key,))
+
+    def keys(self, prefix=""):
+        with self.lock:
+            rows = (
+                self.get_connection()
+                .execute(
+                    "SELECT key FROM outputs WHERE substr(key, 1, ?) = ? ORDER BY key",
+                    (len(prefix), prefix),
+                )
+                .fetchall()
+            )
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self.lock:
+            connection = self.connections.pop(os.getpid(), None)
+            if connection is not None:
+                connection.close()
+
+
+stores = dict()
+
+
+def get_store():
+    path = os.path.abspath(
+        os.path.join(constants.OUTPUT, constants.OUTPUT_STORE_FILE_NAME)
+    )
+    store = stores.get(path)
+    if store is None:
+        store = OutputStore(path)
+        stores[path] = store
+    return store
+
+
+class StoreWriter(io.StringIO):
+    """
+    Puts what was written into the output store when closed, unless the block writing it raised.
+    """
+
+    def __init__(self, store, key):
+        super().__init__()
+        self.store = store
+        self.key = key
+        self.discarded = False
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is not None:
+            self.discarded = True
+        return super().__exit__(exc_type, exc_value, tb)
+
+    def close(self):
+        if not self.closed and not self.discarded:
+            self.store.put(self.key, self.getvalue())
+        super().close()
+
+
+class StoreTarget(luigi.target.Target):
+    """
+    A luigi Target for an entry in the output store, opened for reading and writing like a LocalTarget.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return get_store().exists(self.path)
+
+    def open(self, mode="r"):
+        if mode == "w":
+            return StoreWriter(get_store(), self.path)
+        elif mode == "r":
+            return io.StringIO(get_store().get(self.path))
+        raise Exception(f"Unsupported mode {mode} for {self.path}")
+
+    def remove(self):
+        get_store().remove(self.path)
+
+
+def import_files(pattern):
+    """
+    Puts the files matching pattern into the output store, keyed by their path, so outputs unpacked from a cache are
+    found by the tasks reading them.
+
+    :return: the number of files imported
+    """
+    store = get_store()
+    count = 0
+    for file_path in glob.glob(pattern, recursive=True):
+        if os.path.isfile(file_path):
+            with open(file_path, "r") as f:
+                store.put(file_path, f.read())
+            count += 1
+    logger.info(f"Imported {count} outputs matching {pattern} into the output store")
+    return count
+
+
+def write_to_zip(zip, prefix):
+    """
+    Writes the outputs whose keys start with prefix into zip, as the files they would otherwise have been.
+    """
+    store = get_store()
+    for key in store.keys(prefix):
+        zip.writestr(key, store.get(key))
@@ -0,0 +1,144 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import gc
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import output_store
+from servicecatalog_puppet.workflow import tasks
+
+
+class OutputStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.environ_patcher = mock.patch.dict(
+            os.environ, {"SCT_OUTPUT_STORE": constants.OUTPUT_STORE_SQLITE}
+        )
+        self.environ_patcher.start()
+
+    def tearDown(self):
+        self.environ_patcher.stop()
+        output_store.get_store().close()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_get_target_is_a_file_unless_the_store_is_enabled(self):
+        # setup
+        os.environ["SCT_OUTPUT_STORE"] = constants.OUTPUT_STORE_FILES
+
+        # exercise
+        actual_result = output_store.get_target("output/Task/a.json")
+
+        # verify
+        self.assertIsInstance(actual_result, luigi.LocalTarget)
+
+    def test_target_is_written_and_read(self):
+        # setup
+        sut = output_store.get_target("output/Task/a.json")
+
+        # exercise
+        exists_before = sut.exists()
+        with sut.open("w") as f:
+            f.write('{"a":1}')
+
+        # verify
+        self.assertFalse(exists_before)
+        self.assertTrue(sut.exists())
+        with sut.open("r") as f:
+            self.assertEqual('{"a":1}', f.read())
+        self.assertFalse(os.path.exists("output/Task/a.json"))
+
+    def test_target_is_not_written_when_writing_raises(self):
+        # setup
+        sut = output_store.get_target("output/Task/a.json")
+
+        # exercise
+        with self.assertRaises(Exception):
+            with sut.open("w") as f:
+                f.write("{")
+                raise Exception("failed")
+
+        # verify
+        self.assertFalse(sut.exists())
+
+    def test_store_is_used_by_a_child_forked_after_a_read(self):
+        # setup
+        store = output_store.get_store()
+        store.put("output/Task/a.json", "a")
+        store.get("output/Task/a.json")
+        parent_connection = store.connections.get(os.getpid())
+
+        # exercise
+        pid = os.fork()
+        if pid == 0:
+            try:
+                store.put("output/Task/b.json", store.get("output/Task/a.json"))
+                gc.collect()
+                is_inherited_kept = (
+                    store.connections.get(os.getppid()) is parent_connection
+                )
+                store.close()
+                os._exit(0 if is_inherited_kept else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+
+        # verify
+        self.assertEqual(0, status)
+        self.assertEqual("a", store.get("output/Task/b.json"))
+        self.assertIs(parent_connection, store.connections.get(os.getpid()))
+
+    def test_write_output_writes_compact_json_read_by_load_from_input(self):
+        # setup
+        task = tasks.PuppetTask()
+        target = output_store.get_target("output/Task/a.json")
+        content = dict(a=[1, 2], b="c")
+
+        # exercise
+        with mock.patch.object(task, "output", return_value=target):
+            task.write_output(content)
+        with mock.patch.object(task, "input", return_value=dict(a=target)):
+            actual_result = task.load_from_input("a")
+
+        # verify
+        self.assertDictEqual(content, actual_result)
+        self.assertEqual(
+            output_store.get_store().get(target.path), '{"a":[1,2],"b":"c"}'
+        )
+
+    def test_outputs_round_trip_through_a_zip(self):
+        # setup
+        for name in [
+            "GetSSMParamTask/a.json",
+            "GetSSMParamTask/b.json",
+            "Other/c.json",
+        ]:
+            with output_store.get_target(f"output/{name}").open("w") as f:
+                f.write(json.dumps(name))
+        with zipfile.ZipFile("cache.zip", "w") as zip:
+            output_store.write_to_zip(zip, "output/GetSSMParam")
+        output_store.get_store().close()
+        os.rename(
+            f"output/{constants.OUTPUT_STORE_FILE_NAME}", "previous.db",
+        )
+        zipfile.ZipFile("cache.zip").extractall(".")
+
+        # exercise
+        actual_result = output_store.import_files("output/GetSSMParam*/**")
+
+        # verify
+        self.assertEqual(2, actual_result)
+        self.assertEqual(
+            ["output/GetSSMParamTask/a.json", "output/GetSSMParamTask/b.json"],
+            output_store.get_store().keys(),
+        )
@@ -0,0 +1,171 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import os
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import output_store
+from servicecatalog_puppet.workflow import tasks
+
+EVENT_TYPE = "ssm_parameter_cache"
+
+
+def get_target(kind, region, name):
+    """
+    Returns the target of what is cached, scoped to the run by the cache invalidator as the outputs of tasks are, so a
+    run never sees what an earlier run in the same working directory cached.
+    """
+    cache_invalidator = os.environ.get("SCT_CACHE_INVALIDATOR", "NOW")
+    digest = hashlib.sha1(
+        f"{cache_invalidator}:{kind}:{region}:{name}".encode()
+    ).hexdigest()
+    return output_store.get_target(
+        os.path.join(
+            constants.OUTPUT, constants.SSM_PARAMETER_CACHE_DIRECTORY, f"{digest}.json"
+        )
+    )
+
+
+def read(target):
+    if not target.exists():
+        return None
+    with target.open("r") as f:
+        return json.loads(f.read())
+
+
+def write(target, content):
+    with target.open("w") as f:
+        f.write(json.dumps(content, default=str))
+
+
+def record(task, region, name, hit):
+    tasks.record_event(EVENT_TYPE, task, dict(region=region, name=name, hit=hit))
+
+
+def put(region, name, value, version=None, update_paths=True):
+    """
+    Caches the parameter so it can be got by name.  Unless update_paths is False, the parameter is also put into what
+    was cached for each path got earlier whose parameters would include it, so later gets by path see it too.
+    """
+    write(
+        get_target("parameter", region, name),
+        {"Name": name, "Region": region, "Value": value, "Version": version},
+    )
+    if update_paths:
+        for target in get_path_targets_including(region, name):
+            parameters = read(target)
+            if parameters is not None:
+                parameters[name] = dict(Value=value)
+                write(target, parameters)
+
+
+def get_path_targets_including(region, name):
+    """
+    Returns the targets of the paths whose parameters include name: its parent, got recursively or not, and each path
+    above that, got recursively.
+    """
+    parts = name.split("/")
+    targets = list()
+    for i in range(len(parts) - 1, 0, -1):
+        parent = "/".join(parts[:i])
+        for recursive in [True, False] if i == len(parts) - 1 else [True]:
+            for path in dict.fromkeys([parent, f"{parent}/"]):
+                targets.append(get_target(f"path-{recursive}", region, path))
+    return targets
+
+
+def get(task, region, name):
+    """
+    Returns the parameter cached earlier in the run, recording whether it was a hit.
+
+    :return: dict of the Name, Region, Value and Version or None when it is not cached
+    """
+    parameter = read(get_target("parameter", region, name))
+    record(task, region, name, parameter is not None)
+    return parameter
+
+
+def put_path(region, path, recursive, parameters):
+    """
+    Caches the parameters got by path, each on its own so they can be got by name, along with what was got for path.
+
+    :param parameters: dict of the parameter names to dicts of their Value
+    """
+    for name, parameter in parameters.items():
+        put(region, name, parameter.get("Value"), update_paths=False)
+    write(get_target(f"path-{recursive}", region, path), parameters)
+
+
+def get_path(task, region, path, recursive):
+    """
+    Returns the parameters under path when path, or a path it is under, has been got recursively earlier in the run.
+
+    :return: dict of the parameter names to dicts of their Value or None when path is not covered by the cache
+    """
+    prefix = path.rstrip("/")
+    parts = prefix.split("/")
+    candidates = [(prefix, recursive), (prefix, True)] + [
+        ("/".join(parts[:i]), True) for i in range(len(parts) - 1, 0, -1)
+    ]
+    for candidate, candidate_recursive in candidates:
+        for candidate_path in dict.fromkeys([candidate, f"{candidate}/"]):
+            parameters = read(
+                get_target(f"path-{candidate_recursive}", region, candidate_path)
+            )
+            if parameters is not None:
+                record(task, region, path, True)
+                return {
+                    name: parameter
+                    for name, parameter in parameters.items()
+                    if is_under(name, prefix, recursive)
+                }
+    record(task, region, path, False)
+    return None
+
+
+def is_under(name, prefix, recursive):
+    if not name.startswith(f"{prefix}/"):
+        return False
+    return recursive or "/" not in name[len(prefix) + 1 :]
+
+
+def remove(region, name):
+    """
+    Removes the parameter, and the paths whose parameters include it, from the cache so they are got again.
+    """
+    for target in [get_target("parameter", region, name)] + get_path_targets_including(
+        region, name
+    ):
+        if target.exists():
+            target.remove()
+
+
+def put_parameter_and_wait(ssm, **kwargs):
+    """
+    Puts the parameter using put_parameter_and_wait, writing it through to the cache.  A SecureString is not written
+    through, as the cache is kept in plaintext and SSM returns it encrypted, it is removed from the cache instead.
+    """
+    response = ssm.put_parameter_and_wait(**kwargs)
+    if kwargs.get("Type") == "SecureString":
+        remove(ssm.meta.region_name, kwargs.get("Name"))
+    else:
+        put(
+            ssm.meta.region_name,
+            kwargs.get("Name"),
+            kwargs.get("Value"),
+            (response or {}).get("Parameter", {}).get("Version"),
+        )
+    return response
+
+
+def get_stats():
+    """
+    :return: dict of the number of hits and misses recorded in the journal
+    """
+    stats = dict(hits=0, misses=0)
+    for event, _ in journal.read(event_types=[EVENT_TYPE]):
+        stats["hits" if event.get("hit") else "misses"] += 1
+    return stats
@@ -0,0 +1,138 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import parameter_cache
+
+
+class ParameterCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        journal.create()
+        self.task = mock.MagicMock(param_kwargs=dict())
+        self.task.params_for_results_display.return_value = dict()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_put_parameter_and_wait_writes_through(self):
+        # setup
+        ssm = mock.MagicMock()
+        ssm.meta.region_name = "eu-west-1"
+        ssm.put_parameter_and_wait.return_value = dict(
+            Parameter=dict(Name="/a", Value="b", Version=3)
+        )
+
+        # exercise
+        parameter_cache.put_parameter_and_wait(
+            ssm, Name="/a", Value="b", Type="String", Overwrite=True
+        )
+
+        # verify
+        self.assertDictEqual(
+            dict(Name="/a", Region="eu-west-1", Value="b", Version=3),
+            parameter_cache.get(self.task, "eu-west-1", "/a"),
+        )
+        self.assertIsNone(parameter_cache.get(self.task, "eu-west-2", "/a"))
+        self.assertDictEqual(dict(hits=1, misses=1), parameter_cache.get_stats())
+
+    def test_get_does_not_see_what_an_earlier_run_cached(self):
+        # setup
+        with mock.patch.dict(os.environ, {"SCT_CACHE_INVALIDATOR": "run-1"}):
+            parameter_cache.put("eu-west-1", "/a", "b")
+
+        # exercise
+        with mock.patch.dict(os.environ, {"SCT_CACHE_INVALIDATOR": "run-2"}):
+            actual_result = parameter_cache.get(self.task, "eu-west-1", "/a")
+
+        # verify
+        self.assertIsNone(actual_result)
+
+    def test_get_path_is_served_by_a_recursive_get_of_a_parent_path(self):
+        # setup
+        parameter_cache.put_path(
+            "eu-west-1",
+            "/a",
+            True,
+            {
+                "/a/b": dict(Value="1"),
+                "/a/c/d": dict(Value="2"),
+                "/a/c/e/f": dict(Value="3"),
+            },
+        )
+
+        # exercise
+        recursive = parameter_cache.get_path(self.task, "eu-west-1", "/a/c", True)
+        not_recursive = parameter_cache.get_path(self.task, "eu-west-1", "/a/c/", False)
+        not_cached = parameter_cache.get_path(self.task, "eu-west-1", "/b", True)
+
+        # verify
+        self.assertDictEqual(
+            {"/a/c/d": dict(Value="2"), "/a/c/e/f": dict(Value="3")}, recursive
+        )
+        self.assertDictEqual({"/a/c/d": dict(Value="2")}, not_recursive)
+        self.assertIsNone(not_cached)
+        self.assertEqual(
+            "2", parameter_cache.get(self.task, "eu-west-1", "/a/c/d").get("Value")
+        )
+
+    def test_get_path_is_not_served_by_a_get_that_was_not_recursive(self):
+        # setup
+        parameter_cache.put_path("eu-west-1", "/a", False, {"/a/b": dict(Value="1")})
+
+        # exercise
+        actual_result = parameter_cache.get_path(self.task, "eu-west-1", "/a", True)
+
+        # verify
+        self.assertIsNone(actual_result)
+
+    def test_put_parameter_and_wait_updates_the_paths_including_it(self):
+        # setup
+        parameter_cache.put_path("eu-west-1", "/", True, {"/a/b": dict(Value="1")})
+        parameter_cache.put_path("eu-west-1", "/a", False, {"/a/b": dict(Value="1")})
+        parameter_cache.put_path("eu-west-1", "/c", True, {"/c/d": dict(Value="2")})
+        ssm = mock.MagicMock()
+        ssm.meta.region_name = "eu-west-1"
+
+        # exercise
+        parameter_cache.put_parameter_and_wait(
+            ssm, Name="/a/e", Value="3", Type="String", Overwrite=True
+        )
+
+        # verify
+        self.assertDictEqual(
+            {"/a/b": dict(Value="1"), "/a/e": dict(Value="3")},
+            parameter_cache.get_path(self.task, "eu-west-1", "/a", False),
+        )
+        self.assertDictEqual(
+            {"/a/b": dict(Value="1"), "/a/e": dict(Value="3")},
+            parameter_cache.get_path(self.task, "eu-west-1", "/a", True),
+        )
+        self.assertDictEqual(
+            {"/c/d": dict(Value="2")},
+            parameter_cache.get_path(self.task, "eu-west-1", "/c", True),
+        )
+
+    def test_put_parameter_and_wait_does_not_write_a_secure_string_through(self):
+        # setup
+        parameter_cache.put("eu-west-1", "/a/b", "old")
+        parameter_cache.put_path("eu-west-1", "/a", True, {"/a/b": dict(Value="old")})
+        ssm = mock.MagicMock()
+        ssm.meta.region_name = "eu-west-1"
+
+        # exercise
+        parameter_cache.put_parameter_and_wait(
+            ssm, Name="/a/b", Value="secret", Type="SecureString", Overwrite=True
+        )
+
+        # verify
+        self.assertIsNone(parameter_cache.get(self.task, "eu-west-1", "/a/b"))
+        self.assertIsNone(parameter_cache.get_path(self.task, "eu-west-1", "/a", True))
@@ -0,0 +1,237 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import luigi
+
+from servicecatalog_puppet import client_pool
+from servicecatalog_puppet import constants
+from servicecatalog_puppet import waiter
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import tasks
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+def get_completion_path(kind, token):
+    digest = hashlib.sha1(f"{kind}:{token}".encode()).hexdigest()
+    return os.path.join(
+        constants.OUTPUT, constants.PARKED_OUTPUT_DIRECTORY, f"{digest}.json"
+    )
+
+
+class WaitForCompletionTask(tasks.PuppetTask):
+    """
+    Complete once the completion tracker has written the outcome of the work identified by kind and token.  It has no
+    run so luigi treats it as external: the task waiting on it is parked without a worker until luigi sees it complete.
+    """
+
+    kind = luigi.Parameter()
+    token = luigi.Parameter()
+
+    run = None
+    # luigi records each check that finds the work still in progress as a failure
+    retry_count = 999999999
+
+    def params_for_results_display(self):
+        return {
+            "kind": self.kind,
+            "token": self.token,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+    def output(self):
+        return luigi.LocalTarget(get_completion_path(self.kind, self.token))
+
+
+def submit_once(task, submit):
+    """
+    Calls submit the first time task runs.  Luigi runs a parked task again once what it waits on is complete, so later
+    runs return what submit returned the first time instead of calling it again.
+
+    :param task: the task parking
+    :param submit: a callable returning something json serialisable
+    :return: what submit returned
+    """
+    submitted = luigi.LocalTarget(f"{constants.OUTPUT}/{task.uid}.parked.json")
+    if submitted.exists():
+        with submitted.open("r") as f:
+            return json.loads(f.read())
+    submission = submit()
+    with submitted.open("w") as f:
+        f.write(json.dumps(submission, default=str))
+    return submission
+
+
+def park(task, kind, token, client):
+    """
+    Hands token to the completion tracker and returns the task for the parked task to yield.
+
+    :param task: the task parking
+    :param kind: what token identifies, one of CHECKS
+    :param token: the id of the record, build or stack to wait on
+    :param client: the client context manager the token was made with, the tracker checks using the same role
+    :return: a WaitForCompletionTask
+    """
+    wait = WaitForCompletionTask(kind=kind, token=token)
+    if not wait.complete():
+        tasks.record_event(
+            "parked",
+            task,
+            dict(
+                wait=dict(
+                    kind=kind,
+                    token=token,
+                    service_name=client.service_name,
+                    role_arn=client.role_arn,
+                    role_session_name=client.role_session_name,
+                    region_name=client.region_name,
+                )
+            ),
+        )
+    return wait
+
+
+def get_result(completion):
+    """
+    Returns the result of the work waited on, raising if it failed.
+
+    :param completion: the target yielding a WaitForCompletionTask returned
+    """
+    with completion.open("r") as f:
+        outcome = json.loads(f.read())
+    if outcome.get("error") is not None:
+        raise Exception(outcome.get("error"))
+    return outcome.get("result")
+
+
+def check_provisioned_product(client, token):
+    response = client.describe_provisioned_product(Id=token)
+    provisioned_product_detail = response.get("ProvisionedProductDetail")
+    execute_status = provisioned_product_detail.get("Status")
+    logger.info(f"{token} :: waiting for provision to complete: {execute_status}")
+    if execute_status in ["ERROR", "TAINTED"]:
+        raise Exception(
+            f"{token} :: Execute failed: {execute_status}: {provisioned_product_detail.get('StatusMessage')}"
+        )
+    return execute_status in ["AVAILABLE", "EXECUTE_SUCCESS"], response
+
+
+def check_build(client, token):
+    build = client.batch_get_builds(ids=[token]).get("builds")[0]
+    logger.info(f"{token} :: current status: {build.get('buildStatus')}")
+    return build.get("buildStatus") != "IN_PROGRESS", build
+
+
+def check_stack(client, token):
+    stack = client.describe_stacks(StackName=token).get("Stacks")[0]
+    status = stack.get("StackStatus")
+    logger.info(f"{token} :: current status: {status}")
+    if status.endswith("_IN_PROGRESS"):
+        return False, stack
+    if status not in ["CREATE_COMPLETE", "UPDATE_COMPLETE"]:
+        raise Exception(
+            f"{token} :: finished with status {status}: {stack.get('StackStatusReason')}"
+        )
+    return True, stack
+
+
+CHECKS = {
+    "provisioned_product": ("describe_provisioned_product", check_provisioned_product),
+    "build": ("batch_get_builds", check_build),
+    "stack": ("describe_stacks", check_stack),
+}
+
+
+class CompletionTracker(object):
+    """
+    Follows the journal while the tasks run and, for each token parked, checks it using the shared poller until it is
+    done, writing its outcome for its WaitForCompletionTask.
+    """
+
+    def __init__(self):
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.tracking = set()
+
+    def start(self):
+        os.makedirs(
+            os.path.join(constants.OUTPUT, constants.PARKED_OUTPUT_DIRECTORY),
+            exist_ok=True,
+        )
+        self.thread.start()
+        return self
+
+    def run(self):
+        for event in journal.follow(self.stop, event_types=["parked"]):
+            self.track(event.get("wait"))
+
+    def track(self, wait):
+        kind = wait.get("kind")
+        token = wait.get("token")
+        completion_path = get_completion_path(kind, token)
+        if completion_path in self.tracking:
+            return
+        self.tracking.add(completion_path)
+        api, check = CHECKS[kind]
+
+        def check_with_client():
+            client = client_pool.pool.get_client(
+                wait.get("service_name"),
+                wait.get("role_arn"),
+                wait.get("role_session_name"),
+                region_name=wait.get("region_name"),
+            )
+            return check(client, token)
+
+        def on_done(result, exception):
+            outcome = dict(result=result, error=None)
+            if exception is not None:
+                outcome["error"] = str(exception)
+            with luigi.LocalTarget(completion_path).open("w") as f:
+                f.write(json.dumps(outcome, default=str))
+
+        waiter.watch(
+            check_with_client,
+            (
+                client_pool.get_account_id_from_role_arn(wait.get("role_arn")),
+                wait.get("region_name"),
+                api,
+            ),
+            on_done,
+        )
+
+    def close(self):
+        self.stop.set()
+        self.thread.join()
+        logger.info(f"Tracked {len(self.tracking)} parked tasks")
+
+
+def start_completion_tracker():
+    return CompletionTracker().start()
+
+
+def configure_luigi():
+    """
+    Lets the worker stay alive while tasks are parked and has luigi check the WaitForCompletionTasks every
+    PARKED_TASKS_RECHECK_INTERVAL_IN_SECONDS.  Luigi's retry delay also applies to tasks that fail, so they are no
+    longer retried.  With the shared scheduler, its own retry_delay and retry_count apply instead.
+    """
+    luigi_config = luigi.configuration.get_config()
+    settings = dict(
+        worker=dict(retry_external_tasks="true", keep_alive="true"),
+        scheduler=dict(
+            retry_delay=str(constants.PARKED_TASKS_RECHECK_INTERVAL_IN_SECONDS),
+            retry_count="1",
+        ),
+    )
+    for section, options in settings.items():
+        if not luigi_config.has_section(section):
+            luigi_config.add_section(section)
+        for option, value in options.items():
+            luigi_config.set(section, option, value)
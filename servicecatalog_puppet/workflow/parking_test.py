@@ -0,0 +1,131 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import parking
+
+
+class ParkingTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        journal.create()
+        self.watch_patcher = mock.patch.object(parking.waiter, "watch")
+        self.watch = self.watch_patcher.start()
+        self.get_client_patcher = mock.patch.object(
+            parking.client_pool.pool, "get_client"
+        )
+        self.get_client = self.get_client_patcher.start()
+
+    def tearDown(self):
+        self.get_client_patcher.stop()
+        self.watch_patcher.stop()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_wait_for_completion_task_is_external(self):
+        # setup
+        sut = parking.WaitForCompletionTask(kind="build", token="project:1")
+
+        # exercise
+        actual_result = luigi.worker._is_external(sut)
+
+        # verify
+        self.assertTrue(actual_result)
+
+    def test_submit_once_only_submits_the_first_time(self):
+        # setup
+        task = mock.MagicMock(uid="DoExecuteCodeBuildRunTask/run-a")
+        submit = mock.MagicMock(return_value="project:1")
+
+        # exercise
+        first = parking.submit_once(task, submit)
+        second = parking.submit_once(task, submit)
+
+        # verify
+        self.assertEqual("project:1", first)
+        self.assertEqual("project:1", second)
+        submit.assert_called_once()
+
+    def test_tracker_writes_the_result_for_the_wait(self):
+        # setup
+        self.watch.side_effect = lambda check, key, on_done: on_done(check()[1], None)
+        self.get_client.return_value.batch_get_builds.return_value = dict(
+            builds=[dict(id="project:1", buildStatus="SUCCEEDED")]
+        )
+        sut = parking.CompletionTracker()
+        wait = parking.WaitForCompletionTask(kind="build", token="project:1")
+
+        # exercise
+        sut.track(
+            dict(
+                kind="build",
+                token="project:1",
+                service_name="codebuild",
+                role_arn="arn:aws:iam::012345678910:role/servicecatalog-puppet/PuppetRole",
+                role_session_name="role_session_name",
+                region_name=None,
+            )
+        )
+
+        # verify
+        self.assertEqual(
+            ("012345678910", None, "batch_get_builds"), self.watch.call_args[0][1]
+        )
+        self.assertTrue(wait.complete())
+        self.assertDictEqual(
+            dict(id="project:1", buildStatus="SUCCEEDED"),
+            parking.get_result(wait.output()),
+        )
+
+    def test_tracker_writes_the_error_for_the_wait(self):
+        # setup
+        self.watch.side_effect = lambda check, key, on_done: on_done(
+            None, Exception("failed")
+        )
+        sut = parking.CompletionTracker()
+        wait = parking.WaitForCompletionTask(kind="stack", token="stack-id")
+
+        # exercise
+        sut.track(
+            dict(
+                kind="stack",
+                token="stack-id",
+                service_name="cloudformation",
+                role_arn="arn:aws:iam::012345678910:role/servicecatalog-puppet/PuppetRole",
+                role_session_name="role_session_name",
+                region_name="eu-west-1",
+            )
+        )
+
+        # verify
+        with self.assertRaises(Exception) as context:
+            parking.get_result(wait.output())
+        self.assertEqual("failed", str(context.exception))
+
+    def test_check_stack(self):
+        # setup
+        client = mock.MagicMock()
+        client.describe_stacks.side_effect = [
+            dict(Stacks=[dict(StackStatus="UPDATE_IN_PROGRESS")]),
+            dict(Stacks=[dict(StackStatus="UPDATE_COMPLETE")]),
+            dict(Stacks=[dict(StackStatus="UPDATE_ROLLBACK_COMPLETE")]),
+        ]
+
+        # exercise
+        in_progress, _ = parking.check_stack(client, "stack-id")
+        complete, _ = parking.check_stack(client, "stack-id")
+
+        # verify
+        self.assertFalse(in_progress)
+        self.assertTrue(complete)
+        with self.assertRaises(Exception):
+            parking.check_stack(client, "stack-id")
@@ -3,6 +3,7 @@
 
 import luigi
 
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_portfolio_by_portfolio_name_task,
 )
@@ -19,6 +20,8 @@ class DescribeProductAsAdminTask(portfolio_management_task.PortfolioManagementTa
     region = luigi.Parameter()
 
     def requires(self):
+        if self.should_use_hub_catalogue:
+            return dict(hub_catalogue=get_hub_catalogue_task.for_task(self))
         return dict(
             portfolio=get_portfolio_by_portfolio_name_task.GetPortfolioByPortfolioName(
                 manifest_file_path=self.manifest_file_path,
@@ -30,6 +33,8 @@ class DescribeProductAsAdminTask(portfolio_management_task.PortfolioManagementTa
         )
 
     def api_calls_used(self):
+        if self.should_use_hub_catalogue:
+            return []
         return [
             f"servicecatalog.describe_product_as_admin_{self.account_id}_{self.region}"
         ]
@@ -45,6 +50,36 @@ class DescribeProductAsAdminTask(portfolio_management_task.PortfolioManagementTa
         }
 
     def run(self):
+        if self.should_use_hub_catalogue:
+            catalogue = self.load_from_input("hub_catalogue")
+            portfolio = get_hub_catalogue_task.get_portfolio(catalogue, self.portfolio)
+            product = get_hub_catalogue_task.get_product(
+                catalogue, self.portfolio, self.product
+            )
+            self.write_output(
+                dict(
+                    ProductViewDetail=product.get("ProductViewDetail"),
+                    ProvisioningArtifactSummaries=[
+                        dict(
+                            Id=provisioning_artifact_detail.get("Id"),
+                            Name=provisioning_artifact_detail.get("Name"),
+                            Description=provisioning_artifact_detail.get("Description"),
+                            CreatedTime=provisioning_artifact_detail.get("CreatedTime"),
+                        )
+                        for provisioning_artifact_detail in product.get(
+                            "ProvisioningArtifactDetails", []
+                        )
+                    ],
+                    portfolio_details=dict(
+                        portfolio_name=portfolio.get("portfolio_name"),
+                        portfolio_id=portfolio.get("portfolio_id"),
+                        provider_name=portfolio.get("provider_name"),
+                        description=portfolio.get("description"),
+                    ),
+                )
+            )
+            return
+
         portfolio_details = self.load_from_input("portfolio")
 
         with self.spoke_regional_client("servicecatalog") as service_catalog:
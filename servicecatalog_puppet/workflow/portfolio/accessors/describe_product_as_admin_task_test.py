@@ -1,6 +1,9 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
+import json
+import os
+from unittest import mock
 from unittest import skip
 
 from servicecatalog_puppet.workflow import tasks_unit_tests_helper
@@ -69,3 +72,53 @@ class DescribeProductAsAdminTaskTest(tasks_unit_tests_helper.PuppetTaskUnitTest)
 
         # verify
         raise NotImplementedError()
+
+    @mock.patch.dict(os.environ, {"SCT_SHOULD_USE_HUB_CATALOGUE": "True"})
+    def test_run_answers_from_the_hub_catalogue(self):
+        # setup
+        product_view_detail = dict(
+            ProductViewSummary=dict(Name=self.product, ProductId="prod-a")
+        )
+        self.inject_into_input(
+            "hub_catalogue",
+            json.dumps(
+                dict(
+                    portfolios={
+                        self.portfolio: dict(
+                            portfolio_name=self.portfolio,
+                            portfolio_id="port-a",
+                            provider_name="provider_name",
+                            description="description",
+                            products={
+                                self.product: dict(
+                                    ProductViewDetail=product_view_detail,
+                                    ProvisioningArtifactDetails=[
+                                        dict(Id="pa-a", Name="v1", Active=True)
+                                    ],
+                                )
+                            },
+                        )
+                    }
+                )
+            ),
+        )
+        expected_result = dict(
+            ProductViewDetail=product_view_detail,
+            ProvisioningArtifactSummaries=[
+                dict(Id="pa-a", Name="v1", Description=None, CreatedTime=None)
+            ],
+            portfolio_details=dict(
+                portfolio_name=self.portfolio,
+                portfolio_id="port-a",
+                provider_name="provider_name",
+                description="description",
+            ),
+        )
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.assertEqual([], self.sut.api_calls_used())
+        self.assert_output(expected_result)
+        self.sut.spoke_regional_client.assert_not_called()
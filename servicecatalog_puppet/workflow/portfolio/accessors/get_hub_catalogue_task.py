@@ -0,0 +1,272 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+from concurrent import futures
+
+import luigi
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow.manifest import manifest_mixin
+from servicecatalog_puppet.workflow.portfolio.accessors import hub_catalogue_cache
+from servicecatalog_puppet.workflow.portfolio.portfolio_management import (
+    portfolio_management_task,
+)
+
+
+class GetHubCatalogueTask(
+    portfolio_management_task.PortfolioManagementTask, manifest_mixin.ManifestMixen
+):
+    """
+    Gets the portfolios used in the manifest, their products and the products' provisioning artifacts from the hub
+    account once per region so the accessor tasks can answer from it instead of calling Service Catalog themselves.
+
+    The catalogue is saved between runs.  A saved catalogue younger than the hub_catalogue_cache_ttl is revalidated by
+    searching the products of each portfolio again, only listing the provisioning artifacts of the products that have
+    changed or are missing a version that is launched.  The products of portfolios copied into spoke local portfolios
+    are always listed as all of their provisioning artifacts are shared.  A version that is deleted and created again
+    under the same name is not noticed until the saved catalogue expires, which is why the ttl defaults to 0.
+    """
+
+    puppet_account_id = luigi.Parameter()
+    region = luigi.Parameter()
+
+    def params_for_results_display(self):
+        return {
+            "puppet_account_id": self.puppet_account_id,
+            "region": self.region,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+    def api_calls_used(self):
+        return [
+            f"servicecatalog.list_accepted_portfolio_shares_single_page{self.puppet_account_id}_{self.region}",
+            f"servicecatalog.list_portfolios_{self.puppet_account_id}_{self.region}",
+            f"servicecatalog.search_products_as_admin_{self.puppet_account_id}_{self.region}",
+            f"servicecatalog.list_provisioning_artifacts_{self.puppet_account_id}_{self.region}",
+        ]
+
+    def get_products_needed(self):
+        """
+        :return: dict of the portfolio names used in the manifest to dicts of the names of their products launched in
+        the region to the versions launched, or None when all of the products are needed because the portfolio is
+        copied into spoke local portfolios
+        """
+        products_needed = dict()
+        for launch_name, launch in self.manifest.get_launches_items():
+            products = products_needed.setdefault(launch.get("portfolio"), dict())
+            accounts_and_regions = self.manifest.get_account_ids_and_regions_used_for_section_item(
+                self.puppet_account_id, constants.LAUNCHES, launch_name
+            )
+            if any(self.region in regions for regions in accounts_and_regions.values()):
+                products.setdefault(launch.get("product"), set()).add(
+                    str(launch.get("version"))
+                )
+        for spoke_local_portfolio in self.manifest.get(
+            constants.SPOKE_LOCAL_PORTFOLIOS, {}
+        ).values():
+            products_needed[spoke_local_portfolio.get("portfolio")] = None
+        return products_needed
+
+    def get_portfolios(self, servicecatalog, products_needed):
+        portfolios = dict()
+        for (
+            portfolio_detail
+        ) in servicecatalog.list_accepted_portfolio_shares_single_page(
+            PortfolioShareType="AWS_ORGANIZATIONS"
+        ).get(
+            "PortfolioDetails", []
+        ) + servicecatalog.list_portfolios_single_page().get(
+            "PortfolioDetails", []
+        ):
+            name = portfolio_detail.get("DisplayName")
+            if name in products_needed and portfolios.get(name) is None:
+                portfolios[name] = {
+                    "portfolio_name": name,
+                    "portfolio_id": portfolio_detail.get("Id"),
+                    "provider_name": portfolio_detail.get("ProviderName"),
+                    "description": portfolio_detail.get("Description"),
+                }
+        return portfolios
+
+    def run(self):
+        products_needed = self.get_products_needed()
+        target = hub_catalogue_cache.get_target(self.puppet_account_id, self.region)
+        previous = hub_catalogue_cache.load(
+            target, self.hub_catalogue_cache_ttl
+        ) or dict(portfolios=dict())
+        reused = 0
+        with self.hub_regional_client("servicecatalog") as servicecatalog:
+
+            def search_products(portfolio):
+                return (
+                    portfolio,
+                    servicecatalog.search_products_as_admin_single_page(
+                        PortfolioId=portfolio.get("portfolio_id")
+                    ).get("ProductViewDetails", []),
+                )
+
+            def list_provisioning_artifacts(product_id):
+                return (
+                    product_id,
+                    servicecatalog.list_provisioning_artifacts_single_page(
+                        ProductId=product_id
+                    ).get("ProvisioningArtifactDetails", []),
+                )
+
+            with futures.ThreadPoolExecutor(
+                max_workers=constants.HUB_CATALOGUE_WORKERS
+            ) as executor:
+                if all(name in previous.get("portfolios") for name in products_needed):
+                    portfolios = {
+                        name: dict(previous.get("portfolios").get(name))
+                        for name in products_needed
+                    }
+                    try:
+                        searched = list(
+                            executor.map(search_products, portfolios.values())
+                        )
+                    except servicecatalog.exceptions.ResourceNotFoundException:
+                        self.info("a saved portfolio no longer exists, listing them")
+                        portfolios = self.get_portfolios(
+                            servicecatalog, products_needed
+                        )
+                        searched = list(
+                            executor.map(search_products, portfolios.values())
+                        )
+                else:
+                    portfolios = self.get_portfolios(servicecatalog, products_needed)
+                    searched = list(executor.map(search_products, portfolios.values()))
+
+                products = dict()
+                for portfolio, product_view_details in searched:
+                    portfolio["products"] = dict()
+                    name = portfolio.get("portfolio_name")
+                    needed = products_needed.get(name)
+                    previous_products = (
+                        previous.get("portfolios").get(name, {}).get("products", {})
+                    )
+                    for product_view_detail in json.loads(
+                        json.dumps(product_view_details, default=str)
+                    ):
+                        product_name = product_view_detail.get(
+                            "ProductViewSummary"
+                        ).get("Name")
+                        product = portfolio["products"][product_name] = dict(
+                            ProductViewDetail=product_view_detail
+                        )
+                        if needed is not None and product_name not in needed:
+                            continue
+                        previous_product = previous_products.get(product_name, {})
+                        if is_unchanged(
+                            previous_product,
+                            product_view_detail,
+                            None if needed is None else needed.get(product_name),
+                        ):
+                            product[
+                                "ProvisioningArtifactDetails"
+                            ] = previous_product.get("ProvisioningArtifactDetails")
+                            reused += 1
+                            continue
+                        products.setdefault(
+                            product_view_detail.get("ProductViewSummary").get(
+                                "ProductId"
+                            ),
+                            list(),
+                        ).append(product)
+
+                for product_id, provisioning_artifact_details in executor.map(
+                    list_provisioning_artifacts, products.keys()
+                ):
+                    for product in products[product_id]:
+                        product["ProvisioningArtifactDetails"] = json.loads(
+                            json.dumps(provisioning_artifact_details, default=str)
+                        )
+
+        self.info(
+            f"reused the provisioning artifacts of {reused} products and listed those of {len(products)}"
+        )
+        catalogue = dict(portfolios=portfolios)
+        hub_catalogue_cache.save(target, catalogue)
+        self.write_output(catalogue)
+
+
+def is_unchanged(previous_product, product_view_detail, versions_needed):
+    """
+    Returns True when the provisioning artifacts saved for a product can be used: the product view detail searched
+    for is the same as when they were listed and every version needed is amongst them.  When versions_needed is None
+    every provisioning artifact is needed and the saved ones may be missing some, so they cannot be used.
+    """
+    if versions_needed is None:
+        return False
+    if previous_product.get("ProvisioningArtifactDetails") is None:
+        return False
+    if previous_product.get("ProductViewDetail") != product_view_detail:
+        return False
+    names = [
+        provisioning_artifact_detail.get("Name")
+        for provisioning_artifact_detail in previous_product.get(
+            "ProvisioningArtifactDetails"
+        )
+    ]
+    return all(version in names for version in versions_needed)
+
+
+def get_portfolio(catalogue, portfolio_name):
+    portfolio = catalogue.get("portfolios").get(portfolio_name)
+    if portfolio is None:
+        raise Exception(f"Could not find portfolio: {portfolio_name}")
+    return portfolio
+
+
+def get_product(catalogue, portfolio_name, product_name):
+    product = get_portfolio(catalogue, portfolio_name).get("products").get(product_name)
+    if product is None:
+        raise Exception(f"Could not find product: {product_name} in: {portfolio_name}")
+    return product
+
+
+def get_id_cache(catalogue, portfolio_names):
+    """
+    Returns the regional id_cache used by spoke execution for the given portfolios.  Products whose provisioning
+    artifacts were not needed are left out so spoke execution looks them up itself.
+
+    :return: dict of portfolio names to their id and products, each with its id and CloudFormation versions
+    """
+    regional_id_cache = dict()
+    for portfolio_name in portfolio_names:
+        portfolio = get_portfolio(catalogue, portfolio_name)
+        products = dict()
+        for product_name, product in portfolio.get("products").items():
+            if product.get("ProvisioningArtifactDetails") is None:
+                continue
+            products[product_name] = dict(
+                id=product.get("ProductViewDetail")
+                .get("ProductViewSummary")
+                .get("ProductId"),
+                versions={
+                    provisioning_artifact_detail.get(
+                        "Name"
+                    ): provisioning_artifact_detail.get("Id")
+                    for provisioning_artifact_detail in product.get(
+                        "ProvisioningArtifactDetails"
+                    )
+                    if provisioning_artifact_detail.get("Type")
+                    == "CLOUD_FORMATION_TEMPLATE"
+                },
+            )
+        regional_id_cache[portfolio_name] = dict(
+            id=portfolio.get("portfolio_id"), products=products
+        )
+    return regional_id_cache
+
+
+def for_task(task):
+    """
+    Returns the GetHubCatalogueTask for the region of task, for it to require.
+    """
+    return GetHubCatalogueTask(
+        manifest_file_path=task.manifest_file_path,
+        puppet_account_id=task.puppet_account_id,
+        region=task.region,
+    )
@@ -0,0 +1,292 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import tasks_unit_tests_helper
+
+
+def product_view_detail(name):
+    return dict(ProductViewSummary=dict(Name=name, ProductId=f"prod-{name}"))
+
+
+def provisioning_artifact_detail(name, type="CLOUD_FORMATION_TEMPLATE"):
+    return dict(Id=f"pa-{name}", Name=name, Type=type)
+
+
+class GetHubCatalogueTaskTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    manifest_file_path = "manifest_file_path"
+    puppet_account_id = "puppet_account_id"
+    region = "region"
+
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.portfolio.accessors import (
+            get_hub_catalogue_task,
+        )
+
+        self.module = get_hub_catalogue_task
+
+        self.sut = self.module.GetHubCatalogueTask(
+            manifest_file_path=self.manifest_file_path,
+            puppet_account_id=self.puppet_account_id,
+            region=self.region,
+        )
+
+        self.wire_up_mocks()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_params_for_results_display(self):
+        # setup
+        expected_result = {
+            "puppet_account_id": self.puppet_account_id,
+            "region": self.region,
+            "cache_invalidator": self.cache_invalidator,
+        }
+
+        # exercise
+        actual_result = self.sut.params_for_results_display()
+
+        # verify
+        self.assertEqual(expected_result, actual_result)
+
+    def given_a_hub_catalogue(self):
+        self.manifest = mock.MagicMock()
+        self.manifest.get_launches_items.return_value = [
+            (
+                "launch-a",
+                dict(portfolio="portfolio-a", product="product-a", version="v1"),
+            ),
+            (
+                "launch-b",
+                dict(portfolio="portfolio-a", product="product-b", version="v1"),
+            ),
+        ]
+        self.manifest.get.side_effect = lambda section_name, default: {
+            constants.SPOKE_LOCAL_PORTFOLIOS: {
+                "spoke-local-portfolio-c": dict(portfolio="portfolio-c")
+            }
+        }.get(section_name, default)
+        self.manifest.get_account_ids_and_regions_used_for_section_item.side_effect = lambda puppet_account_id, section_name, item_name: {
+            "launch-a": {"account_id": [self.region]},
+            "launch-b": {"account_id": ["another_region"]},
+        }.get(
+            item_name
+        )
+        self.inject_hub_regional_client_called_with_response(
+            "servicecatalog",
+            "list_accepted_portfolio_shares_single_page",
+            dict(PortfolioDetails=[dict(DisplayName="portfolio-a", Id="port-a")]),
+        )
+        self.inject_hub_regional_client_called_with_response(
+            "servicecatalog",
+            "list_portfolios_single_page",
+            dict(
+                PortfolioDetails=[
+                    dict(DisplayName="portfolio-a", Id="port-local-a"),
+                    dict(DisplayName="portfolio-b", Id="port-b"),
+                    dict(DisplayName="portfolio-c", Id="port-c"),
+                ]
+            ),
+        )
+        self.products_by_portfolio_id = {
+            "port-a": [
+                product_view_detail("product-a"),
+                product_view_detail("product-b"),
+            ],
+            "port-c": [product_view_detail("product-c")],
+        }
+        self.hub_regional_client_mock.search_products_as_admin_single_page.side_effect = lambda PortfolioId: dict(
+            ProductViewDetails=self.products_by_portfolio_id.get(PortfolioId)
+        )
+        self.hub_regional_client_mock.list_provisioning_artifacts_single_page.side_effect = lambda ProductId: dict(
+            ProvisioningArtifactDetails=[provisioning_artifact_detail("v1")]
+        )
+
+    def run_sut(self, hub_catalogue_cache_ttl="0"):
+        self.sut.write_output.reset_mock()
+        self.hub_regional_client_mock.reset_mock()
+        with mock.patch.object(
+            self.module.GetHubCatalogueTask,
+            "manifest",
+            new_callable=mock.PropertyMock,
+            return_value=self.manifest,
+        ), mock.patch.object(
+            self.module.hub_catalogue_cache,
+            "get_target",
+            return_value=luigi.LocalTarget(
+                os.path.join(self.directory.name, "region.json")
+            ),
+        ), mock.patch.dict(
+            os.environ, {"SCT_HUB_CATALOGUE_CACHE_TTL": hub_catalogue_cache_ttl}
+        ):
+            self.sut.run()
+        return self.sut.write_output.call_args[0][0]
+
+    def test_run(self):
+        # setup
+        self.given_a_hub_catalogue()
+
+        # exercise
+        catalogue = self.run_sut()
+
+        # verify
+        self.assertEqual(
+            ["portfolio-a", "portfolio-c"], sorted(catalogue.get("portfolios").keys())
+        )
+        self.assertEqual(
+            "port-a", catalogue.get("portfolios").get("portfolio-a").get("portfolio_id")
+        )
+        self.assertEqual(
+            [
+                mock.call(ProductId="prod-product-a"),
+                mock.call(ProductId="prod-product-c"),
+            ],
+            sorted(
+                self.hub_regional_client_mock.list_provisioning_artifacts_single_page.call_args_list,
+                key=str,
+            ),
+        )
+        self.assertIsNone(
+            self.module.get_product(catalogue, "portfolio-a", "product-b").get(
+                "ProvisioningArtifactDetails"
+            )
+        )
+
+    def test_run_revalidates_the_saved_catalogue(self):
+        # setup
+        self.given_a_hub_catalogue()
+        expected_result = self.run_sut()
+
+        # exercise
+        actual_result = self.run_sut(hub_catalogue_cache_ttl="60")
+
+        # verify
+        self.assertEqual(expected_result, actual_result)
+        self.assertEqual(
+            2,
+            self.hub_regional_client_mock.search_products_as_admin_single_page.call_count,
+        )
+        self.hub_regional_client_mock.list_portfolios_single_page.assert_not_called()
+        self.assertEqual(
+            [mock.call(ProductId="prod-product-c")],
+            self.hub_regional_client_mock.list_provisioning_artifacts_single_page.call_args_list,
+        )
+
+    def test_run_lists_the_artifacts_of_spoke_local_portfolio_products(self):
+        # setup
+        self.given_a_hub_catalogue()
+        self.run_sut()
+        self.hub_regional_client_mock.list_provisioning_artifacts_single_page.side_effect = lambda ProductId: dict(
+            ProvisioningArtifactDetails=[
+                provisioning_artifact_detail("v1"),
+                provisioning_artifact_detail("v2"),
+            ]
+        )
+
+        # exercise
+        catalogue = self.run_sut(hub_catalogue_cache_ttl="60")
+
+        # verify
+        self.assertEqual(
+            ["v1", "v2"],
+            [
+                provisioning_artifact_detail.get("Name")
+                for provisioning_artifact_detail in self.module.get_product(
+                    catalogue, "portfolio-c", "product-c"
+                ).get("ProvisioningArtifactDetails")
+            ],
+        )
+
+    def test_run_lists_the_artifacts_of_products_that_changed(self):
+        # setup
+        self.given_a_hub_catalogue()
+        self.run_sut()
+        self.products_by_portfolio_id["port-a"][0]["Status"] = "CREATED"
+        self.manifest.get_launches_items.return_value[0][1]["version"] = "v2"
+
+        # exercise
+        self.run_sut(hub_catalogue_cache_ttl="60")
+
+        # verify
+        self.assertEqual(
+            [
+                mock.call(ProductId="prod-product-a"),
+                mock.call(ProductId="prod-product-c"),
+            ],
+            sorted(
+                self.hub_regional_client_mock.list_provisioning_artifacts_single_page.call_args_list,
+                key=str,
+            ),
+        )
+
+    def test_run_ignores_a_saved_catalogue_once_the_ttl_has_passed(self):
+        # setup
+        self.given_a_hub_catalogue()
+        self.run_sut()
+
+        # exercise
+        self.run_sut(hub_catalogue_cache_ttl="0")
+
+        # verify
+        self.hub_regional_client_mock.list_portfolios_single_page.assert_called_once()
+        self.assertEqual(
+            2,
+            self.hub_regional_client_mock.list_provisioning_artifacts_single_page.call_count,
+        )
+
+    def test_get_id_cache(self):
+        # setup
+        catalogue = dict(
+            portfolios={
+                "portfolio-a": dict(
+                    portfolio_id="port-a",
+                    products={
+                        "product-a": dict(
+                            ProductViewDetail=product_view_detail("product-a"),
+                            ProvisioningArtifactDetails=[
+                                provisioning_artifact_detail("v1"),
+                                provisioning_artifact_detail("v2", "MARKETPLACE_AMI"),
+                            ],
+                        ),
+                        "product-b": dict(
+                            ProductViewDetail=product_view_detail("product-b"),
+                        ),
+                    },
+                )
+            }
+        )
+        expected_result = {
+            "portfolio-a": dict(
+                id="port-a",
+                products={
+                    "product-a": dict(id="prod-product-a", versions={"v1": "pa-v1"})
+                },
+            )
+        }
+
+        # exercise
+        actual_result = self.module.get_id_cache(catalogue, ["portfolio-a"])
+
+        # verify
+        self.assertEqual(expected_result, actual_result)
+
+    def test_get_product_raises_when_the_product_is_not_in_the_catalogue(self):
+        # setup
+        catalogue = dict(portfolios={"portfolio-a": dict(products=dict())})
+
+        # exercise
+        with self.assertRaises(Exception) as context:
+            self.module.get_product(catalogue, "portfolio-a", "product-a")
+
+        # verify
+        self.assertEqual(
+            "Could not find product: product-a in: portfolio-a", str(context.exception)
+        )
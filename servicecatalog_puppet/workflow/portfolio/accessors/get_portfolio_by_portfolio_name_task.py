@@ -3,6 +3,7 @@
 
 import luigi
 
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.portfolio_management import (
     portfolio_management_task,
 )
@@ -26,10 +27,21 @@ class GetPortfolioByPortfolioName(
             "cache_invalidator": self.cache_invalidator,
         }
 
-    def api_calls_used(self):
-        if self.manifest.has_cache() and self.manifest.get("id_cache").get(
+    def is_in_id_cache(self):
+        return self.manifest.has_cache() and self.manifest.get("id_cache").get(
             self.region, {}
-        ).get(self.portfolio, {}).get("id"):
+        ).get(self.portfolio, {}).get("id")
+
+    def should_answer_from_hub_catalogue(self):
+        return self.should_use_hub_catalogue and not self.is_in_id_cache()
+
+    def requires(self):
+        if self.should_answer_from_hub_catalogue():
+            return dict(hub_catalogue=get_hub_catalogue_task.for_task(self))
+        return []
+
+    def api_calls_used(self):
+        if self.is_in_id_cache() or self.should_answer_from_hub_catalogue():
             return []
         else:
             return [
@@ -38,9 +50,7 @@ class GetPortfolioByPortfolioName(
             ]
 
     def run(self):
-        if self.manifest.has_cache() and self.manifest.get("id_cache").get(
-            self.region, {}
-        ).get(self.portfolio, {}).get("id"):
+        if self.is_in_id_cache():
             self.write_output(
                 {
                     "portfolio_name": self.portfolio,
@@ -51,6 +61,18 @@ class GetPortfolioByPortfolioName(
                     "description": "not set",
                 }
             )
+        elif self.should_answer_from_hub_catalogue():
+            portfolio = get_hub_catalogue_task.get_portfolio(
+                self.load_from_input("hub_catalogue"), self.portfolio
+            )
+            self.write_output(
+                {
+                    "portfolio_name": self.portfolio,
+                    "portfolio_id": portfolio.get("portfolio_id"),
+                    "provider_name": portfolio.get("provider_name"),
+                    "description": portfolio.get("description"),
+                }
+            )
         else:
             with self.spoke_regional_client(
                 "servicecatalog"
@@ -3,6 +3,7 @@
 
 import luigi
 
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     search_products_as_admin_task,
 )
@@ -27,6 +28,8 @@ class GetProductsAndProvisioningArtifactsTask(
         }
 
     def requires(self):
+        if self.should_use_hub_catalogue:
+            return dict(hub_catalogue=get_hub_catalogue_task.for_task(self))
         return {
             "search_products_as_admin": search_products_as_admin_task.SearchProductsAsAdminTask(
                 manifest_file_path=self.manifest_file_path,
@@ -38,12 +41,38 @@ class GetProductsAndProvisioningArtifactsTask(
         }
 
     def api_calls_used(self):
+        if self.should_use_hub_catalogue:
+            return []
         return [
             f"servicecatalog.list_provisioning_artifacts_{self.puppet_account_id}_{self.region}",
         ]
 
     def run(self):
         product_and_artifact_details = []
+        if self.should_use_hub_catalogue:
+            portfolio = get_hub_catalogue_task.get_portfolio(
+                self.load_from_input("hub_catalogue"), self.portfolio
+            )
+            for product in portfolio.get("products").values():
+                product_view_detail = product.get("ProductViewDetail")
+                product_view_summary = dict(
+                    product_view_detail.get("ProductViewSummary")
+                )
+                product_view_summary["ProductARN"] = product_view_detail.get(
+                    "ProductARN"
+                )
+                product_view_summary["provisioning_artifact_details"] = [
+                    provisioning_artifact_detail
+                    for provisioning_artifact_detail in product.get(
+                        "ProvisioningArtifactDetails", []
+                    )
+                    if provisioning_artifact_detail.get("Type")
+                    == "CLOUD_FORMATION_TEMPLATE"
+                ]
+                product_and_artifact_details.append(product_view_summary)
+            self.write_output(product_and_artifact_details)
+            return
+
         with self.hub_regional_client("servicecatalog") as service_catalog:
             response = self.load_from_input("search_products_as_admin")
             for product_view_detail in response.get("ProductViewDetails", []):
@@ -6,6 +6,7 @@ import json
 import luigi
 
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_product_id_by_product_name_task,
 )
@@ -39,6 +40,8 @@ class GetVersionIdByVersionName(
         }
 
     def api_calls_used(self):
+        if self.should_use_hub_catalogue:
+            return []
         return [
             f"servicecatalog.list_provisioning_artifacts_{self.account_id}_{self.region}",
         ]
@@ -60,6 +63,9 @@ class GetVersionIdByVersionName(
                     self.version_id = product["versions"][self.version]
                     return []
 
+        if self.should_use_hub_catalogue:
+            return dict(hub_catalogue=get_hub_catalogue_task.for_task(self))
+
         return dict(
             product=get_product_id_by_product_name_task.GetProductIdByProductName(
                 manifest_file_path=self.manifest_file_path,
@@ -75,6 +81,22 @@ class GetVersionIdByVersionName(
         if self.product_id is not None:
             product_id = self.product_id
             version_id = self.version_id
+        elif self.should_use_hub_catalogue:
+            product = get_hub_catalogue_task.get_product(
+                self.load_from_input("hub_catalogue"), self.portfolio, self.product
+            )
+            product_id = (
+                product.get("ProductViewDetail")
+                .get("ProductViewSummary")
+                .get("ProductId")
+            )
+            version_id = None
+            for provisioning_artifact_detail in product.get(
+                "ProvisioningArtifactDetails", []
+            ):
+                if provisioning_artifact_detail.get("Name") == self.version:
+                    version_id = provisioning_artifact_detail.get("Id")
+            assert version_id is not None, "Did not find version looking for"
         else:
             details = self.load_from_input("product")
             product_id = details.get("product_id")
@@ -0,0 +1,45 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import json
+import logging
+import time
+
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+def get_target(puppet_account_id, region):
+    """
+    Returns where the hub catalogue for region is kept between runs.
+    """
+    return config.get_caching_target(
+        puppet_account_id, f"{constants.HUB_CATALOGUE_CACHE_DIRECTORY}/{region}.json"
+    )
+
+
+def load(target, ttl):
+    """
+    Returns the catalogue saved in target when it was saved within ttl seconds, otherwise None.
+    """
+    if ttl <= 0 or not target.exists():
+        return None
+    try:
+        with target.open("r") as f:
+            saved = json.loads(f.read())
+    except ValueError:
+        logger.warning(f"Ignoring the hub catalogue in {target.path} as it is corrupt")
+        return None
+    age = time.time() - saved.get("created", 0)
+    if age >= ttl:
+        logger.info(f"The hub catalogue in {target.path} is {int(age)} seconds old")
+        return None
+    return saved.get("catalogue")
+
+
+def save(target, catalogue):
+    with target.open("w") as f:
+        f.write(json.dumps(dict(created=time.time(), catalogue=catalogue), default=str))
@@ -3,6 +3,7 @@
 
 import luigi
 
+from servicecatalog_puppet.workflow.portfolio.accessors import get_hub_catalogue_task
 from servicecatalog_puppet.workflow.portfolio.accessors import (
     get_portfolio_by_portfolio_name_task,
 )
@@ -27,6 +28,8 @@ class SearchProductsAsAdminTask(portfolio_management_task.PortfolioManagementTas
         }
 
     def requires(self):
+        if self.should_use_hub_catalogue:
+            return dict(hub_catalogue=get_hub_catalogue_task.for_task(self))
         return dict(
             portfolio=get_portfolio_by_portfolio_name_task.GetPortfolioByPortfolioName(
                 manifest_file_path=self.manifest_file_path,
@@ -38,11 +41,27 @@ class SearchProductsAsAdminTask(portfolio_management_task.PortfolioManagementTas
         )
 
     def api_calls_used(self):
+        if self.should_use_hub_catalogue:
+            return []
         return [
             f"servicecatalog.search_products_as_admin_{self.account_id}_{self.region}",
         ]
 
     def run(self):
+        if self.should_use_hub_catalogue:
+            portfolio = get_hub_catalogue_task.get_portfolio(
+                self.load_from_input("hub_catalogue"), self.portfolio
+            )
+            self.write_output(
+                dict(
+                    ProductViewDetails=[
+                        product.get("ProductViewDetail")
+                        for product in portfolio.get("products").values()
+                    ]
+                )
+            )
+            return
+
         portfolio_details = self.load_from_input("portfolio")
         with self.spoke_regional_client("servicecatalog") as spoke_service_catalog:
             results = spoke_service_catalog.search_products_as_admin_single_page(
@@ -1,6 +1,7 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
 
+import collections
 import json
 import logging
 import os
@@ -9,7 +10,6 @@ import sys
 import time
 from urllib.request import urlretrieve
 import urllib
-from glob import glob
 from pathlib import Path
 
 import click
@@ -23,11 +23,27 @@ from luigi import LuigiStatusCode
 
 from servicecatalog_puppet import config
 from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import metrics
+from servicecatalog_puppet.workflow import output_store
+from servicecatalog_puppet.workflow import parameter_cache
+from servicecatalog_puppet.workflow import parking
 from servicecatalog_puppet.workflow import tasks
 
 logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
 
 
+def get_client_pool_stats():
+    """
+    Returns the client pool stats of every task that succeeded or failed.  Tasks running in their own processes reuse
+    credentials and clients only within that process, so each task records its own stats in the journal.
+    """
+    stats = collections.Counter()
+    for event, _ in journal.read(event_types=["success", "failure"]):
+        stats.update(event.get("client_pool", dict()))
+    return dict(stats)
+
+
 def run_tasks(
     puppet_account_id,
     current_account_id,
@@ -39,7 +55,12 @@ def run_tasks(
     on_complete_url=None,
     running_exploded=False,
     output_cache_starting_point="",
+    should_use_local_scheduler=False,
 ):
+    """
+    :param should_use_local_scheduler: when True the shared scheduler is not used even when configured, eg when other
+    processes running a similar manifest from their own working directories would otherwise be given its tasks
+    """
     codebuild_id = os.getenv("CODEBUILD_BUILD_ID", "LOCAL_BUILD")
     if is_list_launches:
         should_use_eventbridge = False
@@ -65,16 +86,7 @@ def run_tasks(
 
     entries = []
 
-    for result_type in [
-        "start",
-        "failure",
-        "success",
-        "timeout",
-        "process_failure",
-        "processing_time",
-        "broken_task",
-    ]:
-        os.makedirs(Path(constants.RESULTS_DIRECTORY) / result_type)
+    journal.create()
 
     os.makedirs(Path(constants.OUTPUT))
 
@@ -83,7 +95,7 @@ def run_tasks(
     if not (running_exploded or is_list_launches):
         tasks.print_stats()
 
-    if is_list_launches:
+    if is_list_launches or should_use_local_scheduler:
         should_use_shared_scheduler = False
     else:
         should_use_shared_scheduler = config.get_should_use_shared_scheduler(
@@ -107,11 +119,27 @@ def run_tasks(
     if output_cache_starting_point != "":
         dst = "GetSSMParamTask.zip"
         urlretrieve(output_cache_starting_point, dst)
-        shutil.unpack_archive(
-            "GetSSMParamTask.zip", ".", "zip"
-        )
+        shutil.unpack_archive("GetSSMParamTask.zip", ".", "zip")
+        if output_store.is_enabled():
+            output_store.import_files(f"{constants.OUTPUT}/GetSSMParam*/**")
 
-    run_result = luigi.build(tasks_to_run, **build_params)
+    should_park_while_waiting = (
+        os.environ.get("SCT_SHOULD_PARK_WHILE_WAITING", "False") == "True"
+    )
+    if should_park_while_waiting:
+        parking.configure_luigi()
+        completion_tracker = parking.start_completion_tracker()
+
+    processing_time_metrics = metrics.start_processing_time_metrics()
+    try:
+        run_result = luigi.build(tasks_to_run, **build_params)
+    finally:
+        processing_time_metrics.close()
+        if should_park_while_waiting:
+            completion_tracker.close()
+        if output_store.is_enabled():
+            output_store.get_store().close()
+    logger.info(f"client pool: {get_client_pool_stats()}")
 
     exit_status_codes = {
         LuigiStatusCode.SUCCESS: 0,
@@ -123,19 +151,16 @@ def run_tasks(
         LuigiStatusCode.MISSING_EXT: 5,
     }
 
-    cache_invalidator = os.environ.get("SCT_CACHE_INVALIDATOR")
-
     has_spoke_failures = False
 
     if execution_mode == constants.EXECUTION_MODE_HUB:
         logger.info("Checking spoke executions...")
-        all_run_deploy_in_spoke_tasks = glob(
-            f"output/RunDeployInSpokeTask/**/{cache_invalidator}.json", recursive=True,
-        )
+        all_run_deploy_in_spoke_tasks = [
+            result for result, _ in journal.read(event_types=["spoke_execution"])
+        ]
         n_all_run_deploy_in_spoke_tasks = len(all_run_deploy_in_spoke_tasks)
         index = 0
-        for filename in all_run_deploy_in_spoke_tasks:
-            result = json.loads(open(filename, "r").read())
+        for result in all_run_deploy_in_spoke_tasks:
             spoke_account_id = result.get("account_id")
             build = result.get("build")
             build_id = build.get("id")
@@ -172,29 +197,7 @@ def run_tasks(
                             f"Codebuild in spoke did not succeed: {build.get('buildStatus')}"
                         ],
                     )
-                    open(
-                        f"results/failure/RunDeployInSpokeTask-{spoke_account_id}.json",
-                        "w",
-                    ).write(json.dumps(failure))
-
-    dry_run_tasks = (
-        glob(
-            f"output/ProvisionProductDryRunTask/**/{cache_invalidator}.json",
-            recursive=True,
-        )
-        + glob(
-            f"output/TerminateProductDryRunTask/**/{cache_invalidator}.json",
-            recursive=True,
-        )
-        + glob(
-            f"output/ProvisionStackDryRunTask/**/{cache_invalidator}.json",
-            recursive=True,
-        )
-        + glob(
-            f"output/TerminateStackDryRunTask/**/{cache_invalidator}.json",
-            recursive=True,
-        )
-    )
+                    journal.append(failure)
 
     if is_list_launches:
         if is_list_launches == "table":
@@ -212,8 +215,7 @@ def run_tasks(
                 ]
             ]
 
-            for filename in dry_run_tasks:
-                result = json.loads(open(filename, "r").read())
+            for result, _ in journal.read(event_types=["dry_run"]):
                 current_version = (
                     Color("{green}" + result.get("current_version") + "{/green}")
                     if result.get("current_version") == result.get("new_version")
@@ -251,11 +253,9 @@ def run_tasks(
 
         elif is_list_launches == "json":
             results = dict()
-            for filename in glob(
-                f"output/ProvisionProductDryRunTask/**/{cache_invalidator}.json",
-                recursive=True,
+            for result, _ in journal.read(
+                event_types=["dry_run"], task_types=["ProvisionProductDryRunTask"]
             ):
-                result = json.loads(open(filename, "r").read())
                 account_id = result.get("params").get("account_id")
                 region = result.get("params").get("region")
                 launch_name = result.get("params").get("launch_name")
@@ -291,8 +291,7 @@ def run_tasks(
                 ],
             ]
             table = terminaltables.AsciiTable(table_data)
-            for filename in dry_run_tasks:
-                result = json.loads(open(filename, "r").read())
+            for result, _ in journal.read(event_types=["dry_run"]):
                 table_data.append(
                     [
                         result.get("effect"),
@@ -312,9 +311,9 @@ def run_tasks(
                 ["Action", "Params", "Duration"],
             ]
             table = terminaltables.AsciiTable(table_data)
-            for filename in glob("results/processing_time/*.json"):
-                result_contents = open(filename, "r").read()
-                result = json.loads(result_contents)
+            for result, result_contents in journal.read(
+                event_types=["processing_time"]
+            ):
                 params = result.get("params_for_results")
                 if should_use_eventbridge:
                     entries.append(
@@ -338,8 +337,11 @@ def run_tasks(
                     [result.get("task_type"), params, result.get("duration"),]
                 )
             click.echo(table.table)
-            for filename in glob("results/failure/*.json"):
-                result = json.loads(open(filename, "r").read())
+            parameter_cache_stats = parameter_cache.get_stats()
+            click.echo(
+                f"SSM parameter cache: {parameter_cache_stats.get('hits')} hits, {parameter_cache_stats.get('misses')} misses"
+            )
+            for result, _ in journal.read(event_types=["failure"]):
                 params = result.get("params_for_results")
                 if should_forward_failures_to_opscenter:
                     title = f"{result.get('task_type')} failed: {params.get('launch_name')} - {params.get('account_id')} - {params.get('region')}"
@@ -420,7 +422,7 @@ def run_tasks(
         logger.info(f.reason)
 
     if running_exploded:
-        pass
+        return 1 if has_spoke_failures else exit_status_code
     else:
         if has_spoke_failures:
             sys.exit(1)
@@ -429,27 +431,23 @@ def run_tasks(
 
 
 def run_tasks_for_bootstrap_spokes_in_ou(tasks_to_run, num_workers):
-    for result_type in [
-        "start",
-        "failure",
-        "success",
-        "timeout",
-        "process_failure",
-        "processing_time",
-        "broken_task",
-    ]:
-        os.makedirs(Path(constants.RESULTS_DIRECTORY) / result_type)
-
-    run_result = luigi.build(
-        tasks_to_run,
-        local_scheduler=True,
-        detailed_summary=True,
-        workers=num_workers,
-        log_level=os.environ.get("LUIGI_LOG_LEVEL", constants.LUIGI_DEFAULT_LOG_LEVEL),
-    )
+    journal.create()
+
+    processing_time_metrics = metrics.start_processing_time_metrics()
+    try:
+        run_result = luigi.build(
+            tasks_to_run,
+            local_scheduler=True,
+            detailed_summary=True,
+            workers=num_workers,
+            log_level=os.environ.get(
+                "LUIGI_LOG_LEVEL", constants.LUIGI_DEFAULT_LOG_LEVEL
+            ),
+        )
+    finally:
+        processing_time_metrics.close()
 
-    for filename in glob("results/failure/*.json"):
-        result = json.loads(open(filename, "r").read())
+    for result, _ in journal.read(event_types=["failure"]):
         click.echo(
             colorclass.Color("{red}" + result.get("task_type") + " failed{/red}")
         )
@@ -1,2 +1,104 @@
 #  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
 #  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from luigi import LuigiStatusCode
+
+from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import runner
+
+
+class GetClientPoolStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        journal.create()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_sums_the_stats_recorded_by_each_task(self):
+        # setup
+        journal.append(
+            dict(
+                event_type="success",
+                task_type="A",
+                client_pool=dict(client_hits=1, client_misses=2),
+            )
+        )
+        journal.append(dict(event_type="start", task_type="B"))
+        journal.append(
+            dict(
+                event_type="failure",
+                task_type="B",
+                client_pool=dict(client_hits=3, client_misses=0),
+            )
+        )
+
+        # exercise
+        actual_result = runner.get_client_pool_stats()
+
+        # verify
+        self.assertDictEqual(dict(client_hits=4, client_misses=2), actual_result)
+
+
+@mock.patch.dict(os.environ, {"SCT_SHOULD_PARK_WHILE_WAITING": "False"})
+class RunTasksSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.patchers = [
+            mock.patch.object(runner, "config"),
+            mock.patch.object(runner, "metrics"),
+            mock.patch.object(runner.luigi, "build"),
+            mock.patch.object(runner.os, "system"),
+        ]
+        self.config, _, self.build, self.system = [
+            patcher.start() for patcher in self.patchers
+        ]
+        self.config.get_should_use_eventbridge.return_value = False
+        self.config.get_should_forward_failures_to_opscenter.return_value = False
+        self.config.get_should_use_shared_scheduler.return_value = True
+        self.build.return_value.status = LuigiStatusCode.SUCCESS
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def run_tasks(self, **kwargs):
+        return runner.run_tasks(
+            "puppet_account_id",
+            "puppet_account_id",
+            [],
+            1,
+            execution_mode=constants.EXECUTION_MODE_SPOKE,
+            running_exploded=True,
+            **kwargs,
+        )
+
+    def test_uses_the_shared_scheduler_when_configured(self):
+        # exercise
+        self.run_tasks()
+
+        # verify
+        self.system.assert_called_once_with(constants.START_SHARED_SCHEDULER_COMMAND)
+        self.assertNotIn("local_scheduler", self.build.call_args[1])
+
+    def test_uses_a_local_scheduler_when_asked_to_even_when_shared_is_configured(self):
+        # exercise
+        actual_result = self.run_tasks(should_use_local_scheduler=True)
+
+        # verify
+        self.assertEqual(0, actual_result)
+        self.system.assert_not_called()
+        self.assertTrue(self.build.call_args[1].get("local_scheduler"))
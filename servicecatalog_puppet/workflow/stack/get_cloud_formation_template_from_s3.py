@@ -4,9 +4,15 @@
 import luigi
 
 from servicecatalog_puppet.workflow import tasks
+from servicecatalog_puppet.workflow.stack import template_cache
 
 
 class GetCloudFormationTemplateFromS3(tasks.PuppetTask):
+    """
+    Gets the template, parsed and normalised, from the template cache when the object has been got before, otherwise
+    from S3, putting it into the template cache.
+    """
+
     puppet_account_id = luigi.Parameter()
     account_id = luigi.Parameter()
     bucket = luigi.Parameter()
@@ -18,6 +24,7 @@ class GetCloudFormationTemplateFromS3(tasks.PuppetTask):
             "bucket": self.bucket,
             "key": self.key,
             "version_id": self.version_id,
+            "cache_invalidator": self.cache_invalidator,
         }
 
     def run(self):
@@ -25,7 +32,25 @@ class GetCloudFormationTemplateFromS3(tasks.PuppetTask):
             p = dict(Bucket=self.bucket, Key=self.key,)
             if self.version_id != "":
                 p["VersionId"] = self.version_id
-            response = s3.get_object(**p)
-            self.write_output(
-                response.get("Body").read().decode("utf8"), skip_json_dump=True
+                version = self.version_id
+            else:
+                version = s3.head_object(**p).get("ETag")
+                # so what is put into the cache is the object the digest was made from, even when it changes between
+                # the head and the get
+                p["IfMatch"] = version
+
+            target = template_cache.get_target(
+                self.puppet_account_id,
+                template_cache.get_digest(self.bucket, self.key, version),
             )
+            parsed = template_cache.get(target)
+            if parsed is None:
+                self.info(f"template cache miss for {version}")
+                response = s3.get_object(**p)
+                parsed = template_cache.parse(
+                    response.get("Body").read().decode("utf8")
+                )
+                template_cache.put(target, parsed)
+            else:
+                self.info(f"template cache hit for {version}")
+            self.write_output(parsed)
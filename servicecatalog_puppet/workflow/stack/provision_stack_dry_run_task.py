@@ -7,8 +7,10 @@ import cfn_tools
 from botocore.exceptions import ClientError
 
 from servicecatalog_puppet import constants, config
+from servicecatalog_puppet.workflow import keyed_record
 from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.stack import provision_stack_task
+from servicecatalog_puppet.workflow.stack import stack_fingerprint
 
 
 class ProvisionStackDryRunTask(provision_stack_task.ProvisionStackTask):
@@ -21,22 +23,18 @@ class ProvisionStackDryRunTask(provision_stack_task.ProvisionStackTask):
     def write_result(
         self, current_version, new_version, effect, current_status, active, notes=""
     ):
+        result = {
+            "current_version": current_version,
+            "new_version": new_version,
+            "effect": effect,
+            "current_status": current_status,
+            "active": active,
+            "notes": notes,
+            "params": self.param_kwargs,
+        }
         with self.output().open("w") as f:
-            f.write(
-                json.dumps(
-                    {
-                        "current_version": current_version,
-                        "new_version": new_version,
-                        "effect": effect,
-                        "current_status": current_status,
-                        "active": active,
-                        "notes": notes,
-                        "params": self.param_kwargs,
-                    },
-                    indent=4,
-                    default=str,
-                )
-            )
+            f.write(json.dumps(result, indent=4, default=str,))
+        tasks.record_event("dry_run", self, result)
 
     def get_current_status(self):
         with self.spoke_regional_client("cloudformation") as cloudformation:
@@ -96,21 +94,10 @@ class ProvisionStackDryRunTask(provision_stack_task.ProvisionStackTask):
 
             all_params = self.get_parameter_values()
 
-            template_to_provision_source = self.input().get("template").open("r").read()
-            try:
-                template_to_provision = cfn_tools.load_yaml(
-                    template_to_provision_source
-                )
-            except Exception:
-                try:
-                    template_to_provision = cfn_tools.load_json(
-                        template_to_provision_source
-                    )
-                except Exception:
-                    raise Exception("Could not parse new template as YAML or JSON")
+            template_to_provision = self.load_from_input("template")
 
             params_to_use = dict()
-            for param_name, p in template_to_provision.get("Parameters", {}).items():
+            for param_name, p in template_to_provision.get("parameters").items():
                 if all_params.get(param_name, p.get("DefaultValue")) is not None:
                     params_to_use[param_name] = all_params.get(
                         param_name, p.get("DefaultValue")
@@ -130,6 +117,30 @@ class ProvisionStackDryRunTask(provision_stack_task.ProvisionStackTask):
                     stack = cloudformation.describe_stacks(
                         StackName=self.stack_name
                     ).get("Stacks")[0]
+                    if (
+                        status != "UPDATE_ROLLBACK_COMPLETE"
+                        and self.should_use_stack_fingerprints
+                        and keyed_record.is_recorded(
+                            stack_fingerprint.get_target(
+                                self.puppet_account_id, stack.get("StackId")
+                            ),
+                            stack_fingerprint.get_last_updated(stack),
+                            stack_fingerprint.get(
+                                template_to_provision.get("template_body"),
+                                params_to_use,
+                            ),
+                        )
+                    ):
+                        self.info(f"fingerprint unchanged")
+                        self.write_result(
+                            "?",
+                            self.version_id,
+                            effect=constants.NO_CHANGE,
+                            current_status=status,
+                            active="N/A",
+                            notes="No change",
+                        )
+                        return
                     summary_response = cloudformation.get_template_summary(
                         StackName=self.stack_name,
                     )
@@ -154,7 +165,7 @@ class ProvisionStackDryRunTask(provision_stack_task.ProvisionStackTask):
                                 "Could not parse existing template as YAML or JSON"
                             )
 
-            template_to_use = cfn_tools.dump_yaml(template_to_provision)
+            template_to_use = template_to_provision.get("template_body")
             if status == "UPDATE_ROLLBACK_COMPLETE":
                 self.write_result(
                     "?",
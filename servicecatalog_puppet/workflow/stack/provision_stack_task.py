@@ -12,10 +12,14 @@ from servicecatalog_puppet import config
 from servicecatalog_puppet import aws
 from servicecatalog_puppet import constants
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import keyed_record
+from servicecatalog_puppet.workflow import parameter_cache
+from servicecatalog_puppet.workflow import parking
 from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.stack import get_cloud_formation_template_from_s3
 from servicecatalog_puppet.workflow.stack import provisioning_task
 from servicecatalog_puppet.workflow.stack import prepare_account_for_stack_task
+from servicecatalog_puppet.workflow.stack import stack_fingerprint
 
 
 class ProvisionStackTask(
@@ -36,9 +40,9 @@ class ProvisionStackTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
     worker_timeout = luigi.IntParameter(default=0, significant=False)
@@ -177,6 +181,82 @@ class ProvisionStackTask(
         return current_stack
 
     def run(self):
+        task_output = dict(
+            **self.params_for_results_display(),
+            account_parameters=tasks.unwrap(self.account_parameters),
+            launch_parameters=tasks.unwrap(self.launch_parameters),
+            manifest_parameters=tasks.unwrap(self.manifest_parameters),
+        )
+
+        if self.should_park_while_waiting:
+            provisioning = parking.submit_once(self, self.provision)
+            if provisioning.get("stack_id") is not None:
+                completion = yield parking.park(
+                    self,
+                    "stack",
+                    provisioning.get("stack_id"),
+                    self.spoke_regional_client("cloudformation"),
+                )
+                parking.get_result(completion)
+        else:
+            provisioning = self.provision()
+
+        task_output["provisioned"] = provisioning.get("provisioned")
+        self.info(f"self.execution is {self.execution}")
+        if self.execution == constants.EXECUTION_MODE_HUB:
+            self.info(
+                f"Running in execution mode: {self.execution}, checking for SSM outputs"
+            )
+            if len(self.ssm_param_outputs) > 0:
+                with self.spoke_regional_client(
+                    "cloudformation"
+                ) as spoke_cloudformation:
+                    stack_details = aws.get_stack_output_for(
+                        spoke_cloudformation, self.stack_name_to_use,
+                    )
+
+                for ssm_param_output in self.ssm_param_outputs:
+                    self.info(
+                        f"writing SSM Param: {ssm_param_output.get('stack_output')}"
+                    )
+                    with self.hub_client("ssm") as ssm:
+                        found_match = False
+                        # TODO push into another task
+                        for output in stack_details.get("Outputs", []):
+                            if output.get("OutputKey") == ssm_param_output.get(
+                                "stack_output"
+                            ):
+                                ssm_parameter_name = ssm_param_output.get("param_name")
+                                ssm_parameter_name = ssm_parameter_name.replace(
+                                    "${AWS::Region}", self.region
+                                )
+                                ssm_parameter_name = ssm_parameter_name.replace(
+                                    "${AWS::AccountId}", self.account_id
+                                )
+                                found_match = True
+                                parameter_cache.put_parameter_and_wait(
+                                    ssm,
+                                    Name=ssm_parameter_name,
+                                    Value=output.get("OutputValue"),
+                                    Type=ssm_param_output.get("param_type", "String"),
+                                    Overwrite=True,
+                                )
+                        if not found_match:
+                            raise Exception(
+                                f"[{self.uid}] Could not find match for {ssm_param_output.get('stack_output')}"
+                            )
+
+            self.write_output(task_output)
+        else:
+            self.write_output(task_output)
+
+    def provision(self):
+        """
+        Creates or updates the stack when it needs to be.  When parking while waiting, the create or update is started
+        without waiting for it to complete.
+
+        :return: dict of whether the stack was provisioned and the stack_id of a create or update in progress
+        """
         stack = self.ensure_stack_is_in_complete_status()
         status = stack.get("StackStatus")
 
@@ -189,42 +269,44 @@ class ProvisionStackTask(
                         f"Stack: {self.stack_name_to_use} is in ROLLBACK_COMPLETE and need remediation"
                     )
 
-        task_output = dict(
-            **self.params_for_results_display(),
-            account_parameters=tasks.unwrap(self.account_parameters),
-            launch_parameters=tasks.unwrap(self.launch_parameters),
-            manifest_parameters=tasks.unwrap(self.manifest_parameters),
-        )
-
         all_params = self.get_parameter_values()
 
-        template_to_provision_source = self.input().get("template").open("r").read()
-        try:
-            template_to_provision = cfn_tools.load_yaml(template_to_provision_source)
-        except Exception:
-            try:
-                template_to_provision = cfn_tools.load_json(
-                    template_to_provision_source
-                )
-            except Exception:
-                raise Exception("Could not parse new template as YAML or JSON")
+        template_to_provision = self.load_from_input("template")
 
         params_to_use = dict()
-        for param_name, p in template_to_provision.get("Parameters", {}).items():
+        for param_name, p in template_to_provision.get("parameters").items():
             if all_params.get(param_name, p.get("DefaultValue")) is not None:
                 params_to_use[param_name] = all_params.get(
                     param_name, p.get("DefaultValue")
                 )
 
+        template_to_use = template_to_provision.get("template_body")
+        fingerprint = stack_fingerprint.get(template_to_use, params_to_use)
+
         existing_stack_params_dict = dict()
         existing_template = ""
-        if status in [
+        stack_exists = status in [
             "CREATE_COMPLETE",
             "UPDATE_ROLLBACK_COMPLETE",
             "UPDATE_COMPLETE",
             "IMPORT_COMPLETE",
             "IMPORT_ROLLBACK_COMPLETE",
-        ]:
+        ]
+        should_use_stack_fingerprint = (
+            stack_exists
+            and status != "UPDATE_ROLLBACK_COMPLETE"
+            and self.should_use_stack_fingerprints
+        )
+        if should_use_stack_fingerprint:
+            fingerprint_target = stack_fingerprint.get_target(
+                self.puppet_account_id, stack.get("StackId")
+            )
+            last_updated = stack_fingerprint.get_last_updated(stack)
+            if keyed_record.is_recorded(fingerprint_target, last_updated, fingerprint):
+                self.info(f"fingerprint unchanged")
+                return dict(provisioned=False, stack_id=None)
+
+        if stack_exists:
             with self.spoke_regional_client("cloudformation") as cloudformation:
                 existing_stack_params_dict = {}
                 summary_response = cloudformation.get_template_summary(
@@ -251,7 +333,6 @@ class ProvisionStackTask(
                             "Could not parse existing template as YAML or JSON"
                         )
 
-        template_to_use = cfn_tools.dump_yaml(template_to_provision)
         if status == "UPDATE_ROLLBACK_COMPLETE":
             need_to_provision = True
         else:
@@ -260,6 +341,10 @@ class ProvisionStackTask(
                 if template_to_use == cfn_tools.dump_yaml(existing_template):
                     self.info(f"template the same")
                     need_to_provision = False
+                    if should_use_stack_fingerprint:
+                        keyed_record.record(
+                            fingerprint_target, last_updated, fingerprint
+                        )
                 else:
                     self.info(f"template changed")
                     need_to_provision = True
@@ -267,6 +352,7 @@ class ProvisionStackTask(
                 self.info(f"params changed")
                 need_to_provision = True
 
+        stack_id = None
         if need_to_provision:
             provisioning_parameters = []
             for p in params_to_use.keys():
@@ -277,59 +363,20 @@ class ProvisionStackTask(
                 a = dict(
                     StackName=self.stack_name_to_use,
                     TemplateBody=template_to_use,
-                    ShouldUseChangeSets=False,
                     Capabilities=self.capabilities,
                     Parameters=provisioning_parameters,
-                    ShouldDeleteRollbackComplete=self.should_delete_rollback_complete_stacks,
                 )
                 if self.use_service_role:
                     a["RoleARN"] = config.get_puppet_stack_role_arn(self.account_id)
-                cloudformation.create_or_update(**a)
-
-        task_output["provisioned"] = need_to_provision
-        self.info(f"self.execution is {self.execution}")
-        if self.execution == constants.EXECUTION_MODE_HUB:
-            self.info(
-                f"Running in execution mode: {self.execution}, checking for SSM outputs"
-            )
-            if len(self.ssm_param_outputs) > 0:
-                with self.spoke_regional_client(
-                    "cloudformation"
-                ) as spoke_cloudformation:
-                    stack_details = aws.get_stack_output_for(
-                        spoke_cloudformation, self.stack_name_to_use,
+                if self.should_park_while_waiting:
+                    stack_id = aws.start_create_or_update_stack(
+                        cloudformation, stack_exists, **a
                     )
-
-                for ssm_param_output in self.ssm_param_outputs:
-                    self.info(
-                        f"writing SSM Param: {ssm_param_output.get('stack_output')}"
+                else:
+                    cloudformation.create_or_update(
+                        ShouldUseChangeSets=False,
+                        ShouldDeleteRollbackComplete=self.should_delete_rollback_complete_stacks,
+                        **a,
                     )
-                    with self.hub_client("ssm") as ssm:
-                        found_match = False
-                        # TODO push into another task
-                        for output in stack_details.get("Outputs", []):
-                            if output.get("OutputKey") == ssm_param_output.get(
-                                "stack_output"
-                            ):
-                                ssm_parameter_name = ssm_param_output.get("param_name")
-                                ssm_parameter_name = ssm_parameter_name.replace(
-                                    "${AWS::Region}", self.region
-                                )
-                                ssm_parameter_name = ssm_parameter_name.replace(
-                                    "${AWS::AccountId}", self.account_id
-                                )
-                                found_match = True
-                                ssm.put_parameter_and_wait(
-                                    Name=ssm_parameter_name,
-                                    Value=output.get("OutputValue"),
-                                    Type=ssm_param_output.get("param_type", "String"),
-                                    Overwrite=True,
-                                )
-                        if not found_match:
-                            raise Exception(
-                                f"[{self.uid}] Could not find match for {ssm_param_output.get('stack_output')}"
-                            )
 
-            self.write_output(task_output)
-        else:
-            self.write_output(task_output)
+        return dict(provisioned=need_to_provision, stack_id=stack_id)
@@ -0,0 +1,41 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+
+
+def get(template_body, parameters):
+    """
+    Returns the fingerprint of a stack provisioned with the normalised template_body and the parameters.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            dict(template_body=template_body, parameters=parameters),
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def get_last_updated(stack):
+    """
+    Returns when the stack was last created or updated, by the framework or not, or None when it is not known.
+    """
+    last_updated = stack.get("LastUpdatedTime", stack.get("CreationTime"))
+    return None if last_updated is None else str(last_updated)
+
+
+def get_target(puppet_account_id, stack_id):
+    """
+    Returns where the fingerprint of the stack is kept between runs.  It is recorded against the time the stack was
+    last created or updated, see keyed_record.  Any update since, by the framework or not, moves the stack's
+    LastUpdatedTime on.
+    """
+    name = hashlib.sha1(stack_id.encode()).hexdigest()
+    return config.get_caching_target(
+        puppet_account_id, f"{constants.STACK_FINGERPRINTS_DIRECTORY}/{name}.json"
+    )
@@ -0,0 +1,157 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet.workflow import keyed_record
+from servicecatalog_puppet.workflow import tasks_unit_tests_helper
+from servicecatalog_puppet.workflow.stack import stack_fingerprint
+
+
+class StackFingerprintTest(unittest.TestCase):
+    def test_get_ignores_the_order_of_the_parameters(self):
+        # exercise
+        first = stack_fingerprint.get("template", dict(A="a", B="b"))
+        second = stack_fingerprint.get("template", dict(B="b", A="a"))
+
+        # verify
+        self.assertEqual(first, second)
+
+    def test_get_differs_by_parameter_value(self):
+        # exercise
+        first = stack_fingerprint.get("template", dict(A="a"))
+        second = stack_fingerprint.get("template", dict(A="b"))
+
+        # verify
+        self.assertNotEqual(first, second)
+
+    def test_get_last_updated_falls_back_to_the_creation_time(self):
+        # exercise
+        created = stack_fingerprint.get_last_updated(dict(CreationTime="created"))
+        updated = stack_fingerprint.get_last_updated(
+            dict(CreationTime="created", LastUpdatedTime="updated")
+        )
+
+        # verify
+        self.assertEqual("created", created)
+        self.assertEqual("updated", updated)
+
+
+@mock.patch.dict(os.environ, {"SCT_SHOULD_USE_STACK_FINGERPRINTS": "True"})
+class ProvisionStackTaskFingerprintTest(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    stack_name = "stack_name"
+    template_body = "Resources: {}\n"
+    parameters = dict(A="a")
+
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.stack import provision_stack_task
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.target = luigi.LocalTarget(os.path.join(self.directory.name, "stack.json"))
+        self.get_target_patcher = mock.patch.object(
+            stack_fingerprint, "get_target", return_value=self.target
+        )
+        self.get_target_patcher.start()
+        self.sut = provision_stack_task.ProvisionStackTask(
+            manifest_file_path="manifest_file_path",
+            stack_name=self.stack_name,
+            puppet_account_id="puppet_account_id",
+            region="region",
+            account_id="account_id",
+            bucket="bucket",
+            key="key",
+            version_id="version_id",
+            launch_name="",
+            capabilities=[],
+            use_service_role=False,
+            execution="hub",
+        )
+        self.wire_up_mocks()
+        self.sut.get_parameter_values = mock.MagicMock(return_value=self.parameters)
+        self.sut.load_from_input = mock.MagicMock(
+            return_value=dict(
+                template_body=self.template_body, parameters=dict(A=dict(Type="String"))
+            )
+        )
+        self.spoke_regional_client_mock.get_template_summary.return_value = dict(
+            Parameters=[]
+        )
+        self.spoke_regional_client_mock.get_template.return_value = dict(
+            TemplateBody=self.template_body
+        )
+
+    def tearDown(self) -> None:
+        self.get_target_patcher.stop()
+        self.directory.cleanup()
+
+    def given_a_stack(self, last_updated_time, parameters):
+        self.sut.ensure_stack_is_in_complete_status = mock.MagicMock(
+            return_value=dict(
+                StackId="stack_id",
+                StackStatus="UPDATE_COMPLETE",
+                LastUpdatedTime=last_updated_time,
+                Parameters=[
+                    dict(ParameterKey=k, ParameterValue=v)
+                    for k, v in parameters.items()
+                ],
+            )
+        )
+
+    def test_provision_records_the_fingerprint_of_an_unchanged_stack(self):
+        # setup
+        self.given_a_stack("2021-01-01", self.parameters)
+
+        # exercise
+        actual_result = self.sut.provision()
+
+        # verify
+        self.assertEqual(dict(provisioned=False, stack_id=None), actual_result)
+        self.spoke_regional_client_mock.get_template.assert_called_once()
+        self.assertTrue(
+            keyed_record.is_recorded(
+                self.target,
+                "2021-01-01",
+                stack_fingerprint.get(self.template_body, self.parameters),
+            )
+        )
+
+    def test_provision_does_nothing_when_the_fingerprint_is_recorded(self):
+        # setup
+        keyed_record.record(
+            self.target,
+            "2021-01-01",
+            stack_fingerprint.get(self.template_body, self.parameters),
+        )
+        self.given_a_stack("2021-01-01", self.parameters)
+
+        # exercise
+        actual_result = self.sut.provision()
+
+        # verify
+        self.assertEqual(dict(provisioned=False, stack_id=None), actual_result)
+        self.spoke_regional_client_mock.get_template_summary.assert_not_called()
+        self.spoke_regional_client_mock.get_template.assert_not_called()
+        self.spoke_regional_client_mock.create_or_update.assert_not_called()
+
+    def test_provision_compares_a_stack_updated_since_it_was_recorded(self):
+        # setup
+        keyed_record.record(
+            self.target,
+            "2021-01-01",
+            stack_fingerprint.get(self.template_body, self.parameters),
+        )
+        self.given_a_stack("2021-01-02", dict(A="changed out of band"))
+
+        # exercise
+        actual_result = self.sut.provision()
+
+        # verify
+        self.assertEqual(dict(provisioned=True, stack_id=None), actual_result)
+        self.assertNotIn(
+            "Tags", self.spoke_regional_client_mock.create_or_update.call_args[1]
+        )
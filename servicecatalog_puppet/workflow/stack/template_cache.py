@@ -0,0 +1,62 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import logging
+
+import cfn_tools
+
+from servicecatalog_puppet import config
+from servicecatalog_puppet import constants
+
+logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
+
+
+def get_digest(bucket, key, version):
+    """
+    Returns the address of a template in the cache.
+
+    :param version: the version id of the object or, when it is not versioned, its ETag
+    """
+    return hashlib.sha256(f"{bucket}/{key}@{version}".encode()).hexdigest()
+
+
+def get_target(puppet_account_id, digest):
+    """
+    Returns where the template with digest is kept between runs.
+    """
+    return config.get_caching_target(
+        puppet_account_id, f"{constants.TEMPLATE_CACHE_DIRECTORY}/{digest}.json"
+    )
+
+
+def parse(template_body):
+    """
+    Parses the template as YAML or JSON.
+
+    :return: dict of the template, normalised as YAML, and its parameters
+    """
+    try:
+        template = cfn_tools.load_yaml(template_body)
+    except Exception:
+        try:
+            template = cfn_tools.load_json(template_body)
+        except Exception:
+            raise Exception("Could not parse new template as YAML or JSON")
+    return dict(
+        template_body=cfn_tools.dump_yaml(template),
+        parameters=json.loads(json.dumps(template.get("Parameters", {}), default=str)),
+    )
+
+
+def get(target):
+    if not target.exists():
+        return None
+    with target.open("r") as f:
+        return json.loads(f.read())
+
+
+def put(target, parsed):
+    with target.open("w") as f:
+        f.write(json.dumps(parsed))
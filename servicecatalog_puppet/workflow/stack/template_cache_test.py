@@ -0,0 +1,131 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet.workflow import tasks_unit_tests_helper
+from servicecatalog_puppet.workflow.stack import template_cache
+
+
+class TemplateCacheTest(unittest.TestCase):
+    def test_parse_normalises_yaml_and_json_alike(self):
+        # setup
+        yaml_template = "Parameters:\n  A:\n    Type: String\nResources:\n  B:\n    Type: AWS::SNS::Topic\n    Properties:\n      TopicName: !Ref A\n"
+        json_template = '{"Parameters": {"A": {"Type": "String"}}, "Resources": {"B": {"Type": "AWS::SNS::Topic", "Properties": {"TopicName": {"Ref": "A"}}}}}'
+
+        # exercise
+        from_yaml = template_cache.parse(yaml_template)
+        from_json = template_cache.parse(json_template)
+
+        # verify
+        self.assertEqual(from_yaml, from_json)
+        self.assertEqual({"A": {"Type": "String"}}, from_yaml.get("parameters"))
+
+    def test_parse_raises_when_the_template_is_neither_yaml_nor_json(self):
+        # exercise
+        with self.assertRaises(Exception) as context:
+            template_cache.parse("{: [")
+
+        # verify
+        self.assertEqual(
+            "Could not parse new template as YAML or JSON", str(context.exception)
+        )
+
+    def test_get_digest_differs_by_version(self):
+        # exercise
+        first = template_cache.get_digest("bucket", "key", "1")
+        second = template_cache.get_digest("bucket", "key", "2")
+
+        # verify
+        self.assertNotEqual(first, second)
+
+
+class GetCloudFormationTemplateFromS3Test(tasks_unit_tests_helper.PuppetTaskUnitTest):
+    puppet_account_id = "puppet_account_id"
+    bucket = "bucket"
+    key = "key"
+
+    def setUp(self) -> None:
+        from servicecatalog_puppet.workflow.stack import (
+            get_cloud_formation_template_from_s3,
+        )
+
+        self.module = get_cloud_formation_template_from_s3
+        self.directory = tempfile.TemporaryDirectory()
+        self.get_target_patcher = mock.patch.object(
+            template_cache,
+            "get_target",
+            side_effect=lambda puppet_account_id, digest: luigi.LocalTarget(
+                os.path.join(self.directory.name, f"{digest}.json")
+            ),
+        )
+        self.get_target_patcher.start()
+
+    def tearDown(self) -> None:
+        self.get_target_patcher.stop()
+        self.directory.cleanup()
+
+    def given_a_task(self, version_id):
+        self.sut = self.module.GetCloudFormationTemplateFromS3(
+            puppet_account_id=self.puppet_account_id,
+            account_id=self.puppet_account_id,
+            bucket=self.bucket,
+            key=self.key,
+            version_id=version_id,
+        )
+        self.wire_up_mocks()
+        self.hub_client_mock.head_object.return_value = dict(ETag='"etag"')
+        self.hub_client_mock.get_object.side_effect = lambda **kwargs: dict(
+            Body=io.BytesIO(b"Resources:\n  B:\n    Type: AWS::SNS::Topic\n")
+        )
+
+    def test_run_gets_a_template_not_in_the_cache_from_s3(self):
+        # setup
+        self.given_a_task("")
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.hub_client_mock.get_object.assert_called_once_with(
+            Bucket=self.bucket, Key=self.key, IfMatch='"etag"'
+        )
+        self.assert_output(
+            dict(
+                template_body="Resources:\n  B:\n    Type: AWS::SNS::Topic\n",
+                parameters=dict(),
+            )
+        )
+
+    def test_run_gets_a_template_in_the_cache_from_the_cache(self):
+        # setup
+        self.given_a_task("")
+        self.sut.run()
+        expected_result = self.sut.write_output.call_args[0][0]
+        self.given_a_task("")
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.hub_client_mock.get_object.assert_not_called()
+        self.assert_output(expected_result)
+
+    def test_run_does_not_head_a_versioned_object(self):
+        # setup
+        self.given_a_task("version_id")
+
+        # exercise
+        self.sut.run()
+
+        # verify
+        self.hub_client_mock.head_object.assert_not_called()
+        self.hub_client_mock.get_object.assert_called_once_with(
+            Bucket=self.bucket, Key=self.key, VersionId="version_id"
+        )
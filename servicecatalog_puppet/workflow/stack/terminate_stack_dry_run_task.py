@@ -6,6 +6,7 @@ import json
 from botocore.client import ClientError
 
 from servicecatalog_puppet import constants
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.stack import terminate_stack_task
 
 
@@ -52,19 +53,15 @@ class TerminateStackDryRunTask(terminate_stack_task.TerminateStackTask):
     def write_result(
         self, current_version, new_version, effect, current_status, active, notes=""
     ):
+        result = {
+            "current_version": current_version,
+            "new_version": new_version,
+            "effect": effect,
+            "current_status": current_status,
+            "active": active,
+            "notes": notes,
+            "params": self.param_kwargs,
+        }
         with self.output().open("w") as f:
-            f.write(
-                json.dumps(
-                    {
-                        "current_version": current_version,
-                        "new_version": new_version,
-                        "effect": effect,
-                        "current_status": current_status,
-                        "active": active,
-                        "notes": notes,
-                        "params": self.param_kwargs,
-                    },
-                    indent=4,
-                    default=str,
-                )
-            )
+            f.write(json.dumps(result, indent=4, default=str,))
+        tasks.record_event("dry_run", self, result)
@@ -5,16 +5,17 @@ import json
 import logging
 import math
 import os
+import time
 import traceback
-from pathlib import Path
 
 import luigi
 import psutil
-from betterboto import client as betterboto_client
 from luigi import format
 from luigi.contrib import s3
 
-from servicecatalog_puppet import constants, config
+from servicecatalog_puppet import constants, config, client_pool
+from servicecatalog_puppet.workflow import journal
+from servicecatalog_puppet.workflow import output_store
 
 logger = logging.getLogger(constants.PUPPET_LOGGER_NAME)
 
@@ -30,6 +31,29 @@ def unwrap(what):
     return thing
 
 
+interned_dicts = dict()
+
+
+class InternedDictParameter(luigi.DictParameter):
+    """
+    A DictParameter whose tasks share one frozen copy of each distinct value.  The parameters blocks of the manifest,
+    of launches and of accounts are handed to a task for every account and region, and luigi would otherwise freeze
+    a copy of them for each one.
+
+    Values are interned by their serialised form rather than by equality, as equality would not tell true from 1.
+    """
+
+    def normalize(self, value):
+        try:
+            key = self.serialize(value)
+        except TypeError:
+            return super().normalize(value)
+        frozen = interned_dicts.get(key)
+        if frozen is None:
+            frozen = interned_dicts.setdefault(key, super().normalize(value))
+        return frozen
+
+
 class PuppetTask(luigi.Task):
     @property
     def executor_account_id(self):
@@ -77,11 +101,34 @@ class PuppetTask(luigi.Task):
     def should_use_sns(self):
         return os.environ.get("SCT_SHOULD_USE_SNS", "False") == "True"
 
+    @property
+    def should_park_while_waiting(self):
+        return os.environ.get("SCT_SHOULD_PARK_WHILE_WAITING", "False") == "True"
+
+    @property
+    def should_use_hub_catalogue(self):
+        if self.execution_mode == constants.EXECUTION_MODE_HUB:
+            return os.environ.get("SCT_SHOULD_USE_HUB_CATALOGUE", "False") == "True"
+        else:
+            return False
+
+    @property
+    def hub_catalogue_cache_ttl(self):
+        return int(os.environ.get("SCT_HUB_CATALOGUE_CACHE_TTL", "0"))
+
+    @property
+    def should_use_stack_fingerprints(self):
+        return os.environ.get("SCT_SHOULD_USE_STACK_FINGERPRINTS", "False") == "True"
+
+    @property
+    def should_use_provisioning_digests(self):
+        return os.environ.get("SCT_SHOULD_USE_PROVISIONING_DIGESTS", "False") == "True"
+
     def get_account_used(self):
         return self.account_id if self.is_running_in_spoke() else self.puppet_account_id
 
     def spoke_client(self, service):
-        return betterboto_client.CrossAccountClientContextManager(
+        return client_pool.CrossAccountClientContextManager(
             service,
             config.get_puppet_role_arn(self.account_id),
             f"{self.account_id}-{config.get_puppet_role_name()}",
@@ -89,7 +136,7 @@ class PuppetTask(luigi.Task):
 
     def spoke_regional_client(self, service, region_name=None):
         region = region_name or self.region
-        return betterboto_client.CrossAccountClientContextManager(
+        return client_pool.CrossAccountClientContextManager(
             service,
             config.get_puppet_role_arn(self.account_id),
             f"{self.account_id}-{self.region}-{config.get_puppet_role_name()}",
@@ -98,13 +145,13 @@ class PuppetTask(luigi.Task):
 
     def hub_client(self, service):
         if self.is_running_in_spoke():
-            return betterboto_client.CrossAccountClientContextManager(
+            return client_pool.CrossAccountClientContextManager(
                 service,
                 config.get_puppet_role_arn(self.executor_account_id),
                 f"{self.executor_account_id}-{config.get_puppet_role_name()}",
             )
         else:
-            return betterboto_client.CrossAccountClientContextManager(
+            return client_pool.CrossAccountClientContextManager(
                 service,
                 config.get_puppet_role_arn(self.puppet_account_id),
                 f"{self.puppet_account_id}-{config.get_puppet_role_name()}",
@@ -113,14 +160,14 @@ class PuppetTask(luigi.Task):
     def hub_regional_client(self, service, region_name=None):
         region = region_name or self.region
         if self.is_running_in_spoke():
-            return betterboto_client.CrossAccountClientContextManager(
+            return client_pool.CrossAccountClientContextManager(
                 service,
                 config.get_puppet_role_arn(self.executor_account_id),
                 f"{self.executor_account_id}-{config.get_puppet_role_name()}",
                 region_name=region,
             )
         else:
-            return betterboto_client.CrossAccountClientContextManager(
+            return client_pool.CrossAccountClientContextManager(
                 service,
                 config.get_puppet_role_arn(self.puppet_account_id),
                 f"{self.puppet_account_id}-{region}-{config.get_puppet_role_name()}",
@@ -177,7 +224,7 @@ class PuppetTask(luigi.Task):
         if should_use_s3_target_if_caching_is_on and config.is_caching_enabled(
             puppet_account_id
         ):
-            return f"s3://sc-puppet-caching-bucket-{config.get_puppet_account_id()}-{config.get_home_region(puppet_account_id)}/{path}"
+            return config.get_caching_bucket_location(puppet_account_id, path)
         else:
             return path
 
@@ -190,7 +237,7 @@ class PuppetTask(luigi.Task):
         ):
             return s3.S3Target(self.output_location, format=format.UTF8)
         else:
-            return luigi.LocalTarget(self.output_location)
+            return output_store.get_target(self.output_location)
 
     @property
     def output_suffix(self):
@@ -207,6 +254,8 @@ class PuppetTask(luigi.Task):
         with self.output().open("w") as f:
             if skip_json_dump:
                 f.write(content)
+            elif output_store.is_enabled():
+                f.write(json.dumps(content, default=str, separators=(",", ":")))
             else:
                 f.write(json.dumps(content, indent=4, default=str,))
 
@@ -232,6 +281,7 @@ def record_event(event_type, task, extra_event_data=None):
 
     event = {
         "event_type": event_type,
+        "timestamp": time.time(),
         "task_type": task_type,
         "task_params": task_params,
         "params_for_results": task.params_for_results_display(),
@@ -239,13 +289,7 @@ def record_event(event_type, task, extra_event_data=None):
     if extra_event_data is not None:
         event.update(extra_event_data)
 
-    with open(
-        Path(constants.RESULTS_DIRECTORY)
-        / event_type
-        / f"{task_type}-{task.task_id}.json",
-        "w",
-    ) as f:
-        f.write(json.dumps(event, default=str, indent=4,))
+    journal.append(event)
 
 
 @luigi.Task.event_handler(luigi.Event.FAILURE)
@@ -256,14 +300,26 @@ def on_task_failure(task, exception):
             etype=type(exception), value=exception, tb=exception.__traceback__,
         ),
     }
+    exception_details["client_pool"] = get_client_pool_stats(task)
     record_event("failure", task, exception_details)
 
 
+def get_client_pool_stats(task):
+    """
+    Returns how the task used the client pool.  Luigi runs each task in its own process when workers > 1 and each
+    process has its own pool, so this is only what changed in this process since the task started.
+    """
+    return client_pool.get_stats_since(
+        getattr(task, "client_pool_stats_at_start", dict())
+    )
+
+
 def print_stats():
     mem = psutil.virtual_memory()
     logger.info(
         f"memory usage: total={math.ceil(mem.total / 1024 / 1024)}MB used={math.ceil(mem.used / 1024 / 1024)}MB percent={mem.percent}%"
     )
+    logger.info(f"client pool: {client_pool.get_stats()}")
 
 
 @luigi.Task.event_handler(luigi.Event.START)
@@ -273,13 +329,14 @@ def on_task_start(task):
     for name, value in task.param_kwargs.items():
         to_string += f"{name}={value}, "
     logger.info(f"{to_string} started")
+    task.client_pool_stats_at_start = client_pool.get_stats()
     record_event("start", task)
 
 
 @luigi.Task.event_handler(luigi.Event.SUCCESS)
 def on_task_success(task):
     print_stats()
-    record_event("success", task)
+    record_event("success", task, {"client_pool": get_client_pool_stats(task)})
 
 
 @luigi.Task.event_handler(luigi.Event.TIMEOUT)
@@ -303,49 +360,6 @@ def on_task_processing_time(task, duration):
     print_stats()
     record_event("processing_time", task, {"duration": duration})
 
-    task_params = dict(**task.param_kwargs)
-    task_params.update(task.params_for_results_display())
-
-    with betterboto_client.CrossAccountClientContextManager(
-        "cloudwatch",
-        config.get_puppet_role_arn(config.get_puppet_account_id()),
-        "cloudwatch-puppethub",
-    ) as cloudwatch:
-
-        dimensions = [
-            dict(Name="task_type", Value=task.__class__.__name__,),
-            dict(
-                Name="codebuild_build_id",
-                Value=os.getenv("CODEBUILD_BUILD_ID", "LOCAL_BUILD"),
-            ),
-        ]
-        for note_worthy in [
-            "launch_name",
-            "region",
-            "account_id",
-            "puppet_account_id",
-            "portfolio",
-            "product",
-            "version",
-        ]:
-            if task_params.get(note_worthy):
-                dimensions.append(
-                    dict(Name=str(note_worthy), Value=str(task_params.get(note_worthy)))
-                )
-
-        cloudwatch.put_metric_data(
-            Namespace=f"ServiceCatalogTools/Puppet/v2/ProcessingTime/Tasks",
-            MetricData=[
-                dict(
-                    MetricName="Tasks",
-                    Dimensions=[dict(Name="TaskType", Value=task.__class__.__name__)]
-                    + dimensions,
-                    Value=duration,
-                    Unit="Seconds",
-                ),
-            ],
-        )
-
 
 @luigi.Task.event_handler(luigi.Event.BROKEN_TASK)
 def on_task_broken_task(task, exception):
@@ -0,0 +1,56 @@
+#  Copyright 2021 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#  SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest import mock
+
+import luigi
+
+from servicecatalog_puppet.workflow import tasks
+
+
+class InternedDictParameterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sut = tasks.InternedDictParameter()
+
+    def test_equal_values_share_one_frozen_copy(self):
+        # setup
+        manifest_parameters = dict(A=dict(default="a"), B=dict(default=["b"]))
+
+        # exercise
+        first = self.sut.normalize(manifest_parameters)
+        second = self.sut.normalize(dict(manifest_parameters))
+
+        # verify
+        self.assertIs(first, second)
+        self.assertEqual(luigi.DictParameter().normalize(manifest_parameters), first)
+
+    def test_values_equal_only_by_python_equality_are_not_shared(self):
+        # exercise
+        first = self.sut.normalize(dict(A=dict(default=True)))
+        second = self.sut.normalize(dict(A=dict(default=1)))
+
+        # verify
+        self.assertIs(True, first.get("A").get("default"))
+        self.assertIs(1, second.get("A").get("default"))
+
+
+class GetClientPoolStatsTest(unittest.TestCase):
+    def test_is_what_changed_since_the_task_started(self):
+        # setup
+        task = mock.MagicMock()
+        with mock.patch.object(
+            tasks.client_pool,
+            "get_stats",
+            side_effect=[
+                dict(client_hits=5, client_misses=1),
+                dict(client_hits=7, client_misses=1),
+            ],
+        ):
+            task.client_pool_stats_at_start = tasks.client_pool.get_stats()
+
+            # exercise
+            actual_result = tasks.get_client_pool_stats(task)
+
+        # verify
+        self.assertDictEqual(dict(client_hits=2, client_misses=0), actual_result)
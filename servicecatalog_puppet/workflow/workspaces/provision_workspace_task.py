@@ -9,6 +9,9 @@ import luigi
 
 from servicecatalog_puppet import constants
 from servicecatalog_puppet.workflow import dependency
+from servicecatalog_puppet.workflow import parameter_cache
+from servicecatalog_puppet.workflow import parking
+from servicecatalog_puppet.workflow import tasks
 from servicecatalog_puppet.workflow.general import get_ssm_param_task
 from servicecatalog_puppet.workflow.manifest import manifest_mixin
 from servicecatalog_puppet.workflow.workspaces import Limits
@@ -34,9 +37,9 @@ class ProvisionWorkspaceTask(
 
     ssm_param_inputs = luigi.ListParameter(default=[], significant=False)
 
-    launch_parameters = luigi.DictParameter(default={}, significant=False)
-    manifest_parameters = luigi.DictParameter(default={}, significant=False)
-    account_parameters = luigi.DictParameter(default={}, significant=False)
+    launch_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    manifest_parameters = tasks.InternedDictParameter(default={}, significant=False)
+    account_parameters = tasks.InternedDictParameter(default={}, significant=False)
 
     retry_count = luigi.IntParameter(default=1, significant=False)
     worker_timeout = luigi.IntParameter(default=0, significant=False)
@@ -90,7 +93,8 @@ class ProvisionWorkspaceTask(
 
         zip_file_path = f"s3://{self.bucket}/{self.key}"
         state_file_path = f"s3://sc-puppet-state-{self.account_id}/workspace/{self.workspace_name}/{self.account_id}/{self.region}.zip"
-        with self.spoke_client("codebuild") as codebuild:
+        codebuild_client = self.spoke_client("codebuild")
+        with codebuild_client as codebuild:
             parameters_to_use = [
                 dict(name="TARGET_ACCOUNT", value=self.account_id, type="PLAINTEXT",),
                 dict(name="STATE_FILE", value=state_file_path, type="PLAINTEXT",),
@@ -116,10 +120,25 @@ class ProvisionWorkspaceTask(
                 ),
             )
 
-            build = codebuild.start_build_and_wait_for_completion(
-                projectName=constants.EXECUTE_TERRAFORM_PROJECT_NAME,
-                environmentVariablesOverride=parameters_to_use,
-            )
+            if self.should_park_while_waiting:
+                build_id = parking.submit_once(
+                    self,
+                    lambda: codebuild.start_build(
+                        projectName=constants.EXECUTE_TERRAFORM_PROJECT_NAME,
+                        environmentVariablesOverride=parameters_to_use,
+                    )
+                    .get("build")
+                    .get("id"),
+                )
+            else:
+                build = codebuild.start_build_and_wait_for_completion(
+                    projectName=constants.EXECUTE_TERRAFORM_PROJECT_NAME,
+                    environmentVariablesOverride=parameters_to_use,
+                )
+
+        if self.should_park_while_waiting:
+            completion = yield parking.park(self, "build", build_id, codebuild_client)
+            build = parking.get_result(completion)
 
         if len(self.ssm_param_outputs) > 0:
             with self.spoke_client("s3") as s3:
@@ -148,7 +167,8 @@ class ProvisionWorkspaceTask(
                             ssm_parameter_name = ssm_parameter_name.replace(
                                 "${AWS::AccountId}", self.account_id
                             )
-                            ssm.put_parameter_and_wait(
+                            parameter_cache.put_parameter_and_wait(
+                                ssm,
                                 Name=ssm_parameter_name,
                                 Value=output_value,
                                 Type=ssm_param_output.get("param_type", "String"),